@@ -0,0 +1,10 @@
+"""Benchmark suite of CaliPytion
+
+Run all benchmarks and write the results as JSON with
+
+    python -m benchmarks --output results.json
+
+Workload sizes are capped by the `CALIPYTION_BENCH_MAX_POINTS` (default 100000) and
+`CALIPYTION_BENCH_MAX_CALIBRATORS` (default 100) environment variables or the
+`--max-points` and `--max-calibrators` options.
+"""
@@ -0,0 +1,231 @@
+"""Synthetic data for the CaliPytion benchmarks"""
+
+from __future__ import annotations
+
+import copy
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from calipytion.ioutils.standardio import ColumnarStandard
+from calipytion.model import CalibrationModel, Standard
+from calipytion.tools.calibrator import Calibrator
+from calipytion.units import C, mM
+
+ENZYMEML_TEMPLATE = Path(__file__).parents[1] / "tests" / "test_data" / "enzymeml.json"
+
+# Synthetic signal law, signal = SLOPE * conc + CURVATURE * conc**2 + noise
+SLOPE = 0.5
+CURVATURE = 0.02
+NOISE = 0.01
+CONC_UPPER = 10.0
+
+
+def make_measurements(n_points: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """Creates concentrations and noisy signals of a quadratic calibration curve.
+
+    Args:
+        n_points (int): Number of data points.
+        seed (int, optional): Seed of the noise. Defaults to 0.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The concentrations and signals.
+    """
+
+    rng = np.random.default_rng(seed)
+    concs = np.linspace(0.0, CONC_UPPER, n_points)
+    signals = SLOPE * concs + CURVATURE * concs**2
+    signals += rng.normal(0.0, NOISE, n_points)
+
+    return concs, signals
+
+
+def make_signals(n_points: int, seed: int = 1) -> np.ndarray:
+    """Creates signals within the signal range of the synthetic calibration curve,
+    e.g. to be converted into concentrations.
+
+    Args:
+        n_points (int): Number of signals.
+        seed (int, optional): Seed of the signals. Defaults to 1.
+
+    Returns:
+        np.ndarray: The signals.
+    """
+
+    rng = np.random.default_rng(seed)
+    concs = rng.uniform(0.05 * CONC_UPPER, 0.95 * CONC_UPPER, n_points)
+
+    return SLOPE * concs + CURVATURE * concs**2
+
+
+def make_calibrator(n_points: int, molecule_id: str = "s0") -> Calibrator:
+    """Creates an unfitted calibrator with the default models.
+
+    Args:
+        n_points (int): Number of calibration data points.
+        molecule_id (str, optional): The molecule id. Defaults to "s0".
+
+    Returns:
+        Calibrator: The Calibrator object.
+    """
+
+    concs, signals = make_measurements(n_points)
+
+    return Calibrator(
+        molecule_id=molecule_id,
+        pubchem_cid=0,
+        molecule_name="Synthetic",
+        concentrations=concs.tolist(),
+        signals=signals.tolist(),
+        conc_unit=mM,
+    )
+
+
+def make_standard(n_points: int, molecule_id: str = "s0") -> Standard:
+    """Creates a Standard with a fitted quadratic model.
+
+    The model is fitted once on 10 points and reused for all sizes and molecule ids,
+    so large standards do not include the cost of fitting.
+
+    Args:
+        n_points (int): Number of samples of the Standard.
+        molecule_id (str, optional): The molecule id. Defaults to "s0".
+
+    Returns:
+        Standard: The Standard object.
+    """
+
+    concs, signals = make_measurements(n_points)
+    result = _fitted_model(molecule_id)
+
+    columnar = ColumnarStandard(
+        metadata={
+            "molecule_id": molecule_id,
+            "pubchem_cid": 0,
+            "molecule_name": "Synthetic",
+            "ph": 7.0,
+            "temperature": 25.0,
+            "temp_unit": C.model_dump(mode="json"),
+            "wavelength": 420.0,
+            "result": result.model_dump(mode="json"),
+        },
+        conc_unit=mM.model_dump(mode="json"),
+        concentrations=concs,
+        signals=signals,
+    )
+
+    return columnar.to_standard()
+
+
+def make_fitted_calibrators(
+    n_calibrators: int, n_points: int = 10
+) -> list[Calibrator]:
+    """Creates calibrators of distinct molecules, each with a fitted standard.
+
+    Args:
+        n_calibrators (int): Number of calibrators.
+        n_points (int, optional): Number of calibration points. Defaults to 10.
+
+    Returns:
+        list[Calibrator]: The calibrators with molecule ids `s0`, `s1`, ...
+    """
+
+    return [
+        Calibrator.from_standard(make_standard(n_points, f"s{idx}"))
+        for idx in range(n_calibrators)
+    ]
+
+
+def make_enzymeml(n_species: int, n_points: int) -> Any:
+    """Creates an EnzymeML document with one measured absorbance series per species.
+
+    Args:
+        n_species (int): Number of small molecules `s0`, `s1`, ... of the document.
+        n_points (int): Number of data points of each series.
+
+    Returns:
+        EnzymeMLDocument: The EnzymeML document.
+    """
+
+    from pyenzyme import DataTypes, EnzymeMLDocument
+
+    template = _enzymeml_template()
+    data = copy.deepcopy(template)
+    small_molecule = data["small_molecules"][0]
+    measurement = data["measurements"][0]
+    species_data = measurement["species_data"][0]
+
+    signals = make_signals(n_points).tolist()
+    time = np.arange(n_points, dtype=float).tolist()
+
+    data["small_molecules"] = []
+    measurement["species_data"] = []
+    for idx in range(n_species):
+        species_id = f"s{idx}"
+        data["small_molecules"].append(
+            {
+                **small_molecule,
+                "id": species_id,
+                "ld_id": f"enzml:SmallMolecule/{species_id}",
+            }
+        )
+        measurement["species_data"].append(
+            {
+                **species_data,
+                "species_id": species_id,
+                "data_type": DataTypes.ABSORBANCE.value,
+                "data": signals,
+                "time": time,
+                "ld_id": f"enzml:MeasurementData/{species_id}",
+            }
+        )
+    data["measurements"] = [measurement]
+
+    return EnzymeMLDocument(**data)
+
+
+def write_excel(n_points: int, path: str | Path) -> None:
+    """Writes calibration data in the layout read by `Calibrator.from_excel`.
+
+    Args:
+        n_points (int): Number of rows.
+        path (str | Path): Path of the Excel file.
+    """
+
+    import pandas as pd
+
+    concs, signals = make_measurements(n_points)
+    pd.DataFrame({"conc": concs, "signal": signals}).to_excel(
+        path, header=False, index=False
+    )
+
+
+@lru_cache(maxsize=None)
+def _fitted_template() -> CalibrationModel:
+    calibrator = make_calibrator(10)
+    calibrator.fit_models(silent=True)
+
+    return calibrator.get_model("quadratic")
+
+
+def _fitted_model(molecule_id: str) -> CalibrationModel:
+    template = _fitted_template()
+
+    return CalibrationModel(
+        **{
+            **template.model_dump(mode="json"),
+            "molecule_id": molecule_id,
+            "signal_law": template.signal_law.replace(  # type: ignore
+                template.molecule_id, molecule_id  # type: ignore
+            ),
+        }
+    )
+
+
+@lru_cache(maxsize=None)
+def _enzymeml_template() -> dict:
+    with open(ENZYMEML_TEMPLATE) as file:
+        return json.load(file)
@@ -0,0 +1,230 @@
+"""Runs the benchmark suite and reports machine-readable results"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import traceback
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from benchmarks.suite import BENCHMARKS, Benchmark
+
+MAX_POINTS_ENV = "CALIPYTION_BENCH_MAX_POINTS"
+MAX_CALIBRATORS_ENV = "CALIPYTION_BENCH_MAX_CALIBRATORS"
+DEFAULT_MAX_POINTS = 100_000
+DEFAULT_MAX_CALIBRATORS = 100
+RESULTS_FORMAT = "calipytion/benchmark-results"
+RESULTS_VERSION = 1
+
+
+@dataclass
+class BenchmarkResult:
+    """Timings of a benchmark at one workload size."""
+
+    name: str
+    axis: str
+    size: int
+    times: list[float] = field(default_factory=list)
+    error: str | None = None
+
+    @property
+    def median(self) -> float | None:
+        return statistics.median(self.times) if self.times else None
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["min"] = min(self.times) if self.times else None
+        data["median"] = self.median
+        data["throughput"] = self.size / self.median if self.median else None
+        return data
+
+
+def run_benchmark(
+    benchmark: Benchmark, size: int, repeat: int, tmp_dir: Path
+) -> BenchmarkResult:
+    """Times a benchmark at one workload size.
+
+    Unless the benchmark modifies its workload, the operation is run once before
+    timing. Errors, e.g. of optional dependencies or an unavailable AnIML
+    specification, are recorded in the result instead of aborting the suite.
+
+    Args:
+        benchmark (Benchmark): The benchmark.
+        size (int): Size of the workload.
+        repeat (int): Number of timed repetitions.
+        tmp_dir (Path): Directory for files written by the benchmark.
+
+    Returns:
+        BenchmarkResult: The timings in seconds.
+    """
+
+    result = BenchmarkResult(name=benchmark.name, axis=benchmark.axis, size=size)
+
+    try:
+        operation = benchmark.setup(size, tmp_dir)
+        if not benchmark.fresh:
+            # exclude one-time costs, such as deferred imports, from the timings
+            operation()
+
+        for idx in range(repeat):
+            if benchmark.fresh and idx > 0:
+                operation = benchmark.setup(size, tmp_dir)
+
+            start = time.perf_counter()
+            operation()
+            result.times.append(time.perf_counter() - start)
+    except Exception as e:
+        result.error = "".join(traceback.format_exception_only(type(e), e)).strip()
+
+    return result
+
+
+def run_suite(
+    names: list[str] | None = None,
+    max_points: int | None = None,
+    max_calibrators: int | None = None,
+    repeat: int = 3,
+    progress: bool = True,
+) -> dict:
+    """Runs the benchmarks with all workload sizes up to the caps.
+
+    Args:
+        names (list[str] | None, optional): Names of the benchmarks to run. Defaults
+            to all benchmarks.
+        max_points (int | None, optional): Largest number of points. Defaults to the
+            `CALIPYTION_BENCH_MAX_POINTS` environment variable or 100000.
+        max_calibrators (int | None, optional): Largest number of calibrators. Defaults
+            to the `CALIPYTION_BENCH_MAX_CALIBRATORS` environment variable or 100.
+        repeat (int, optional): Number of timed repetitions. Defaults to 3.
+        progress (bool, optional): Whether to print progress to stderr. Defaults to True.
+
+    Raises:
+        ValueError: If a benchmark name is unknown.
+
+    Returns:
+        dict: The results together with information about the environment.
+    """
+
+    if max_points is None:
+        max_points = int(float(os.environ.get(MAX_POINTS_ENV, DEFAULT_MAX_POINTS)))
+    if max_calibrators is None:
+        max_calibrators = int(
+            float(os.environ.get(MAX_CALIBRATORS_ENV, DEFAULT_MAX_CALIBRATORS))
+        )
+
+    names = names or list(BENCHMARKS)
+    unknown = set(names) - set(BENCHMARKS)
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    caps = {"points": max_points, "calibrators": max_calibrators}
+    results = []
+    with TemporaryDirectory(prefix="calipytion-benchmarks-") as tmp_dir:
+        for name in names:
+            benchmark = BENCHMARKS[name]
+            for size in benchmark.sizes:
+                if size > caps[benchmark.axis]:
+                    continue
+
+                result = run_benchmark(benchmark, size, repeat, Path(tmp_dir))
+                results.append(result.to_dict())
+
+                if progress:
+                    status = (
+                        result.error.splitlines()[0]
+                        if result.error
+                        else f"{result.median:.6f} s"
+                    )
+                    print(f"{name} [{size}]: {status}", file=sys.stderr)
+
+                # larger workloads would fail the same way
+                if result.error:
+                    break
+
+    return {
+        "format": RESULTS_FORMAT,
+        "version": RESULTS_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "environment": _environment(),
+        "caps": caps,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point of `python -m benchmarks`.
+
+    Args:
+        argv (list[str] | None, optional): Command line arguments. Defaults to None,
+            reading the arguments of the process.
+
+    Returns:
+        int: The exit code, `1` if any benchmark failed.
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Runs the CaliPytion benchmarks and reports the results as JSON.",
+    )
+    parser.add_argument(
+        "names", nargs="*", help="Benchmarks to run. Defaults to all benchmarks."
+    )
+    parser.add_argument("-o", "--output", help="JSON file for the results.")
+    parser.add_argument("--max-points", type=int, help="Largest number of points.")
+    parser.add_argument(
+        "--max-calibrators", type=int, help="Largest number of calibrators."
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Number of timed repetitions."
+    )
+    parser.add_argument(
+        "--list", action="store_true", help="Lists the benchmarks and exits."
+    )
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for benchmark in BENCHMARKS.values():
+            print(f"{benchmark.name}: {benchmark.description}")
+        return 0
+
+    report = run_suite(
+        names=args.names,
+        max_points=args.max_points,
+        max_calibrators=args.max_calibrators,
+        repeat=args.repeat,
+    )
+
+    content = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(content)
+    else:
+        print(content)
+
+    return int(any(result["error"] for result in report["results"]))
+
+
+def _environment() -> dict:
+    packages = {}
+    for package in ("calipytion", "numpy", "scipy", "sympy", "lmfit", "pyenzyme"):
+        try:
+            packages[package] = version(package)
+        except PackageNotFoundError:
+            packages[package] = None
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "packages": packages,
+    }
@@ -0,0 +1,187 @@
+"""Benchmarks of the calibration hot paths
+
+Every benchmark receives the size of its workload and returns a callable, which
+performs the timed operation. Preparing the workload is not part of the timing.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+from benchmarks import generators
+from calipytion.ioutils.standardio import write_columnar_standard
+from calipytion.tools.calibrator import Calibrator
+from calipytion.units import mM
+
+POINT_SIZES = [10**exponent for exponent in range(1, 8)]
+CALIBRATOR_COUNTS = [1, 10, 100, 1000]
+
+# Number of points per measured series when applying many calibrators
+POINTS_PER_SERIES = 1000
+
+BENCHMARKS: dict[str, Benchmark] = {}
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """A benchmark and the workload sizes it runs with."""
+
+    name: str
+    description: str
+    setup: Callable[[int, Path], Callable[[], Any]]
+    axis: str
+    sizes: tuple[int, ...]
+    fresh: bool
+
+
+def benchmark(
+    axis: str = "points", sizes: list[int] | None = None, fresh: bool = False
+) -> Callable:
+    """Registers a benchmark function. Its docstring describes the benchmark.
+
+    Args:
+        axis (str, optional): What the size of the workload counts, either "points"
+            or "calibrators". Defaults to "points".
+        sizes (list[int] | None, optional): Sizes of the workload. Defaults to
+            `POINT_SIZES` or `CALIBRATOR_COUNTS` depending on the axis.
+        fresh (bool, optional): Whether the timed operation modifies its workload,
+            so it is prepared again for every repetition. Defaults to False.
+    """
+
+    if sizes is None:
+        sizes = POINT_SIZES if axis == "points" else CALIBRATOR_COUNTS
+
+    def register(setup: Callable[[int, Path], Callable[[], Any]]) -> Callable:
+        BENCHMARKS[setup.__name__] = Benchmark(
+            name=setup.__name__,
+            description=(setup.__doc__ or "").strip(),
+            setup=setup,
+            axis=axis,
+            sizes=tuple(sizes),
+            fresh=fresh,
+        )
+        return setup
+
+    return register
+
+
+@benchmark(sizes=[1])
+def import_calipytion(size: int, tmp_dir: Path) -> Callable[[], Any]:
+    """Cold start of a fresh interpreter importing CaliPytion."""
+
+    command = [sys.executable, "-c", "import calipytion"]
+
+    return lambda: subprocess.run(command, check=True)
+
+
+@benchmark()
+def fit_models(size: int, tmp_dir: Path) -> Callable[[], Any]:
+    """Fits the default models to a calibration curve."""
+
+    calibrator = generators.make_calibrator(size)
+
+    return lambda: calibrator.fit_models(silent=True)
+
+
+@benchmark()
+def calculate_concentrations(size: int, tmp_dir: Path) -> Callable[[], Any]:
+    """Converts a list of signals with a compiled model."""
+
+    calibrator = Calibrator.from_standard(generators.make_standard(10))
+    calibrator.fitted_model("quadratic")
+    signals = generators.make_signals(size).tolist()
+
+    return lambda: calibrator.calculate_concentrations("quadratic", signals)
+
+
+@benchmark()
+def calculate_concentrations_array(size: int, tmp_dir: Path) -> Callable[[], Any]:
+    """Converts an array of signals with a compiled model."""
+
+    calibrator = Calibrator.from_standard(generators.make_standard(10))
+    calibrator.fitted_model("quadratic")
+    signals = generators.make_signals(size)
+
+    return lambda: calibrator.calculate_concentrations_array("quadratic", signals)
+
+
+@benchmark(fresh=True)
+def apply_to_enzymeml(size: int, tmp_dir: Path) -> Callable[[], Any]:
+    """Converts a measured series of an EnzymeML document."""
+
+    calibrator = Calibrator.from_standard(generators.make_standard(10))
+    enzmldoc = generators.make_enzymeml(1, size)
+
+    return lambda: calibrator.apply_to_enzymeml(enzmldoc, silent=True)
+
+
+@benchmark(axis="calibrators", fresh=True)
+def apply_calibrators(size: int, tmp_dir: Path) -> Callable[[], Any]:
+    """Applies many calibrators of distinct molecules to one document, including
+    the compilation of their fitted models."""
+
+    from calipytion.tools.enzymeml import apply_calibrators
+
+    calibrators = generators.make_fitted_calibrators(size)
+    enzmldoc = generators.make_enzymeml(size, POINTS_PER_SERIES)
+
+    return lambda: apply_calibrators(calibrators, enzmldoc, silent=True)
+
+
+@benchmark()
+def from_json(size: int, tmp_dir: Path) -> Callable[[], Any]:
+    """Reads a Standard in the per-sample JSON form."""
+
+    path = tmp_dir / f"standard_{size}.json"
+    path.write_text(generators.make_standard(size).model_dump_json())
+
+    return lambda: Calibrator.from_json(str(path))
+
+
+@benchmark()
+def from_json_columnar(size: int, tmp_dir: Path) -> Callable[[], Any]:
+    """Reads a Standard in the columnar JSON form."""
+
+    path = tmp_dir / f"columnar_standard_{size}.json"
+    write_columnar_standard(generators.make_standard(size), path)
+
+    return lambda: Calibrator.from_json(str(path))
+
+
+@benchmark()
+def from_excel(size: int, tmp_dir: Path) -> Callable[[], Any]:
+    """Reads calibration data from an Excel sheet."""
+
+    path = tmp_dir / f"standard_{size}.xlsx"
+    generators.write_excel(size, path)
+
+    return lambda: Calibrator.from_excel(
+        str(path),
+        molecule_id="s0",
+        conc_unit=mM,
+        pubchem_cid=0,
+        molecule_name="Synthetic",
+    )
+
+
+@benchmark()
+def export_to_animl(size: int, tmp_dir: Path) -> Callable[[], Any]:
+    """Exports a Standard to AnIML with one ExperimentStep per sample."""
+
+    calibrator = Calibrator.from_standard(generators.make_standard(size))
+
+    return lambda: calibrator.export_to_animl(silent=True)
+
+
+@benchmark()
+def export_to_animl_compact(size: int, tmp_dir: Path) -> Callable[[], Any]:
+    """Exports a Standard to AnIML with encoded series."""
+
+    calibrator = Calibrator.from_standard(generators.make_standard(size))
+
+    return lambda: calibrator.export_to_animl(silent=True, compact=True)
+
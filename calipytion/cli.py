@@ -0,0 +1,264 @@
+"""Command line interface of CaliPytion"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from rich.console import Console
+from rich.progress import (
+    BarColumn,
+    MofNCompleteColumn,
+    Progress,
+    TextColumn,
+    TimeElapsedColumn,
+)
+
+# Calibrators and their fitted models, loaded once per worker process
+_WORKER_CALIBRATORS: list = []
+_WORKER_MODELS: dict = {}
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point of the `calipytion` console script.
+
+    Args:
+        argv (list[str] | None, optional): Command line arguments. Defaults to None,
+            reading the arguments of the process.
+
+    Returns:
+        int: The exit code.
+    """
+
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+
+    return args.func(args)
+
+
+def convert(args: argparse.Namespace) -> int:
+    """Converts the measured signals of EnzymeML documents into concentrations using
+    a directory of calibration standards.
+
+    Args:
+        args (argparse.Namespace): The parsed command line arguments.
+
+    Returns:
+        int: The exit code, `1` if any document could not be converted.
+    """
+
+    console = Console()
+
+    standard_paths = collect_files(args.standards)
+    if not standard_paths:
+        console.print(f"❌ No standards found in '{args.standards}'")
+        return 1
+
+    document_paths = collect_files(args.enzymeml)
+    if not document_paths:
+        console.print(f"❌ No EnzymeML documents found for '{args.enzymeml}'")
+        return 1
+
+    output_dir = Path(args.output)
+    target_paths = output_paths(document_paths, output_dir)
+    if any(
+        os.path.exists(target) and os.path.samefile(path, target)
+        for path, target in zip(document_paths, target_paths)
+    ):
+        console.print(
+            f"❌ The output directory '{args.output}' contains the EnzymeML documents "
+            "to convert. Choose another output directory."
+        )
+        return 1
+
+    for target in target_paths:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+
+    console.print(
+        f"Converting {len(document_paths)} documents with "
+        f"{len(standard_paths)} standards on {args.workers} workers"
+    )
+
+    failed = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=args.workers,
+        initializer=_init_worker,
+        initargs=(standard_paths,),
+    ) as executor, Progress(
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        TimeElapsedColumn(),
+        console=console,
+    ) as progress:
+        task = progress.add_task("Converting", total=len(document_paths))
+
+        futures = {
+            executor.submit(
+                _convert_document,
+                path,
+                target,
+                args.extrapolate,
+                args.warm_start,
+            ): path
+            for path, target in zip(document_paths, target_paths)
+        }
+
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                converted_count, elapsed = future.result()
+                if args.verbose:
+                    progress.console.print(
+                        f"✅ {path}: {converted_count} measurements in {elapsed:.3f} s"
+                    )
+            except Exception as e:
+                failed += 1
+                progress.console.print(f"❌ {path}: {type(e).__name__} - {e}")
+
+            progress.advance(task)
+
+    symbol = "✅" if failed == 0 else "❌"
+    console.print(
+        f"{symbol} Converted {len(document_paths) - failed} of {len(document_paths)} "
+        f"documents in {time.perf_counter() - start:.2f} s"
+    )
+
+    return 1 if failed else 0
+
+
+def collect_files(path_or_pattern: str) -> list[str]:
+    """Collects the JSON files of a directory or the files matching a glob pattern.
+
+    Args:
+        path_or_pattern (str): A directory or a glob pattern.
+
+    Returns:
+        list[str]: The sorted file paths.
+    """
+
+    if os.path.isdir(path_or_pattern):
+        path_or_pattern = os.path.join(path_or_pattern, "*.json")
+
+    return sorted(
+        path for path in glob.glob(path_or_pattern, recursive=True) if os.path.isfile(path)
+    )
+
+
+def output_paths(paths: list[str], output_dir: str | Path) -> list[str]:
+    """Maps files to paths in the output directory, keeping their location relative
+    to the deepest directory containing all of them, so files with the same name in
+    different directories do not overwrite each other.
+
+    Args:
+        paths (list[str]): The file paths.
+        output_dir (str | Path): The output directory.
+
+    Returns:
+        list[str]: The output paths in the order of the files.
+    """
+
+    if not paths:
+        return []
+
+    absolute_paths = [os.path.abspath(path) for path in paths]
+    base_dir = os.path.commonpath([os.path.dirname(path) for path in absolute_paths])
+
+    return [
+        str(Path(output_dir) / os.path.relpath(path, base_dir))
+        for path in absolute_paths
+    ]
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="calipytion",
+        description="Tool for creating standard curves and concentration calculations.",
+    )
+    subparsers = parser.add_subparsers(required=True)
+
+    convert_parser = subparsers.add_parser(
+        "convert",
+        help="Convert the signals of EnzymeML documents into concentrations.",
+    )
+    convert_parser.add_argument(
+        "standards", help="Directory containing JSON Standard files."
+    )
+    convert_parser.add_argument(
+        "enzymeml", help="Directory or glob pattern of EnzymeML JSON documents."
+    )
+    convert_parser.add_argument(
+        "-o",
+        "--output",
+        required=True,
+        help="Directory to which the converted documents are written.",
+    )
+    convert_parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes. Defaults to the number of CPU cores.",
+    )
+    convert_parser.add_argument(
+        "--extrapolate",
+        action="store_true",
+        help="Calculate concentrations outside the calibration range.",
+    )
+    convert_parser.add_argument(
+        "--warm-start",
+        action="store_true",
+        help="Start the root search of each signal from the previous concentration.",
+    )
+    convert_parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="Print the conversion time of each document.",
+    )
+    convert_parser.set_defaults(func=convert)
+
+    return parser
+
+
+def _init_worker(standard_paths: list[str]) -> None:
+    """Loads and compiles the calibrators once per worker process."""
+
+    from calipytion.tools.calibrator import Calibrator
+    from calipytion.tools.enzymeml import compile_calibrators
+
+    global _WORKER_CALIBRATORS, _WORKER_MODELS
+
+    _WORKER_CALIBRATORS = [Calibrator.from_json(path) for path in standard_paths]
+    _WORKER_MODELS = compile_calibrators(_WORKER_CALIBRATORS)
+
+
+def _convert_document(
+    source: str, target: str, extrapolate: bool, warm_start: bool
+) -> tuple[int, float]:
+    """Converts a single EnzymeML document and returns the number of converted
+    measurements and the elapsed time."""
+
+    from calipytion.tools.enzymeml import stream_apply_calibrators
+
+    start = time.perf_counter()
+    converted_count = stream_apply_calibrators(
+        _WORKER_CALIBRATORS,
+        source,
+        target,
+        extrapolate=extrapolate,
+        silent=True,
+        fitted_models=_WORKER_MODELS,
+        warm_start=warm_start,
+    )
+
+    return converted_count, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,19 +1,83 @@
 """Methods for mapping CaliPytion to AnIML"""
 
-from mdmodels import DataModel
+import base64
+import os
+from functools import lru_cache
+from pathlib import Path
 
-try:
-    animl_lib = DataModel.from_github(
-        repo="FAIRChemistry/animl-specification",
-        branch="main",
-        spec_path="specifications/animl.md",
-    )
-except Exception as e:
-    print(
-        "The following unexpected error has occured while retrieving the "
-        + f"data model from GitHub: {type(e).__name__} - Is there a working "
-        + "network connection?"
-    )
+import httpx
+import numpy as np
+
+from calipytion.ioutils.cache import get_cache_dir
+
+ANIML_REPO = "FAIRChemistry/animl-specification"
+ANIML_BRANCH = "main"
+ANIML_SPEC_PATH = "specifications/animl.md"
+ANIML_SPEC_ENV = "CALIPYTION_ANIML_SPEC"
+VENDORED_SPEC = Path(__file__).parent / "specifications" / "animl.md"
+
+
+def __getattr__(name: str):
+    # `animl_lib` used to be built at import and is kept for compatibility
+    if name == "animl_lib":
+        return get_animl_lib()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@lru_cache(maxsize=1)
+def get_animl_lib() -> "Library":
+    """Builds the AnIML data model on first use and keeps it for the process.
+
+    The specification is read from the file given by the `CALIPYTION_ANIML_SPEC`
+    environment variable, a copy vendored with the package or the local cache, in
+    this order. Only if none exists, it is downloaded from GitHub once and stored in
+    the cache, so later processes start without network access.
+
+    Raises:
+        ConnectionError: If the specification is neither available locally nor
+            retrievable from GitHub.
+
+    Returns:
+        Library: The AnIML data model.
+    """
+    from mdmodels import DataModel
+
+    return DataModel.from_markdown_string(_load_animl_spec())
+
+
+def _load_animl_spec() -> str:
+    """Reads the AnIML specification from the first local copy or GitHub."""
+
+    cached_spec = get_cache_dir() / "animl" / f"{ANIML_BRANCH}.md"
+    candidates = [VENDORED_SPEC, cached_spec]
+    if os.environ.get(ANIML_SPEC_ENV):
+        candidates.insert(0, Path(os.environ[ANIML_SPEC_ENV]).expanduser())
+
+    for path in candidates:
+        if path.is_file():
+            return path.read_text(encoding="utf-8")
+
+    url = f"https://raw.githubusercontent.com/{ANIML_REPO}/{ANIML_BRANCH}/{ANIML_SPEC_PATH}"
+    try:
+        response = httpx.get(url, timeout=30, follow_redirects=True)
+        response.raise_for_status()
+    except httpx.HTTPError as e:
+        raise ConnectionError(
+            f"The AnIML specification could not be retrieved from GitHub "
+            f"({type(e).__name__}). Set '{ANIML_SPEC_ENV}' to a local copy of "
+            f"'{ANIML_SPEC_PATH}' from '{ANIML_REPO}' to work offline."
+        ) from e
+
+    # write atomically, since several workers might fetch the spec at once
+    try:
+        cached_spec.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cached_spec.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(response.text, encoding="utf-8")
+        os.replace(tmp_path, cached_spec)
+    except OSError:
+        pass
+
+    return response.text
 
 
 def get_animl_document() -> "AnIML":
@@ -22,82 +86,386 @@ def get_animl_document() -> "AnIML":
     Returns:
         AnIML: An AnIML document object.
     """
-    return animl_lib.AnIML()
+    animl_lib = get_animl_lib()
+
+    # recent mdmodels versions name the root object `AnIml`
+    root = getattr(animl_lib, "AnIML", None) or animl_lib.AnIml
+    return root()
 
 
-def map_standard_to_animl(standard: "Standard", animl_document: "AnIML") -> None:
+def map_standard_to_animl(standard: "Standard", animl_document: "AnIML") -> "AnIML":
     """Map the fields of a CaliPytion Standard object to an AnIML
     document.
 
     Args:
         standard (Standard): The Standard object to map.
         animl_document (AnIML): The AnIML object to map to.
+
+    Returns:
+        AnIML: The AnIML document.
     """
-    # Create the SampleSet and Sample elements and set the Sample's name
-    # according to the UV/Vis Technique definition document
-    sample_set = animl_lib.SampleSet()
-    animl_document.sample_set = sample_set
-    animl_sample = animl_document.sample_set.add_to_sample(
-        name="Test Sample", sample_id="sample0000"
-    )
+    return map_standards_to_animl([standard], animl_document)
+
+
+def map_standard_to_animl_compact(
+    standard: "Standard", animl_document: "AnIML"
+) -> "AnIML":
+    """Map a CaliPytion Standard object to an AnIML document with a compact
+    layout for standards with many samples.
+
+    Instead of one ExperimentStep with its own SeriesSet and metadata elements per
+    sample, all concentrations and intensities are stored as single series in one
+    ExperimentStep. Both are written as base64 encoded little-endian float64
+    arrays in an EncodedValueSet, while the constant wavelength is described by an
+    AutoIncrementedValueSet. The Technique, Infrastructure and Method elements are
+    therefore created only once.
+
+    Args:
+        standard (Standard): The Standard object to map.
+        animl_document (AnIML): The AnIML object to map to.
+
+    Raises:
+        ValueError: If the samples have different concentration units.
+
+    Returns:
+        AnIML: The AnIML document.
+    """
+    return map_standards_to_animl([standard], animl_document, compact=True)
+
 
-    # Map to the Sample element
-    _map_to_sample(standard=standard, sample=animl_sample)
+def map_standards_to_animl(
+    standards: list["Standard"],
+    animl_document: "AnIML",
+    compact: bool = False,
+    wavelength_nm: float | None = None,
+) -> "AnIML":
+    """Map any number of CaliPytion Standard objects, e.g. of several molecules or
+    wavelengths, to a single AnIML document.
 
-    # Create the ExperimentStepSet object and variables to keep track of
-    # the current ExperimentStep and Series and iterate over the various
-    # CaliPytion Sample objects (corresponding to ExperimentSteps)
+    Each Standard becomes an AnIML Sample with its ExperimentSteps and, if fitted,
+    a final "Calibration Model" ExperimentStep. Sample, ExperimentStep and Series ids
+    are allocated consecutively across all standards, so they are unique within the
+    document, and the Technique and Method elements are shared between all
+    ExperimentSteps. All ExperimentSteps of a Standard reference its Sample, so the
+    Standards are read back separately by `read_animl_standards`.
+
+    Args:
+        standards (list[Standard]): The Standard objects to map.
+        animl_document (AnIML): The AnIML object to map to.
+        compact (bool, optional): Whether to store the samples of each Standard as
+            single encoded series, see `map_standard_to_animl_compact`. Defaults to False.
+        wavelength_nm (float | None, optional): The wavelength of the measurements in nm,
+            which is written for all Standards without modifying them. Defaults to None,
+            writing the wavelength of each Standard.
+
+    Raises:
+        ValueError: If a Standard has no wavelength and none is given.
+        ValueError: If the samples of a Standard have different concentration units
+            in compact mode.
+
+    Returns:
+        AnIML: The AnIML document.
+    """
+    wavelengths = []
+    for standard in standards:
+        wavelength = wavelength_nm if wavelength_nm is not None else standard.wavelength
+        if wavelength is None:
+            raise ValueError(
+                f"Standard of '{standard.molecule_id}' has no wavelength. Set the "
+                "wavelength of the standard or pass it as `wavelength_nm`."
+            )
+        wavelengths.append(float(wavelength))
+
+    animl_lib = get_animl_lib()
+
+    ids = _IdAllocator()
+    shared_metadata: dict = {}
+
+    # Create the SampleSet and the ExperimentStepSet, to which all standards
+    # are added
+    animl_document.sample_set = animl_lib.SampleSet()
     experiment_step_set = animl_lib.ExperimentStepSet()
     experiment_step_set.experiment_step = []
 
-    current_experiment_step_id = -1
-    current_series_id = 0
-
-    for calipytion_sample in standard.samples:
-        # Create the ExperimentStep for the current CaliPytion Sample
-        current_experiment_step_id += 1
-        new_experiment_step = animl_lib.ExperimentStep(
-            name=f"Standard of c = {calipytion_sample.concentration} {calipytion_sample.conc_unit.name} measured at {standard.wavelength} nm",
-            experiment_step_id=f"step{str(current_experiment_step_id).zfill(4)}",
+    for standard, wavelength in zip(standards, wavelengths):
+        # Create the Sample element, named according to the UV/Vis Technique
+        # definition document, and map to it
+        animl_sample = animl_document.sample_set.add_to_sample(
+            name="Test Sample", sample_id=ids.next("sample")
         )
-
-        # Map to the Result element of the ExperimentStep
-        current_series_id = _map_sample_to_result(
-            sample=calipytion_sample,
-            wavelength=standard.wavelength,
-            experiment_step=new_experiment_step,
-            current_series_id=current_series_id,
+        _map_to_sample(standard=standard, sample=animl_sample)
+
+        if compact:
+            experiment_steps = [
+                _map_standard_to_compact_step(
+                    standard, wavelength, animl_sample, ids, shared_metadata
+                )
+            ]
+        else:
+            experiment_steps = [
+                _map_sample_to_experiment_step(
+                    calipytion_sample,
+                    wavelength,
+                    animl_sample,
+                    ids,
+                    shared_metadata,
+                )
+                for calipytion_sample in standard.samples
+            ]
+        experiment_step_set.experiment_step.extend(experiment_steps)
+
+        if standard.result is None:
+            continue
+
+        # Create the final ExperimentStep for the CalibrationModel
+        final_experiment_step = animl_lib.ExperimentStep(
+            name="Calibration Model",
+            experiment_step_id=ids.next("step"),
         )
+        _map_calibration_model_to_result(
+            calibration_model=standard.result, experiment_step=final_experiment_step
+        )
+        # Reference the Sample, so the model is read back with its Standard
+        final_experiment_step.infrastructure = shared_metadata.get(
+            ("infrastructure", animl_sample.sample_id)
+        )
+        experiment_step_set.experiment_step.append(final_experiment_step)
+
+    # Add the ExperimentStepSet to the AnIML document object
+    animl_document.experiment_step_set = experiment_step_set
+
+    return animl_document
+
+
+def export_calibrators_to_animl(
+    calibrators: list["Calibrator"],
+    path: str | None = None,
+    wavelength_nm: float | None = None,
+    compact: bool = False,
+    silent: bool = False,
+) -> "AnIML":
+    """Exports the standards of many calibrators into a single AnIML document.
+
+    Args:
+        calibrators (list[Calibrator]): The calibrators to export.
+        path (str | None, optional): Path to which the document is written in a single
+            serialization pass. Defaults to None, only returning the document.
+        wavelength_nm (float | None, optional): The wavelength of the measurements in nm,
+            which is written for all standards without modifying them. Defaults to None,
+            writing the wavelength of each standard.
+        compact (bool, optional): Whether to store the samples of each standard as
+            single encoded series. Defaults to False.
+        silent (bool, optional): Silences the print output. Defaults to False.
+
+    Raises:
+        AssertionError: If a calibrator has no standard with a calibration model.
+        ValueError: If a standard has no wavelength and none is given.
+
+    Returns:
+        AnIML: The AnIML document.
+    """
+    standards = []
+    for calibrator in calibrators:
+        assert calibrator.standard, f"No standard object found for {calibrator.molecule_id}."
+        assert (
+            calibrator.standard.result
+        ), f"No model found in the standard object of {calibrator.molecule_id}."
+
+        standards.append(calibrator.standard)
+
+    animl_document = map_standards_to_animl(
+        standards, get_animl_document(), compact=compact, wavelength_nm=wavelength_nm
+    )
+
+    if path is not None:
+        with open(path, "wb") as file:
+            file.write(animl_document.xml(encoding="bytes"))
+
+    if not silent:
+        print(f"✅ Exported {len(standards)} standards to AnIML document")
+
+    return animl_document
+
+
+class _IdAllocator:
+    """Allocates consecutive ids like `step0000` per prefix."""
+
+    def __init__(self):
+        self._counts: dict[str, int] = {}
+
+    def next(self, prefix: str) -> str:
+        count = self._counts.get(prefix, 0)
+        self._counts[prefix] = count + 1
+        return f"{prefix}{str(count).zfill(4)}"
+
+
+def _map_sample_to_experiment_step(
+    calipytion_sample: "CalipytionSample",
+    wavelength: float,
+    animl_sample: "Sample",
+    ids: _IdAllocator,
+    shared_metadata: dict,
+) -> "ExperimentStep":
+    """Map a single CaliPytion Sample to an ExperimentStep.
+
+    Args:
+        calipytion_sample (CalipytionSample): The CaliPytion Sample object to map.
+        wavelength (float): The wavelength the Standard was measured at.
+        animl_sample (Sample): The AnIML Sample object of the Standard.
+        ids (_IdAllocator): Allocator of the element ids of the document.
+        shared_metadata (dict): Metadata elements shared between ExperimentSteps.
+
+    Returns:
+        ExperimentStep: The AnIML ExperimentStep.
+    """
+    animl_lib = get_animl_lib()
 
-        # Map to the metadata elements Technique, Infrastructure, and
-        # Method of the ExperimentStep
-        _map_to_metadata_elements(
-            sample=animl_sample, experiment_step=new_experiment_step
+    experiment_step = animl_lib.ExperimentStep(
+        name=f"Standard of c = {calipytion_sample.concentration} {calipytion_sample.conc_unit.name} measured at {wavelength} nm",
+        experiment_step_id=ids.next("step"),
+    )
+
+    # Map to the Result element of the ExperimentStep
+    _map_sample_to_result(
+        sample=calipytion_sample,
+        wavelength=wavelength,
+        experiment_step=experiment_step,
+        ids=ids,
+    )
+
+    # Map to the metadata elements Technique, Infrastructure, and
+    # Method of the ExperimentStep
+    _map_to_metadata_elements(
+        sample=animl_sample,
+        experiment_step=experiment_step,
+        shared_metadata=shared_metadata,
+    )
+
+    return experiment_step
+
+
+def _map_standard_to_compact_step(
+    standard: "Standard",
+    wavelength: float,
+    animl_sample: "Sample",
+    ids: _IdAllocator,
+    shared_metadata: dict,
+) -> "ExperimentStep":
+    """Map all samples of a Standard to a single ExperimentStep with encoded series.
+
+    Args:
+        standard (Standard): The Standard object to map.
+        wavelength (float): The wavelength the Standard was measured at.
+        animl_sample (Sample): The AnIML Sample object of the Standard.
+        ids (_IdAllocator): Allocator of the element ids of the document.
+        shared_metadata (dict): Metadata elements shared between ExperimentSteps.
+
+    Raises:
+        ValueError: If the samples have different concentration units.
+
+    Returns:
+        ExperimentStep: The AnIML ExperimentStep.
+    """
+    animl_lib = get_animl_lib()
+
+    conc_units = {str(sample.conc_unit.name) for sample in standard.samples}
+    if len(conc_units) > 1:
+        raise ValueError(
+            f"Samples with different concentration units {conc_units} cannot be "
+            "exported as a single series."
         )
 
-        # Add the current ExperimentStep to the ExperimentStepSet
-        experiment_step_set.experiment_step.append(new_experiment_step)
+    n_samples = len(standard.samples)
+    concentrations = np.fromiter(
+        (sample.concentration for sample in standard.samples), float, n_samples
+    )
+    signals = np.fromiter(
+        (sample.signal for sample in standard.samples), float, n_samples
+    )
 
-    # Create the final ExperimentStep for the CalibrationModel
-    current_experiment_step_id += 1
-    final_experiment_step = animl_lib.ExperimentStep(
-        name="Calibration Model",
-        experiment_step_id=f"step{str(current_experiment_step_id).zfill(4)}",
+    experiment_step = animl_lib.ExperimentStep(
+        name=f"Standard of {n_samples} samples measured at {wavelength} nm",
+        experiment_step_id=ids.next("step"),
     )
 
-    # Map the CalibrationModel to the Result element of the final
-    # ExperimentStep
-    _map_calibration_model_to_result(
-        calibration_model=standard.result, experiment_step=final_experiment_step
+    series_set = animl_lib.SeriesSet(name="Spectrum", length=str(n_samples))
+    series_set.series = [
+        animl_lib.Series(
+            value_set=animl_lib.EncodedValueSet(value=encode_values(concentrations)),
+            unit=animl_lib.Unit(label=conc_units.pop() if conc_units else ""),
+            name="Concentration",
+            dependency="independent",
+            series_id=ids.next("series"),
+            plot_scale="linear",
+            series_type="float",
+        ),
+        animl_lib.Series(
+            value_set=animl_lib.AutoIncrementedValueSet(
+                start_value=wavelength, increment=0.0
+            ),
+            unit=animl_lib.Unit(label="nm"),
+            name="Wavelength",
+            dependency="independent",
+            series_id=ids.next("series"),
+            plot_scale="linear",
+            series_type="float",
+        ),
+        animl_lib.Series(
+            value_set=animl_lib.EncodedValueSet(value=encode_values(signals)),
+            unit=animl_lib.Unit(label="AU", quantity="intensity"),
+            name="Intensity",
+            dependency="dependent",
+            series_id=ids.next("series"),
+            plot_scale="linear",
+            series_type="float",
+        ),
+    ]
+
+    result = animl_lib.Result(name="Spectrum")
+    result.series_set = series_set
+    result.add_to_category(
+        name="Measurement Description",
+        parameter=[
+            animl_lib.Parameter(
+                name="Experiment Duration", value=0, parameter_type="integer"
+            )
+        ],
     )
+    experiment_step.result.append(result)
 
-    # Add the final ExperimentStep to the ExperimentStepSet
-    experiment_step_set.experiment_step.append(final_experiment_step)
+    _map_to_metadata_elements(
+        sample=animl_sample,
+        experiment_step=experiment_step,
+        shared_metadata=shared_metadata,
+    )
 
-    # Add the ExperimentStepSet to the AnIML document object
-    animl_document.experiment_step_set = experiment_step_set
+    return experiment_step
+
+
+def encode_values(values: np.ndarray) -> str:
+    """Encode values as base64 string of little-endian float64 numbers, as used
+    by the AnIML EncodedValueSet.
+
+    Args:
+        values (np.ndarray): The values to encode.
+
+    Returns:
+        str: The base64 encoded values.
+    """
+    return base64.b64encode(np.asarray(values, dtype="<f8").tobytes()).decode("ascii")
 
-    return animl_document
+
+def decode_values(encoded: str) -> np.ndarray:
+    """Decode a base64 string of little-endian float64 numbers of an AnIML
+    EncodedValueSet.
+
+    Args:
+        encoded (str): The base64 encoded values.
+
+    Returns:
+        np.ndarray: The decoded values.
+    """
+    return np.frombuffer(base64.b64decode(encoded), dtype="<f8").astype(float)
 
 
 def _map_to_sample(standard: "Standard", sample: "Sample") -> None:
@@ -107,6 +475,8 @@ def _map_to_sample(standard: "Standard", sample: "Sample") -> None:
         standard (Standard): The Standard object to map
         sample (Sample): The AnIML Sample object to map to
     """
+    animl_lib = get_animl_lib()
+
     # Create and fill the category element for general sample
     # description parameters
     description_category = animl_lib.Category(name="Description")
@@ -138,8 +508,8 @@ def _map_sample_to_result(
     sample: "Sample",
     wavelength: float,
     experiment_step: "ExperimentStep",
-    current_series_id: int,
-) -> int:
+    ids: _IdAllocator,
+) -> None:
     """Map the measurements contained in the Sample object to a Result
     element within an ExperimentStep object.
 
@@ -147,11 +517,10 @@ def _map_sample_to_result(
         sample (Sample): A CaliPytion Sample object.
         wavelength (float): The wavelength the Standard was measured at.
         experiment_step (ExperimentStep): An AnIML ExperimentStep object.
-        current_series_id (int): The variable to keep track of the current Series ID.
-
-    Returns:
-        int: Updated current_series_id.
+        ids (_IdAllocator): Allocator of the element ids of the document.
     """
+    animl_lib = get_animl_lib()
+
     # Create the Result object for the measurement
     result = animl_lib.Result(name="Spectrum")
 
@@ -183,14 +552,13 @@ def _map_sample_to_result(
         unit=concentration_unit,
         name="Concentration",
         dependency="independent",
-        series_id=f"series{str(current_series_id).zfill(4)}",
+        series_id=ids.next("series"),
         plot_scale="linear",
         series_type="float",
     )
 
-    # Append the new Series to the SeriesSet and increment the id by 1
+    # Append the new Series to the SeriesSet
     new_series_set.series.append(concentration_series)
-    current_series_id += 1
 
     ### Wavelength Series ###
 
@@ -211,14 +579,13 @@ def _map_sample_to_result(
         unit=wavelength_unit,
         name="Wavelength",
         dependency="independent",
-        series_id=f"series{str(current_series_id).zfill(4)}",
+        series_id=ids.next("series"),
         plot_scale="linear",
         series_type="float",
     )
 
-    # Append the new Series to the SeriesSet and increment the id by 1
+    # Append the new Series to the SeriesSet
     new_series_set.series.append(wavelength_series)
-    current_series_id += 1
 
     ### Intensity Series ###
 
@@ -241,14 +608,13 @@ def _map_sample_to_result(
         unit=intensity_unit,
         name="Intensity",
         dependency="dependent",
-        series_id=f"series{str(current_series_id).zfill(4)}",
+        series_id=ids.next("series"),
         plot_scale="linear",
         series_type="float",
     )
 
-    # Append the new Series to the SeriesSet and increment the id by 1
+    # Append the new Series to the SeriesSet
     new_series_set.series.append(intensity_series)
-    current_series_id += 1
 
     # Add the SeriesSet to the Result
     result.series_set = new_series_set
@@ -268,11 +634,11 @@ def _map_sample_to_result(
     # Add the Result to the ExperimentStep
     experiment_step.result.append(result)
 
-    return current_series_id
-
 
 def _map_to_metadata_elements(
-    sample: "Sample", experiment_step: "ExperimentStep"
+    sample: "Sample",
+    experiment_step: "ExperimentStep",
+    shared_metadata: dict | None = None,
 ) -> None:
     """Map to various metadata elements in an ExperimentStep of an AnIML
     document.
@@ -280,50 +646,64 @@ def _map_to_metadata_elements(
     Args:
         sample (Sample): An AnIML sample object.
         experiment_step (ExperimentStep): An AnIML ExperimentStep object.
+        shared_metadata (dict | None, optional): Elements created for previous
+            ExperimentSteps, which are reused if identical. Defaults to None.
     """
+    animl_lib = get_animl_lib()
+
+    if shared_metadata is None:
+        shared_metadata = {}
+
     # ~ TECHNIQUE ELEMENT ~
     # Create the Technique reference to the UV/Vis ATDD
-    experiment_step.technique = animl_lib.Technique(
-        name="UV/Vis",
-        uri="https://github.com/AnIML/techniques/blob/master/uv-vis.atdd",
-    )
+    if "technique" not in shared_metadata:
+        shared_metadata["technique"] = animl_lib.Technique(
+            name="UV/Vis",
+            uri="https://github.com/AnIML/techniques/blob/master/uv-vis.atdd",
+        )
+    experiment_step.technique = shared_metadata["technique"]
 
     # ~ INFRASTRUCTURE ELEMENT ~
     # Create the Infrastructure object and map the sample reference
-    sample_reference = animl_lib.SampleReference(
-        sample_id=sample.sample_id,
-        role="measured",
-        sample_purpose="consumed",
-    )
+    infrastructure_key = ("infrastructure", sample.sample_id)
+    if infrastructure_key not in shared_metadata:
+        sample_reference = animl_lib.SampleReference(
+            sample_id=sample.sample_id,
+            role="measured",
+            sample_purpose="consumed",
+        )
 
-    infrastructure = animl_lib.Infrastructure(
-        sample_reference_set=animl_lib.SampleReferenceSet(),
-    )
+        infrastructure = animl_lib.Infrastructure(
+            sample_reference_set=animl_lib.SampleReferenceSet(),
+        )
 
-    infrastructure.sample_reference_set.sample_reference.append(sample_reference)
+        infrastructure.sample_reference_set.sample_reference.append(sample_reference)
+        shared_metadata[infrastructure_key] = infrastructure
 
-    experiment_step.infrastructure = infrastructure
+    experiment_step.infrastructure = shared_metadata[infrastructure_key]
 
     # ~ METHOD ELEMENT ~
     # Create the Method according to the UV/Vis technique definition
-    method = animl_lib.Method(name="Common Method")
-
-    measurement_type_parameter = animl_lib.Parameter(
-        name="Measurment Type",
-        value=(
-            "Single"
-            if (experiment_step.result[0].series_set.length == "1")
-            else "Spectrum"
-        ),
-        parameter_type="string",
+    measurement_type = (
+        "Single" if (experiment_step.result[0].series_set.length == "1") else "Spectrum"
     )
+    method_key = ("method", measurement_type)
+    if method_key not in shared_metadata:
+        method = animl_lib.Method(name="Common Method")
+
+        measurement_type_parameter = animl_lib.Parameter(
+            name="Measurment Type",
+            value=measurement_type,
+            parameter_type="string",
+        )
 
-    method.add_to_category(
-        name="Instrument Settings",
-        parameter=[measurement_type_parameter],
-    )
+        method.add_to_category(
+            name="Instrument Settings",
+            parameter=[measurement_type_parameter],
+        )
+        shared_metadata[method_key] = method
 
-    experiment_step.method = method
+    experiment_step.method = shared_metadata[method_key]
 
 
 def _map_calibration_model_to_result(
@@ -0,0 +1,398 @@
+"""Methods for reading CaliPytion Standards from AnIML"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+from os import PathLike
+from typing import IO
+from xml.etree.ElementTree import Element, iterparse
+
+from calipytion.ioutils.animlio import decode_values
+from calipytion.model import (
+    CalibrationModel,
+    CalibrationRange,
+    FitStatistics,
+    Parameter,
+    Sample,
+    Standard,
+    UnitDefinition,
+)
+
+VALUE_TAGS = {"F", "D", "I", "L", "S", "Boolean"}
+AUTO_INCREMENT_TAGS = {"StartValue", "Increment"}
+# mdmodels writes the value set of a Series as `value_set` element
+VALUE_SET_TAGS = {"IndividualValueSet", "EncodedValueSet", "value_set"}
+
+PARAMETER_FIELDS = {
+    "Initial value": "init_value",
+    "Standard error": "stderr",
+    "Lower bound": "lower_bound",
+    "Upper bound": "upper_bound",
+}
+
+CALIBRATION_RANGE_FIELDS = {
+    "Concentration lower bound": "conc_lower",
+    "Concentration upper bound": "conc_upper",
+    "Intensity lower bound": "signal_lower",
+    "Intensity upper bound": "signal_upper",
+}
+
+FIT_STATISTICS_FIELDS = {
+    "Akaike information criterion (aic)": "aic",
+    "Bayesian information criterion (bic)": "bic",
+    "Coefficient of determination (r^2)": "r2",
+    "Root mean square deviation (RMSD)": "rmsd",
+}
+
+
+@dataclass
+class _AnIMLContent:
+    """Values of a standard collected while streaming through an AnIML document."""
+
+    sample_id: str | None = None
+    description: dict[str, float | str] = field(default_factory=dict)
+    temp_unit: str | None = None
+    conc_unit: str | None = None
+    wavelength: float | None = None
+    concentrations: list[float] = field(default_factory=list)
+    signals: list[float] = field(default_factory=list)
+    model_name: str | None = None
+    signal_law: str | None = None
+    parameters: list[dict[str, float | str]] = field(default_factory=list)
+    calibration_range: dict[str, float] = field(default_factory=dict)
+    statistics: dict[str, float] = field(default_factory=dict)
+
+    def add_step(self, step: _AnIMLContent) -> None:
+        """Adds the values of an ExperimentStep measured on the sample."""
+
+        self.conc_unit = self.conc_unit or step.conc_unit
+        if self.wavelength is None:
+            self.wavelength = step.wavelength
+        self.concentrations.extend(step.concentrations)
+        self.signals.extend(step.signals)
+
+        if step.model_name is not None:
+            self.model_name = step.model_name
+            self.signal_law = step.signal_law
+            self.parameters = step.parameters
+            self.calibration_range = step.calibration_range
+            self.statistics = step.statistics
+
+
+def read_animl_standard(
+    source: str | PathLike | IO[bytes],
+    pubchem_cid: int,
+    molecule_name: str,
+    molecule_id: str | None = None,
+) -> Standard:
+    """Reads a Standard from an AnIML document written by `export_to_animl`.
+
+    The XML is streamed with an incremental parser and each ExperimentStep is
+    discarded once its values are collected, so the full AnIML object tree is never
+    built. Both the per-sample layout and the compact layout with encoded series are
+    supported. The "Calibration Model" result, if present, is restored as the result
+    of the Standard.
+
+    Args:
+        source (str | PathLike | IO[bytes]): Path or binary file object of the document.
+        pubchem_cid (int): PubChem Compound Identifier of the molecule, which is not
+            part of the AnIML document.
+        molecule_name (str): Name of the molecule, which is not part of the AnIML document.
+        molecule_id (str | None, optional): Molecule id of the standard to read from a
+            document with several standards. Defaults to None, requiring the document
+            to contain a single standard.
+
+    Raises:
+        ValueError: If the document contains no standard or uses unknown units.
+        ValueError: If not exactly one standard of the document matches the molecule id.
+
+    Returns:
+        Standard: The Standard object.
+    """
+
+    contents = _parse(source)
+    if molecule_id is not None:
+        contents = [
+            content
+            for content in contents
+            if content.description.get("Descriptive Name") == molecule_id
+        ]
+
+    if not contents:
+        raise ValueError(
+            "No standard"
+            + (f" of '{molecule_id}'" if molecule_id is not None else "")
+            + " found in AnIML document."
+        )
+    if len(contents) > 1:
+        raise ValueError(
+            f"AnIML document contains {len(contents)} standards"
+            + (f" of '{molecule_id}'" if molecule_id is not None else "")
+            + ". Use `read_animl_standards` to read all of them."
+        )
+
+    return _to_standard(contents[0], pubchem_cid, molecule_name)
+
+
+def read_animl_standards(
+    source: str | PathLike | IO[bytes],
+    pubchem_cids: dict[str, int],
+    molecule_names: dict[str, str],
+) -> list[Standard]:
+    """Reads all Standards from an AnIML document, e.g. written by
+    `export_calibrators_to_animl`.
+
+    Every AnIML Sample of the document is read as a separate Standard with the
+    ExperimentSteps referencing it, see `read_animl_standard`.
+
+    Args:
+        source (str | PathLike | IO[bytes]): Path or binary file object of the document.
+        pubchem_cids (dict[str, int]): PubChem Compound Identifiers by molecule id.
+        molecule_names (dict[str, str]): Names of the molecules by molecule id.
+
+    Raises:
+        ValueError: If a standard has no description or uses unknown units.
+        ValueError: If the PubChem CID or name of a molecule is not given.
+
+    Returns:
+        list[Standard]: The Standard objects in the order of the AnIML Samples.
+    """
+
+    standards = []
+    for content in _parse(source):
+        molecule_id = str(content.description.get("Descriptive Name"))
+        if molecule_id not in pubchem_cids or molecule_id not in molecule_names:
+            raise ValueError(
+                f"PubChem CID and name of molecule '{molecule_id}' are required."
+            )
+        standards.append(
+            _to_standard(
+                content, pubchem_cids[molecule_id], molecule_names[molecule_id]
+            )
+        )
+
+    return standards
+
+
+def _to_standard(
+    content: _AnIMLContent, pubchem_cid: int, molecule_name: str
+) -> Standard:
+    """Creates the Standard of the values collected for an AnIML Sample."""
+
+    if "Descriptive Name" not in content.description:
+        raise ValueError("No standard description found in AnIML document.")
+    if len(content.concentrations) != len(content.signals):
+        raise ValueError("Number of concentrations and intensities must be the same.")
+
+    molecule_id = str(content.description["Descriptive Name"])
+    conc_unit = _unit_by_label(content.conc_unit)
+
+    samples = [
+        Sample(concentration=concentration, conc_unit=conc_unit, signal=signal)
+        for concentration, signal in zip(content.concentrations, content.signals)
+    ]
+
+    result = None
+    if content.model_name is not None:
+        result = CalibrationModel(
+            name=content.model_name,
+            molecule_id=molecule_id,
+            signal_law=content.signal_law,
+            parameters=[Parameter(**parameter) for parameter in content.parameters],
+            was_fitted=True,
+            calibration_range=(
+                CalibrationRange(**content.calibration_range)
+                if content.calibration_range
+                else None
+            ),
+            statistics=(
+                FitStatistics(**content.statistics) if content.statistics else None
+            ),
+        )
+
+    return Standard(
+        molecule_id=molecule_id,
+        pubchem_cid=pubchem_cid,
+        molecule_name=molecule_name,
+        ph=float(content.description["pH"]),
+        temperature=float(content.description["Temperature"]),
+        temp_unit=_unit_by_label(content.temp_unit),
+        wavelength=content.wavelength,
+        samples=samples,
+        result=result,
+    )
+
+
+def _parse(source: str | PathLike | IO[bytes]) -> list[_AnIMLContent]:
+    """Streams through the document and collects the values of each AnIML Sample.
+
+    The values of an ExperimentStep belong to the Sample it references. Steps without
+    a SampleReference, like the "Calibration Model" step following the measurements
+    of a standard, belong to the Sample of the preceding step.
+    """
+
+    samples: dict[str | None, _AnIMLContent] = {}
+    sample: _AnIMLContent | None = None
+    step: _AnIMLContent | None = None
+    step_sample_id: str | None = None
+    last_sample_id: str | None = None
+
+    # names of the enclosing elements, e.g. ("Category", "Description")
+    stack: list[tuple[str, str | None]] = []
+    series_values: list[float] = []
+    series_set_length = 0
+    auto_increment: dict[str, float] = {}
+
+    for event, elem in iterparse(source, events=("start", "end")):
+        tag = _local(elem.tag)
+
+        if event == "start":
+            stack.append((tag, elem.get("name")))
+            if tag == "Sample":
+                sample = _AnIMLContent(sample_id=elem.get("sampleID"))
+                samples[sample.sample_id] = sample
+            elif tag == "ExperimentStep":
+                step = _AnIMLContent()
+                step_sample_id = None
+            elif tag == "SampleReference" and step_sample_id is None:
+                step_sample_id = elem.get("sampleID")
+            elif tag == "SeriesSet":
+                series_set_length = int(elem.get("length") or 0)
+            elif tag == "Series":
+                series_values = []
+                auto_increment = {}
+            continue
+
+        stack.pop()
+        parent = stack[-1][0] if stack else None
+        target = step if step is not None else sample
+
+        if tag in VALUE_TAGS and parent in ("IndividualValueSet", "value_set"):
+            series_values.append(float(elem.text or "nan"))
+        elif tag in VALUE_TAGS and parent in AUTO_INCREMENT_TAGS:
+            auto_increment[parent] = float(elem.text or "nan")
+        elif parent in VALUE_SET_TAGS and tag not in AUTO_INCREMENT_TAGS:
+            # encoded values wrapped in an element of their own
+            series_values.extend(decode_values(elem.text or "").tolist())
+        elif tag == "EncodedValueSet" and (elem.text or "").strip():
+            series_values.extend(decode_values(elem.text or "").tolist())
+        elif tag == "AutoIncrementedValueSet" or (
+            tag == "value_set" and auto_increment
+        ):
+            start = auto_increment.get("StartValue", 0.0)
+            increment = auto_increment.get("Increment", 0.0)
+            series_values.extend(
+                start + increment * idx for idx in range(series_set_length)
+            )
+        elif tag == "Series" and target is not None:
+            _collect_series(target, elem, series_values)
+        elif tag == "Parameter" and target is not None:
+            _collect_parameter(target, elem, stack)
+        elif tag == "Sample":
+            sample = None
+        elif tag == "ExperimentStep" and step is not None:
+            sample_id = step_sample_id or last_sample_id
+            if sample_id is None and len(samples) == 1:
+                sample_id = next(iter(samples))
+            if sample_id not in samples:
+                raise ValueError(
+                    f"ExperimentStep '{elem.get('experimentStepID')}' references no "
+                    "Sample of the AnIML document."
+                )
+            samples[sample_id].add_step(step)
+            last_sample_id = sample_id
+            step = None
+
+        # keep memory constant by discarding processed elements
+        if tag in ("ExperimentStep", "Sample"):
+            elem.clear()
+
+    return list(samples.values())
+
+
+def _collect_series(
+    content: _AnIMLContent, elem: Element, values: list[float]
+) -> None:
+    name = elem.get("name")
+    if name == "Concentration":
+        content.concentrations.extend(values)
+        content.conc_unit = content.conc_unit or _unit_label(elem)
+    elif name == "Intensity":
+        content.signals.extend(values)
+    elif name == "Wavelength" and values and content.wavelength is None:
+        content.wavelength = values[0]
+
+
+def _collect_parameter(
+    content: _AnIMLContent, elem: Element, stack: list[tuple[str, str | None]]
+) -> None:
+    name = elem.get("name") or ""
+    value = _parameter_value(elem)
+    categories = [name for tag, name in stack if tag == "Category"]
+    results = [name for tag, name in stack if tag == "Result"]
+
+    if categories == ["Description"]:
+        content.description[name] = value
+        if name == "Temperature":
+            content.temp_unit = _unit_label(elem)
+        return
+
+    if results != ["Calibration Model"] or not categories:
+        return
+
+    if len(categories) == 1 and name == "Model Equation":
+        content.model_name = categories[0]
+        content.signal_law = str(value)
+    elif categories[-1] == "Model Parameters":
+        if name in PARAMETER_FIELDS and content.parameters:
+            content.parameters[-1][PARAMETER_FIELDS[name]] = value
+        else:
+            content.parameters.append({"symbol": name, "value": value})
+    elif categories[-1] == "Calibration Range" and name in CALIBRATION_RANGE_FIELDS:
+        content.calibration_range[CALIBRATION_RANGE_FIELDS[name]] = float(value)
+    elif categories[-1] == "Fit statistics" and name in FIT_STATISTICS_FIELDS:
+        content.statistics[FIT_STATISTICS_FIELDS[name]] = float(value)
+
+
+def _parameter_value(elem: Element) -> float | str:
+    for child in elem:
+        tag = _local(child.tag)
+        if tag == "S":
+            return child.text or ""
+        if tag in VALUE_TAGS:
+            return float(child.text or "nan")
+
+    return elem.get("value", "")
+
+
+def _unit_label(elem: Element) -> str | None:
+    for child in elem:
+        if _local(child.tag) == "Unit":
+            return child.get("label")
+
+    return None
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _unit_by_label(label: str | None) -> UnitDefinition:
+    """Returns a copy of the predefined unit with the given name, so standards
+    read from documents do not share and mutate the module level units."""
+
+    return _predefined_unit(label).model_copy(deep=True)
+
+
+@lru_cache(maxsize=None)
+def _predefined_unit(label: str | None) -> UnitDefinition:
+    """Looks up the predefined unit with the given name."""
+
+    from calipytion import units
+
+    for unit in vars(units).values():
+        if isinstance(unit, UnitDefinition) and unit.name == label:
+            return unit
+
+    raise ValueError(f"Unknown unit '{label}' in AnIML document.")
@@ -0,0 +1,161 @@
+"""Memory-mappable binary archive of CaliPytion Standards"""
+
+from __future__ import annotations
+
+import struct
+from os import PathLike
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from calipytion.ioutils.standardio import ColumnarStandard, _dumps, _loads
+from calipytion.model import Standard
+
+MAGIC = b"CALIPYAR"
+ARCHIVE_VERSION = 1
+ALIGNMENT = 64
+
+# magic, format version and length of the JSON header in bytes
+_PREAMBLE = struct.Struct("<8sIQ")
+_ITEMSIZE = np.dtype("<f8").itemsize
+
+
+def write_archive(
+    standards: Iterable[Standard | ColumnarStandard], path: str | PathLike
+) -> None:
+    """Writes Standards into a binary archive.
+
+    The archive consists of a small JSON header with the metadata, including the
+    fitted calibration model, of every Standard, followed by the concentration and
+    signal arrays as aligned little-endian float64 blocks. The arrays can therefore
+    be memory-mapped by `CalibrationArchive` without parsing.
+
+    Args:
+        standards (Iterable[Standard | ColumnarStandard]): The Standards to archive.
+        path (str | PathLike): Path of the archive file.
+
+    Raises:
+        ValueError: If the samples of a Standard have different concentration units.
+    """
+
+    columnar_standards = [
+        standard
+        if isinstance(standard, ColumnarStandard)
+        else ColumnarStandard.from_standard(standard)
+        for standard in standards
+    ]
+
+    entries = []
+    offset = 0
+    for standard in columnar_standards:
+        length = len(standard.concentrations)
+        entries.append(
+            {
+                "metadata": standard.metadata,
+                "conc_unit": standard.conc_unit,
+                "length": length,
+                "offset": offset,
+            }
+        )
+        offset = _align(offset + 2 * length * _ITEMSIZE)
+
+    header = _dumps({"standards": entries})
+    data_start = _align(_PREAMBLE.size + len(header))
+
+    with open(path, "wb") as file:
+        file.write(_PREAMBLE.pack(MAGIC, ARCHIVE_VERSION, len(header)))
+        file.write(header)
+
+        for standard, entry in zip(columnar_standards, entries):
+            file.write(b"\0" * (data_start + entry["offset"] - file.tell()))
+            file.write(np.ascontiguousarray(standard.concentrations, "<f8").tobytes())
+            file.write(np.ascontiguousarray(standard.signals, "<f8").tobytes())
+
+
+class CalibrationArchive:
+    """Read access to a binary archive written by `write_archive`.
+
+    Opening an archive only reads the header. The sample arrays of the returned
+    `ColumnarStandard` objects are read-only views of a memory map, so their data is
+    paged in from disk only when accessed.
+
+    Args:
+        path (str | PathLike): Path of the archive file.
+
+    Raises:
+        ValueError: If the file is not a CaliPytion archive.
+    """
+
+    def __init__(self, path: str | PathLike):
+        with open(path, "rb") as file:
+            magic, version, header_length = _PREAMBLE.unpack(
+                file.read(_PREAMBLE.size)
+            )
+            if magic != MAGIC:
+                raise ValueError(f"'{path}' is not a CaliPytion archive.")
+            if version > ARCHIVE_VERSION:
+                raise ValueError(
+                    f"Archive version {version} is not supported by this version of "
+                    "CaliPytion."
+                )
+            header = _loads(file.read(header_length))
+
+        self.path = path
+        self._entries: list[dict] = header["standards"]
+
+        # the arrays of the last Standard end the archive
+        n_values = 0
+        if self._entries:
+            last_entry = self._entries[-1]
+            n_values = last_entry["offset"] // _ITEMSIZE + 2 * last_entry["length"]
+        if n_values:
+            self._data = np.memmap(
+                path,
+                dtype="<f8",
+                mode="r",
+                offset=_align(_PREAMBLE.size + header_length),
+                shape=(n_values,),
+            )
+        else:
+            self._data = np.empty(0)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[ColumnarStandard]:
+        for idx in range(len(self)):
+            yield self[idx]
+
+    def __getitem__(self, idx: int) -> ColumnarStandard:
+        entry = self._entries[idx]
+        start = entry["offset"] // _ITEMSIZE
+        length = entry["length"]
+
+        return ColumnarStandard(
+            metadata=entry["metadata"],
+            conc_unit=entry["conc_unit"],
+            concentrations=self._data[start : start + length],
+            signals=self._data[start + length : start + 2 * length],
+        )
+
+    @property
+    def molecule_ids(self) -> list[str]:
+        """The molecule ids of the archived Standards, in archive order."""
+
+        return [entry["metadata"]["molecule_id"] for entry in self._entries]
+
+    def to_standard(self, idx: int) -> Standard:
+        """Creates the Standard object of an archived Standard.
+
+        Args:
+            idx (int): Index of the Standard in the archive.
+
+        Returns:
+            Standard: The Standard object.
+        """
+
+        return self[idx].to_standard()
+
+
+def _align(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
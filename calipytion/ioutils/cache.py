@@ -0,0 +1,24 @@
+"""Location of the local cache of CaliPytion"""
+
+import os
+from pathlib import Path
+
+CACHE_DIR_ENV = "CALIPYTION_CACHE_DIR"
+DEFAULT_CACHE_DIR = Path("~/.cache/calipytion")
+
+
+def get_cache_dir(cache_dir: str | Path | None = None) -> Path:
+    """Returns the directory of the local cache.
+
+    Args:
+        cache_dir (str | Path | None, optional): Explicit cache directory. Defaults to
+            the `CALIPYTION_CACHE_DIR` environment variable or `~/.cache/calipytion`.
+
+    Returns:
+        Path: The expanded cache directory, which might not exist yet.
+    """
+
+    if cache_dir is None:
+        cache_dir = os.environ.get(CACHE_DIR_ENV, DEFAULT_CACHE_DIR)
+
+    return Path(cache_dir).expanduser()
@@ -0,0 +1,148 @@
+"""Incremental reading of large JSON documents"""
+
+import json
+from typing import Any, TextIO
+
+WHITESPACE = " \t\n\r"
+
+
+class JSONStreamReader:
+    """Reads a JSON document token by token from a text stream, while only
+    holding the currently decoded value in memory.
+
+    Structural characters (`{`, `}`, `[`, `]`, `:` and `,`) are consumed via
+    `expect`, whereas keys and values are decoded via `read_value`. The buffer
+    grows geometrically if a value exceeds the chunk size, so decoding a value
+    takes time linear in its size.
+    """
+
+    def __init__(self, file: TextIO, chunk_size: int = 1 << 20):
+        self.file = file
+        self.chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def peek(self) -> str:
+        """Returns the next non-whitespace character without consuming it.
+
+        Returns:
+            str: The next character or an empty string at the end of the stream.
+        """
+        self._skip_whitespace()
+        return self._buffer[self._pos : self._pos + 1]
+
+    def expect(self, char: str) -> None:
+        """Consumes the next non-whitespace character.
+
+        Args:
+            char (str): The expected character.
+
+        Raises:
+            ValueError: If the next character is not the expected one.
+        """
+        found = self.peek()
+        if found != char:
+            raise ValueError(
+                f"Expected '{char}' but found '{found}' while reading JSON stream."
+            )
+        self._pos += 1
+
+    def read_value(self) -> Any:
+        """Decodes the next JSON value of the stream.
+
+        Returns:
+            Any: The decoded value.
+
+        Raises:
+            json.JSONDecodeError: If the stream does not contain a valid value.
+        """
+        self._skip_whitespace()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+                self._read_more()
+                continue
+
+            # A number at the end of the buffer might be truncated
+            if end == len(self._buffer) and not self._eof:
+                self._read_more()
+                continue
+
+            self._pos = end
+            return value
+
+    def iter_object_keys(self):
+        """Iterates over the keys of the JSON object at the current position. The
+        value of each key has to be consumed before the next key is requested.
+
+        Yields:
+            str: The keys of the object.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+
+        while True:
+            key = self.read_value()
+            self.expect(":")
+            yield key
+
+            if self.peek() == ",":
+                self._pos += 1
+                continue
+
+            self.expect("}")
+            return
+
+    def iter_array(self):
+        """Iterates over the decoded items of the JSON array at the current position.
+
+        Yields:
+            Any: The decoded items of the array.
+        """
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+
+        while True:
+            yield self.read_value()
+
+            if self.peek() == ",":
+                self._pos += 1
+                continue
+
+            self.expect("]")
+            return
+
+    def _skip_whitespace(self) -> None:
+        while True:
+            while (
+                self._pos < len(self._buffer) and self._buffer[self._pos] in WHITESPACE
+            ):
+                self._pos += 1
+
+            if self._pos < len(self._buffer) or self._eof:
+                return
+
+            self._read_more()
+
+    def _read_more(self) -> None:
+        """Drops the consumed part of the buffer and reads at least one chunk,
+        doubling the read size for values larger than the chunk size."""
+
+        self._buffer = self._buffer[self._pos :]
+        self._pos = 0
+
+        chunk = self.file.read(max(self.chunk_size, len(self._buffer)))
+        if not chunk:
+            self._eof = True
+            return
+
+        self._buffer += chunk
@@ -0,0 +1,237 @@
+"""Columnar JSON serialization of CaliPytion Standards"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from os import PathLike
+from typing import Any
+
+import numpy as np
+
+from calipytion.model import CalibrationModel, Sample, Standard, UnitDefinition
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+COLUMNAR_FORMAT = "calipytion/columnar-standard"
+COLUMNAR_VERSION = 1
+
+
+@dataclass
+class ColumnarStandard:
+    """Standard with its samples stored as arrays instead of `Sample` objects.
+
+    All fields of the Standard except the samples are kept as plain data in
+    `metadata`. The samples share a single concentration unit.
+    """
+
+    metadata: dict[str, Any]
+    conc_unit: dict[str, Any] | None
+    concentrations: np.ndarray
+    signals: np.ndarray
+
+    @classmethod
+    def from_standard(cls, standard: Standard) -> ColumnarStandard:
+        """Converts a Standard into the columnar form.
+
+        Args:
+            standard (Standard): The Standard object.
+
+        Raises:
+            ValueError: If the samples have different concentration units.
+
+        Returns:
+            ColumnarStandard: The columnar Standard.
+        """
+
+        conc_unit = None
+        if standard.samples:
+            conc_unit = standard.samples[0].conc_unit
+            if any(sample.conc_unit != conc_unit for sample in standard.samples):
+                raise ValueError("All samples must have the same concentration unit")
+            conc_unit = conc_unit.model_dump(mode="json")
+
+        n_samples = len(standard.samples)
+        return cls(
+            metadata=standard.model_dump(mode="json", exclude={"samples"}),
+            conc_unit=conc_unit,
+            concentrations=np.fromiter(
+                (sample.concentration for sample in standard.samples), float, n_samples
+            ),
+            signals=np.fromiter(
+                (sample.signal for sample in standard.samples), float, n_samples
+            ),
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ColumnarStandard:
+        """Creates the columnar Standard from its JSON representation.
+
+        Args:
+            data (dict[str, Any]): The decoded columnar JSON document.
+
+        Raises:
+            ValueError: If the document is not a columnar Standard.
+
+        Returns:
+            ColumnarStandard: The columnar Standard.
+        """
+
+        if not is_columnar(data):
+            raise ValueError("Document is not a columnar Standard.")
+
+        samples = data["samples"]
+        # null entries are read back as nan
+        concentrations = np.asarray(samples["concentration"], dtype=float)
+        signals = np.asarray(samples["signal"], dtype=float)
+        if concentrations.shape != signals.shape:
+            raise ValueError("Number of concentrations and signals must be the same")
+
+        return cls(
+            metadata=data["standard"],
+            conc_unit=samples.get("conc_unit"),
+            concentrations=concentrations,
+            signals=signals,
+        )
+
+    @property
+    def result(self) -> CalibrationModel | None:
+        """The calibration model of the Standard, created without the samples."""
+
+        data = self.metadata.get("result")
+        return CalibrationModel(**data) if data else None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Returns the JSON representation of the columnar Standard.
+
+        Returns:
+            dict[str, Any]: The columnar JSON document.
+        """
+
+        return {
+            "format": COLUMNAR_FORMAT,
+            "version": COLUMNAR_VERSION,
+            "standard": self.metadata,
+            "samples": {
+                "conc_unit": self.conc_unit,
+                "concentration": self.concentrations,
+                "signal": self.signals,
+            },
+        }
+
+    def to_standard(self) -> Standard:
+        """Creates the Standard object with one `Sample` per data point, e.g. to
+        emit the per-sample JSON-LD form via `model_dump_json`.
+
+        Returns:
+            Standard: The Standard object.
+        """
+
+        samples = []
+        if len(self.concentrations):
+            conc_unit = UnitDefinition(**self.conc_unit)  # type: ignore
+            samples = [
+                Sample(concentration=concentration, conc_unit=conc_unit, signal=signal)
+                for concentration, signal in zip(
+                    self.concentrations.tolist(), self.signals.tolist()
+                )
+            ]
+
+        return Standard(**self.metadata, samples=samples)
+
+
+def is_columnar(data: Any) -> bool:
+    """Checks whether decoded JSON data is a columnar Standard.
+
+    Args:
+        data (Any): The decoded JSON data.
+
+    Returns:
+        bool: True for columnar Standards.
+    """
+
+    return isinstance(data, dict) and data.get("format") == COLUMNAR_FORMAT
+
+
+def write_columnar_standard(standard: Standard, path: str | PathLike) -> None:
+    """Writes a Standard as columnar JSON document. Uses `orjson` if installed.
+    With and without `orjson`, non-finite values are written as null, which is
+    read back as nan.
+
+    Args:
+        standard (Standard): The Standard object.
+        path (str | PathLike): Path of the JSON file.
+
+    Raises:
+        ValueError: If the samples have different concentration units.
+    """
+
+    data = ColumnarStandard.from_standard(standard).to_dict()
+
+    with open(path, "wb") as file:
+        file.write(_dumps(data))
+
+
+def read_standard(path: str | PathLike) -> Standard:
+    """Reads a Standard from a JSON file in the per-sample or the columnar form.
+
+    Args:
+        path (str | PathLike): Path of the JSON file.
+
+    Returns:
+        Standard: The Standard object.
+    """
+
+    with open(path, "rb") as file:
+        data = _loads(file.read())
+
+    if is_columnar(data):
+        return ColumnarStandard.from_dict(data).to_standard()
+
+    return Standard(**data)
+
+
+def read_columnar_standard(path: str | PathLike) -> ColumnarStandard:
+    """Reads a columnar Standard JSON file directly into arrays, without creating
+    `Sample` objects. Uses `orjson` if installed.
+
+    Args:
+        path (str | PathLike): Path of the JSON file.
+
+    Raises:
+        ValueError: If the file is not a columnar Standard.
+
+    Returns:
+        ColumnarStandard: The columnar Standard.
+    """
+
+    with open(path, "rb") as file:
+        return ColumnarStandard.from_dict(_loads(file.read()))
+
+
+def _dumps(data: dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY)
+
+    return json.dumps(data, default=_encode_array).encode("utf-8")
+
+
+def _loads(content: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(content)
+
+    return json.loads(content)
+
+
+def _encode_array(value: Any) -> Any:
+    if isinstance(value, np.ndarray):
+        # write non-finite values as null like orjson, keeping the JSON valid
+        if value.dtype.kind == "f" and not np.isfinite(value).all():
+            encoded = value.astype(object)
+            encoded[~np.isfinite(value)] = None
+            return encoded.tolist()
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
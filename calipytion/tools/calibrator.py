@@ -3,32 +3,46 @@ from __future__ import annotations
 import copy
 import logging
 import warnings
-from typing import Any, Optional
+from concurrent.futures import Executor
+from os import PathLike
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Iterable,
+    Iterator,
+    Literal,
+    Optional,
+)
 
 import numpy as np
-import pandas as pd
-import plotly.express as px
-import sympy as sp
-from plotly import graph_objects as go
-from plotly.subplots import make_subplots
-from pydantic import BaseModel, Field, model_validator
-from pyenzyme import DataTypes, EnzymeMLDocument
-from rich.console import Console
-from rich.table import Table
-
-from calipytion.ioutils.animlio import get_animl_document, map_standard_to_animl
+from numpy.typing import ArrayLike
+from pydantic import BaseModel, Field, PrivateAttr, model_validator
+
+from calipytion.ioutils.standardio import _dumps, _loads, read_standard
 from calipytion.model import (
     CalibrationModel,
     CalibrationRange,
     Standard,
     UnitDefinition,
 )
-from calipytion.tools.fitter import Fitter
+from calipytion.tools.evaluator import write_evaluator
+from calipytion.tools.fitted_model import ConversionChunk, FittedModel
 from calipytion.tools.utility import pubchem_request_molecule_name
 from calipytion.units import C
 
+# Plotting, tabular, symbolic, fitting, EnzymeML and AnIML dependencies are imported
+# by the methods which need them, so converting signals stays cheap to import.
+if TYPE_CHECKING:
+    from plotly import graph_objects as go
+    from pyenzyme import EnzymeMLDocument
+
 LOGGER = logging.getLogger(__name__)
 
+SNAPSHOT_FORMAT = "calipytion/calibrator-snapshot"
+SNAPSHOT_VERSION = 1
+
 # Ignore Pydantic serializer warnings for now due to required workaround
 # for AnIML <F>, <I>, <S>, and <Boolean> tags raising a warning about
 # type mismatches like `FloatType` vs `float`.
@@ -90,6 +104,9 @@ class Calibrator(BaseModel):
         description="Result oriented object, representing the data and the chosen model.",
     )
 
+    # Fitted models restored by `load_snapshot`, used until the models are fitted again
+    _fitted_models: dict[str, FittedModel] = PrivateAttr(default_factory=dict)
+
     @model_validator(mode="before")
     @classmethod
     def get_molecule_name(cls, data: Any) -> Any:
@@ -175,11 +192,43 @@ class Calibrator(BaseModel):
 
         raise ValueError(f"Model '{model_name}' not found")
 
+    def fitted_model(self, model: CalibrationModel | str) -> FittedModel:
+        """Creates an immutable snapshot of a fitted model for the conversion of signals.
+
+        In contrast to `calculate_concentrations`, the `convert` method of the snapshot
+        has no side effects on the calibrator and is not affected by later fits, so a
+        single snapshot can be shared between threads.
+
+        Args:
+            model (CalibrationModel | str): The model object or name which should be used.
+
+        Raises:
+            ValueError: If the model has not been fitted yet.
+
+        Returns:
+            FittedModel: The snapshot of the fitted model.
+        """
+
+        if not isinstance(model, CalibrationModel):
+            model = self.get_model(model)
+
+        if model.calibration_range is None:
+            raise ValueError("Model has not been fitted yet. Run 'fit_models' first.")
+
+        restored = self._fitted_models.get(model.name)
+        if restored is not None and restored.matches(model):
+            return restored
+
+        return FittedModel.from_calibration_model(model)
+
     def calculate_concentrations(
         self,
         model: CalibrationModel | str,
         signals: list[float],
         extrapolate: bool = False,
+        deduplicate: bool = False,
+        out_of_range: Literal["nan", "clip"] = "nan",
+        warm_start: bool = False,
     ) -> list[float]:
         """Calculates the concentration from a given signal using a calibration model.
 
@@ -190,115 +239,216 @@ class Calibrator(BaseModel):
         within the calibration range of the model. If extrapolation is enabled, the concentration
         can be calculated outside the calibration range. Be aware that the results might be
         unreliable.
+        For large numbers of signals, use `calculate_concentrations_array`, which avoids
+        the conversion from and to Python lists.
 
         Args:
             model (CalibrationModel | str): The model object or name which should be used.
             signals (list[float]): The signals for which the concentration should be calculated.
             extrapolate (bool, optional): Whether to extrapolate the concentration outside the
                 calibration range. Defaults to False.
+            deduplicate (bool, optional): Whether to solve each distinct signal value only
+                once, which speeds up the conversion of quantized detector signals with many
+                repeated values. Defaults to False.
+            out_of_range (Literal["nan", "clip"], optional): Whether concentrations of
+                signals outside the calibration range are set to nan or clipped to the
+                nearest bound of the calibration range. Defaults to "nan".
+            warm_start (bool, optional): Whether to treat the signals as an ordered trace,
+                such as a kinetic time course, and start the root search of each signal from
+                the concentration of the previous one. Defaults to False.
 
         Returns:
             list[float]: The calculated concentrations.
         """
-        if not isinstance(model, CalibrationModel):
-            model = self.get_model(model)
 
-        np_signals = np.array(signals)
+        return self.calculate_concentrations_array(
+            model,
+            signals,
+            extrapolate,
+            deduplicate=deduplicate,
+            out_of_range=out_of_range,
+            warm_start=warm_start,
+        ).tolist()
 
-        assert model.calibration_range, "Calibration range not set."
+    def calculate_concentrations_array(
+        self,
+        model: CalibrationModel | str,
+        signals: ArrayLike,
+        extrapolate: bool = False,
+        out: np.ndarray | None = None,
+        deduplicate: bool = False,
+        out_of_range: Literal["nan", "clip"] = "nan",
+        return_mask: bool = False,
+        warm_start: bool = False,
+    ) -> np.ndarray | tuple[np.ndarray, np.ndarray]:
+        """Calculates the concentration from a given signal array using a calibration model.
+
+        Works like `calculate_concentrations`, but accepts any array-like or buffer of
+        signals, including `float32` arrays and non-contiguous views, and returns a
+        NumPy array of the same shape without creating intermediate Python lists.
 
-        lower_bond = model.calibration_range.conc_lower
-        upper_bond = model.calibration_range.conc_upper
+        Args:
+            model (CalibrationModel | str): The model object or name which should be used.
+            signals (ArrayLike): The signals for which the concentration should be calculated.
+            extrapolate (bool, optional): Whether to extrapolate the concentration outside the
+                calibration range. Defaults to False.
+            out (np.ndarray | None, optional): Floating point array of the same shape as
+                the signals into which the concentrations are written. Defaults to None.
+            deduplicate (bool, optional): Whether to solve each distinct signal value only
+                once, which speeds up the conversion of quantized detector signals with many
+                repeated values. Defaults to False.
+            out_of_range (Literal["nan", "clip"], optional): Whether concentrations of
+                signals outside the calibration range are set to nan or clipped to the
+                nearest bound of the calibration range. Defaults to "nan".
+            return_mask (bool, optional): Whether to additionally return a boolean mask,
+                which is True for signals outside the calibration range. Defaults to False.
+            warm_start (bool, optional): Whether to treat the signals as an ordered trace,
+                such as a kinetic time course, and start the root search of each signal from
+                the concentration of the previous one. Defaults to False.
 
-        cal_model = Fitter.from_calibration_model(model)
+        Returns:
+            np.ndarray | tuple[np.ndarray, np.ndarray]: The calculated concentrations, and
+                the out of range mask if requested.
+        """
+        if not isinstance(model, CalibrationModel):
+            model = self.get_model(model)
 
-        concs, bracket = cal_model.calculate_roots(
-            y=np_signals,
-            lower_bond=lower_bond,
-            upper_bond=upper_bond,
-            extrapolate=extrapolate,
+        concs = self._calculate_concentrations(
+            model,
+            signals,
+            extrapolate,
+            out=out,
+            deduplicate=deduplicate,
+            out_of_range=out_of_range,
+            return_mask=return_mask,
+            warm_start=warm_start,
         )
 
-        # give warning if any concentration is nan
-        if np.isnan(concs).any() and not extrapolate:
-            LOGGER.warning(
-                "⚠️ Some concentrations could not be calculated and were replaced with nan "
-                f"values, since the provided signal is outside the calibration range {bracket}. "
-                "To calculate the concentration outside the calibration range, set "
-                "'extrapolate=True'."
-            )
-
         # Update or create standard object based on used model
         if self.standard:
             self._update_model_of_standard(model)
 
-        return concs.tolist()
+        return concs
+
+    def iter_concentrations(
+        self,
+        model: CalibrationModel | str,
+        chunks: Iterable[ArrayLike],
+        extrapolate: bool = False,
+    ) -> Iterator[ConversionChunk]:
+        """Calculates concentrations for a possibly unbounded stream of signal chunks.
+
+        The model is compiled once and each chunk is converted as soon as it is
+        received, so memory usage stays constant. The standard of the calibrator is
+        not modified.
+
+        Args:
+            model (CalibrationModel | str): The model object or name which should be used.
+            chunks (Iterable[ArrayLike]): The chunks of signals.
+            extrapolate (bool, optional): Whether to extrapolate the concentration outside the
+                calibration range. Defaults to False.
+
+        Yields:
+            ConversionChunk: The concentrations of each chunk with the number of
+                signals outside the calibration range and running totals.
+        """
+
+        yield from self.fitted_model(model).iter_convert(chunks, extrapolate)
+
+    def aiter_concentrations(
+        self,
+        model: CalibrationModel | str,
+        chunks: AsyncIterable[ArrayLike],
+        extrapolate: bool = False,
+    ) -> AsyncIterator[ConversionChunk]:
+        """Calculates concentrations for an asynchronous stream of signal chunks.
+
+        Like `iter_concentrations`, but consumes an async iterator and converts each
+        chunk in a worker thread to keep the event loop responsive.
+
+        Args:
+            model (CalibrationModel | str): The model object or name which should be used.
+            chunks (AsyncIterable[ArrayLike]): The chunks of signals.
+            extrapolate (bool, optional): Whether to extrapolate the concentration outside the
+                calibration range. Defaults to False.
+
+        Returns:
+            AsyncIterator[ConversionChunk]: The concentrations of each chunk with the
+                number of signals outside the calibration range and running totals.
+        """
+
+        return self.fitted_model(model).aiter_convert(chunks, extrapolate)
 
     def apply_to_enzymeml(
         self,
         enzmldoc: EnzymeMLDocument,
         extrapolate: bool = False,
         silent: bool = False,
+        executor: Executor | None = None,
+        chunk_size: int | None = None,
+        warm_start: bool = False,
     ):
         """Applies the calibrator to an EnzymeML document if the species_id and molecule_id
         match between the EnzymeML Document and the calibrator.
 
+        To apply several calibrators to the same document in a single pass, use
+        `calipytion.tools.enzymeml.apply_calibrators`.
+
         Args:
             enzmldoc (EnzymeMLDocument): The EnzymeML document to apply the calibrator to.
             extrapolate (bool, optional): Whether to extrapolate the concentration outside the
                 calibration range. Defaults to False.
             silent (bool, optional): Silences the print output. Defaults to False.
+            executor (Executor | None, optional): Executor, e.g. a `ProcessPoolExecutor`,
+                used to convert chunks of the measured signals in parallel. Defaults to None.
+            chunk_size (int | None, optional): Number of signals per parallel chunk.
+                Defaults to an even split across the available CPU cores.
+            warm_start (bool, optional): Whether to start the root search of each signal of
+                a measured time course from the concentration of the previous signal.
+                Speeds up the conversion of smooth time courses. Defaults to False.
 
         Raises:
             AssertionError: If no standard with a fitted calibration model is found.
             AssertionError: If the data is already in concentration values.
-            AssertionError: If the units of the measured data and the calibration model do not match.
+            ValueError: If the unit of the measured data cannot be converted into the unit
+                of the calibration model.
         """
 
-        assert self.standard, "No standard object found."
-        assert self.standard.result, "No model found in the standard object."
-
-        converted_count = 0
-        for measurement in enzmldoc.measurements:
-            for measured_species in measurement.species_data:
-                if measured_species.species_id == self.molecule_id:
-                    assert (
-                        measured_species.data_type != DataTypes.CONCENTRATION
-                    ), """
-                        The data seems to be already in concentration values.
-                    """
-                    # assert units are the same
-                    assert (
-                        measured_species.data_unit.name == self.conc_unit.name
-                    ), f"""
-                    The unit of the measured data ({measured_species.data_unit.name}) is not 
-                    the same as the unit of the calibration model ({self.conc_unit.name}).
-                    """
-
-                    signals = measured_species.data
-                    measured_species.data = self.calculate_concentrations(
-                        self.standard.result, signals, extrapolate
-                    )
-                    measured_species.data_type = DataTypes.CONCENTRATION
-
-                    converted_count += 1
+        from calipytion.tools.enzymeml import apply_calibrators
 
-        symbol = "✅" if converted_count > 0 else "❌"
-        if not silent:
-            print(f"{symbol} Applied calibration to {converted_count} measurements")
+        apply_calibrators(
+            self,
+            enzmldoc,
+            extrapolate=extrapolate,
+            silent=silent,
+            executor=executor,
+            chunk_size=chunk_size,
+            warm_start=warm_start,
+        )
 
     def export_to_animl(
-        self, wavelength_nm: float = 420, silent: bool = False
+        self, wavelength_nm: float = 420, silent: bool = False, compact: bool = False
     ) -> "AnIML":
         """Exports measurements and models to an AnIML document.
 
+        The AnIML data model is built on the first export from a local copy of the
+        specification, see `calipytion.ioutils.animlio.get_animl_lib`.
+
         Args:
             wavelength_nm (float, optional): The wavelength of the measurement in nm.
                 Defaults to 420 nm.
+            silent (bool, optional): Silences the print output. Defaults to False.
+            compact (bool, optional): Whether to store all concentrations and
+                intensities as single encoded series instead of one ExperimentStep per
+                sample, which is considerably faster and smaller for large standards.
+                Defaults to False.
 
         Raises:
             AssertionError: If no standard object is found.
             AssertionError: If no model is found in the standard object.
+            ValueError: If the samples have different concentration units in compact mode.
+            ConnectionError: If the AnIML specification is not available locally and
+                cannot be retrieved from GitHub.
 
         Returns:
             animl_document: The AnIML document.
@@ -307,16 +457,161 @@ class Calibrator(BaseModel):
         assert self.standard, "No standard object found."
         assert self.standard.result, "No model found in the standard object."
 
+        from calipytion.ioutils.animlio import (
+            get_animl_document,
+            map_standard_to_animl,
+            map_standard_to_animl_compact,
+        )
+
         self.standard.wavelength = wavelength_nm
 
         animl_document = get_animl_document()
-        animl_document = map_standard_to_animl(self.standard, animl_document)
+        if compact:
+            animl_document = map_standard_to_animl_compact(self.standard, animl_document)
+        else:
+            animl_document = map_standard_to_animl(self.standard, animl_document)
 
         if not silent:
             print(f"✅ Applied data to AnIML document")
 
         return animl_document
 
+    def export_evaluator(
+        self, model: CalibrationModel | str, path: str | PathLike
+    ) -> None:
+        """Writes a standalone evaluator module of a fitted model, which converts
+        signals into concentrations and depends only on NumPy.
+
+        Args:
+            model (CalibrationModel | str): The model object or name which should be used.
+            path (str | PathLike): Path of the Python module.
+
+        Raises:
+            ValueError: If the model has not been fitted yet.
+        """
+
+        if not isinstance(model, CalibrationModel):
+            model = self.get_model(model)
+
+        if model.calibration_range is None:
+            raise ValueError("Model has not been fitted yet. Run 'fit_models' first.")
+
+        write_evaluator(model, path)
+
+    def save_snapshot(self, path: str | PathLike) -> None:
+        """Saves the calibrator together with the compiled state of its fitted models.
+
+        The snapshot contains the data, the models and the NumPy code generated for
+        the signal law and its derivative, so `load_snapshot` can restore a calibrator
+        which converts signals without invoking sympy or lmfit.
+
+        Args:
+            path (str | PathLike): Path of the JSON snapshot file.
+        """
+
+        data = {
+            "format": SNAPSHOT_FORMAT,
+            "version": SNAPSHOT_VERSION,
+            "calibrator": self.model_dump(mode="json"),
+            "fitted_models": [
+                self.fitted_model(model).to_dict()
+                for model in self.models
+                if model.was_fitted and model.calibration_range is not None
+            ],
+        }
+
+        with open(path, "wb") as file:
+            file.write(_dumps(data))
+
+    @classmethod
+    def load_snapshot(cls, path: str | PathLike) -> Calibrator:
+        """Restores a calibrator saved by `save_snapshot`.
+
+        The compiled fitted models are restored directly from the stored code, so the
+        restored calibrator is ready to convert signals without recompilation. They are
+        kept by the restored calibrator only and used as long as its models are not
+        fitted again.
+
+        Args:
+            path (str | PathLike): Path of the JSON snapshot file.
+
+        Raises:
+            ValueError: If the file is not a calibrator snapshot.
+            ValueError: If the code of a fitted model is not an arithmetic expression.
+
+        Returns:
+            Calibrator: The Calibrator object.
+        """
+
+        with open(path, "rb") as file:
+            data = _loads(file.read())
+
+        if not isinstance(data, dict) or data.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"'{path}' is not a calibrator snapshot.")
+        if data["version"] > SNAPSHOT_VERSION:
+            raise ValueError(
+                f"Snapshot version {data['version']} is not supported by this version "
+                "of CaliPytion."
+            )
+
+        calibrator = cls.model_validate(data["calibrator"])
+        for fitted_model in data["fitted_models"]:
+            restored = FittedModel.from_dict(fitted_model)
+            calibrator._fitted_models[restored.name] = restored
+
+        return calibrator
+
+    def _calculate_concentrations(
+        self,
+        model: CalibrationModel,
+        signals: ArrayLike,
+        extrapolate: bool,
+        executor: Executor | None = None,
+        chunk_size: int | None = None,
+        out: np.ndarray | None = None,
+        deduplicate: bool = False,
+        out_of_range: Literal["nan", "clip"] = "nan",
+        return_mask: bool = False,
+        warm_start: bool = False,
+    ) -> np.ndarray | tuple[np.ndarray, np.ndarray]:
+        """Calculates the concentrations of a signal array without converting the
+        result to a list or updating the standard."""
+
+        fitted_model = self.fitted_model(model)
+
+        concs, mask = fitted_model.convert(
+            signals,
+            extrapolate=extrapolate,
+            executor=executor,
+            chunk_size=chunk_size,
+            out=out,
+            deduplicate=deduplicate,
+            out_of_range=out_of_range,
+            return_mask=True,
+            warm_start=warm_start,
+        )
+
+        # give warning if any concentration is out of range
+        if mask.any() and not extrapolate:
+            bracket = fitted_model.bracket(signals, extrapolate)
+            if out_of_range == "clip":
+                LOGGER.warning(
+                    "⚠️ Some concentrations were clipped to the calibration range "
+                    f"{bracket}, since the provided signal is outside of it."
+                )
+            else:
+                LOGGER.warning(
+                    "⚠️ Some concentrations could not be calculated and were replaced with nan "
+                    f"values, since the provided signal is outside the calibration range {bracket}. "
+                    "To calculate the concentration outside the calibration range, set "
+                    "'extrapolate=True'."
+                )
+
+        if return_mask:
+            return concs, mask
+
+        return concs
+
     def _update_model_of_standard(self, model: CalibrationModel) -> None:
         """Updates the model of the standard object with the given model."""
 
@@ -359,6 +654,8 @@ class Calibrator(BaseModel):
             Calibrator: The Calibrator object.
         """
 
+        import pandas as pd
+
         df = pd.read_excel(path, sheet_name=sheet_name, header=None, skiprows=skip_rows)
 
         signals = df.iloc[:, 1:].values  # type: ignore
@@ -417,6 +714,9 @@ class Calibrator(BaseModel):
     ) -> Calibrator:
         """Reads the data from a JSON Standard file and initializes the Calibrator object.
 
+        Both the per-sample JSON-LD form and the columnar form written by
+        `calipytion.ioutils.standardio.write_columnar_standard` are detected.
+
         Args:
             path (str): Path to the JSON file.
             cutoff (Optional[float], optional): Cutoff value for the signals.
@@ -425,10 +725,52 @@ class Calibrator(BaseModel):
         Returns:
             Calibrator: The Calibrator object.
         """
-        import json
 
-        with open(path, "r") as file:
-            standard = Standard(**json.load(file))
+        standard = read_standard(path)
+
+        return cls.from_standard(standard, cutoff)
+
+    @classmethod
+    def from_animl(
+        cls,
+        path: str,
+        pubchem_cid: int,
+        molecule_name: str | None = None,
+        cutoff: Optional[float] = None,
+        molecule_id: str | None = None,
+    ) -> Calibrator:
+        """Reads the data from an AnIML document created by `export_to_animl` and
+        initializes the Calibrator object.
+
+        The document is streamed without building the AnIML object tree. A calibration
+        model stored in the document is restored as fitted model of the Calibrator.
+
+        Args:
+            path (str): Path to the AnIML file.
+            pubchem_cid (int): PubChem Compound Identifier of the molecule.
+            molecule_name (str | None, optional): Name of the molecule. Defaults to None,
+                retrieving the name from PubChem.
+            cutoff (Optional[float], optional): Cutoff value for the signals.
+                Higher signals will be ignored. Defaults to None.
+            molecule_id (str | None, optional): Molecule id of the standard to read
+                from a document with the standards of several molecules, e.g. written
+                by `export_calibrators_to_animl`. Defaults to None.
+
+        Raises:
+            ValueError: If the document contains no standard or uses unknown units.
+            ValueError: If not exactly one standard of the document matches the
+                molecule id.
+
+        Returns:
+            Calibrator: The Calibrator object.
+        """
+
+        if molecule_name is None:
+            molecule_name = pubchem_request_molecule_name(pubchem_cid)
+
+        from calipytion.ioutils.animlreader import read_animl_standard
+
+        standard = read_animl_standard(path, pubchem_cid, molecule_name, molecule_id)
 
         return cls.from_standard(standard, cutoff)
 
@@ -495,6 +837,11 @@ class Calibrator(BaseModel):
                 the fitter. Defaults to False.
         """
 
+        from calipytion.tools.fitter import Fitter
+
+        # models restored from a snapshot are superseded by the new fit
+        self._fitted_models.clear()
+
         for model in self.models:
             # Set the calibration range of the model
             model.calibration_range = CalibrationRange(
@@ -529,6 +876,9 @@ class Calibrator(BaseModel):
         Prints a table with the results of the fitted models.
         """
 
+        from rich.console import Console
+        from rich.table import Table
+
         console = Console()
 
         table = Table(title="Model Overview")
@@ -568,6 +918,12 @@ class Calibrator(BaseModel):
         """
         Visualizes the calibration curve and the residuals of the models.
         """
+        import plotly.express as px
+        from plotly import graph_objects as go
+        from plotly.subplots import make_subplots
+
+        from calipytion.tools.fitter import Fitter
+
         fig = make_subplots(
             rows=1,
             cols=2,
@@ -760,6 +1116,8 @@ class Calibrator(BaseModel):
         return fig.show(config=config)
 
     def _traces_from_standard(self, fig: go.Figure):
+        from plotly import graph_objects as go
+
         for sample in self.standard.samples:
             if not hasattr(sample, "id"):
                 sample_id = f"Sample {self.standard.samples.index(sample) + 1}"
@@ -844,6 +1202,8 @@ class Calibrator(BaseModel):
     def _get_free_symbols(self, equation: str) -> list[str]:
         """Gets the free symbols from a sympy equation and converts them to strings."""
 
+        import sympy as sp
+
         sp_eq = sp.sympify(equation)
         symbols = list(sp_eq.free_symbols)
 
@@ -1,56 +1,354 @@
-from pyenzyme import SmallMolecule
-
-# from calipytion.tools.calibrator import Calibrator
-
-
-# def apply_to_enzymeml(
-#     calibrators: list[Calibrator] | Calibrator,
-#     enzmldoc: EnzymeMLDocument,
-#     extrapolate: bool = False,
-# ):
-#     """Converts the measured data in concentration values for a given standard.
-
-#     Args:
-#         calibrators: The calibrators to use for the conversion.
-#         enzmldoc: The EnzymeMLDocument to apply the standard to.
-#         extrapolate: If True, the calibration models will extrapolate if the signals
-#             are outside the calibration range.
-#     """
-
-#     if not isinstance(calibrators, list):
-#         calibrators = [calibrators]
-
-#     for calibrator in calibrators:
-#         assert calibrator.standard.result is not None, f"""
-#         The calibrator for {calibrator.standard.molecule_id} does not have a result.
-#         Call the `create_standard` method on the calibrator before applying it to the EnzymeML document.
-#         """
-
-#         try:
-#             small_molecule_id = get_small_molecule_id_by_ld_id(
-#                 enzmldoc.small_molecules, calibrator.ld_id
-#             )
-#         except ValueError:
-#             try:
-#                 small_molecule_id = get_small_molecule_id_by_id(
-#                     enzmldoc.small_molecules, calibrator.molecule_id
-#                 )
-#             except ValueError:
-#                 raise ValueError(f"""
-#                 Could not find a matching small molecule in the EnzymeML document for {calibrator.molecule_id}
-#                 Make sure that the molecule_id in the standard is consistent with the ld_id or id field of
-#                 the small_molecule in the EnzymeML document.
-#                 """)
-
-#         for measurement in enzmldoc.measurements:
-#             for measured_species in measurement.species:
-#                 if measured_species.species_id == small_molecule_id:
-#                     convert_measurement(
-#                         calibrator,
-#                         calibrator.standard.result,
-#                         measured_species,
-#                         extrapolate,
-#                     )
+from __future__ import annotations
+
+import json
+import os
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING
+
+import numpy as np
+from pyenzyme import (
+    DataTypes,
+    EnzymeMLDocument,
+    MeasurementData,
+    SmallMolecule,
+    UnitDefinition,
+)
+
+from calipytion.ioutils.jsonstream import JSONStreamReader
+from calipytion.tools.fitted_model import FittedModel
+from calipytion.units.conversion import conversion_factor
+
+if TYPE_CHECKING:
+    from calipytion.tools.calibrator import Calibrator
+
+
+def apply_calibrators(
+    calibrators: list[Calibrator] | Calibrator,
+    enzmldoc: EnzymeMLDocument,
+    extrapolate: bool = False,
+    silent: bool = False,
+    executor: Executor | None = None,
+    chunk_size: int | None = None,
+    warm_start: bool = False,
+) -> int:
+    """Converts the measured data of an EnzymeML document into concentration values
+    for any number of calibrators in a single pass over the document.
+
+    The species of each calibrator is resolved once through an index of the small
+    molecules of the document, either by the `ld_id` of the calibrator's standard or
+    by its `molecule_id`. All measured series of a species are then concatenated and
+    converted with a single root-finding call per calibrator. Concentrations are
+    converted into the unit of the measured data if it differs from the concentration
+    unit of the calibrator. If an executor is given,
+    the concatenated signals are split into contiguous chunks which are converted in
+    parallel and scattered back into the document in their original order.
+
+    Args:
+        calibrators (list[Calibrator] | Calibrator): The calibrators to apply.
+        enzmldoc (EnzymeMLDocument): The EnzymeML document to apply the calibrators to.
+        extrapolate (bool, optional): Whether to extrapolate the concentration outside the
+            calibration range. Defaults to False.
+        silent (bool, optional): Silences the print output. Defaults to False.
+        executor (Executor | None, optional): Executor, e.g. a `ProcessPoolExecutor`,
+            used to convert chunks of the measured signals in parallel. Defaults to None.
+        chunk_size (int | None, optional): Number of signals per parallel chunk.
+            Defaults to an even split across the available CPU cores.
+        warm_start (bool, optional): Whether to start the root search of each signal of
+            a measured time course from the concentration of the previous signal.
+            Speeds up the conversion of smooth time courses. Defaults to False.
+
+    Raises:
+        AssertionError: If a calibrator has no standard with a fitted calibration model.
+        AssertionError: If the data is already in concentration values.
+        ValueError: If the unit of the measured data cannot be converted into the unit
+            of the calibration model.
+        ValueError: If multiple calibrators resolve to the same species.
+
+    Returns:
+        int: The number of converted measurement series.
+    """
+
+    if not isinstance(calibrators, list):
+        calibrators = [calibrators]
+
+    ld_id_index, id_index = index_small_molecules(enzmldoc.small_molecules)
+
+    calibrator_by_species: dict[str, Calibrator] = {}
+    for calibrator in calibrators:
+        assert calibrator.standard, f"No standard object found for {calibrator.molecule_id}."
+        assert (
+            calibrator.standard.result
+        ), f"No model found in the standard object of {calibrator.molecule_id}."
+
+        species_id = ld_id_index.get(
+            calibrator.standard.ld_id,
+            id_index.get(calibrator.molecule_id, calibrator.molecule_id),
+        )
+        if species_id in calibrator_by_species:
+            raise ValueError(
+                f"Multiple calibrators were found for species '{species_id}'."
+            )
+        calibrator_by_species[species_id] = calibrator
+
+    # Collect the matching series of all calibrators in one traversal
+    series_by_species: dict[str, list[MeasurementData]] = {
+        species_id: [] for species_id in calibrator_by_species
+    }
+    factors_by_species: dict[str, list[float]] = {
+        species_id: [] for species_id in calibrator_by_species
+    }
+    for measurement in enzmldoc.measurements:
+        for measured_species in measurement.species_data:
+            series = series_by_species.get(measured_species.species_id)
+            if series is None:
+                continue
+
+            calibrator = calibrator_by_species[measured_species.species_id]
+            assert (
+                measured_species.data_type != DataTypes.CONCENTRATION
+            ), """
+                The data seems to be already in concentration values.
+            """
+
+            series.append(measured_species)
+            factors_by_species[measured_species.species_id].append(
+                _unit_factor(calibrator, measured_species.data_unit)
+            )
+
+    converted_count = 0
+    for species_id, series in series_by_species.items():
+        if not series:
+            continue
+
+        calibrator = calibrator_by_species[species_id]
+        lengths = [len(measured_species.data) for measured_species in series]
+        signals = np.concatenate(
+            [np.asarray(measured_species.data, dtype=float) for measured_species in series]
+        )
+
+        concs = calibrator._calculate_concentrations(
+            calibrator.standard.result,  # type: ignore
+            signals,
+            extrapolate,
+            executor=executor,
+            chunk_size=chunk_size,
+            warm_start=warm_start,
+        )
+
+        factors = factors_by_species[species_id]
+        if any(factor != 1.0 for factor in factors):
+            concs = concs * np.repeat(factors, lengths)
+
+        for measured_species, series_concs in zip(
+            series, np.split(concs, np.cumsum(lengths)[:-1])
+        ):
+            measured_species.data = series_concs.tolist()
+            measured_species.data_type = DataTypes.CONCENTRATION
+
+        converted_count += len(series)
+
+    symbol = "✅" if converted_count > 0 else "❌"
+    if not silent:
+        print(f"{symbol} Applied calibration to {converted_count} measurements")
+
+    return converted_count
+
+
+def stream_apply_calibrators(
+    calibrators: list[Calibrator] | Calibrator,
+    source: str,
+    target: str,
+    extrapolate: bool = False,
+    silent: bool = False,
+    chunk_size: int = 1 << 20,
+    fitted_models: dict[str, FittedModel] | None = None,
+    warm_start: bool = False,
+) -> int:
+    """Converts the measured data of an EnzymeML JSON file into concentration values
+    without loading the whole document.
+
+    The document is read incrementally and only one measurement is held in memory at
+    a time. Each measurement is converted and immediately written to a temporary file
+    next to the target, all other fields of the document are copied unchanged. The
+    temporary file replaces the target once the document is complete, so a failed
+    conversion leaves no partial target behind. Species are matched by the
+    `molecule_id` of the calibrators and, if the small molecules precede the
+    measurements in the file, additionally by the `ld_id` of their standards.
+    Concentrations are converted into the unit of the measured data if it differs
+    from the concentration unit of the calibrator.
+
+    Args:
+        calibrators (list[Calibrator] | Calibrator): The calibrators to apply.
+        source (str): Path to the EnzymeML JSON file to convert.
+        target (str): Path of the converted EnzymeML JSON file, which must differ from
+            the source.
+        extrapolate (bool, optional): Whether to extrapolate the concentration outside the
+            calibration range. Defaults to False.
+        silent (bool, optional): Silences the print output. Defaults to False.
+        chunk_size (int, optional): Number of characters read from the source file at
+            once. Defaults to 1 MiB.
+        fitted_models (dict[str, FittedModel] | None, optional): Fitted models of the
+            calibrators as returned by `compile_calibrators`, to reuse them across
+            several files. Defaults to None, compiling the calibrators for this file.
+        warm_start (bool, optional): Whether to start the root search of each signal of
+            a measured time course from the concentration of the previous signal.
+            Speeds up the conversion of smooth time courses. Defaults to False.
+
+    Raises:
+        ValueError: If source and target are the same file.
+        AssertionError: If a calibrator has no standard with a fitted calibration model.
+        AssertionError: If the data is already in concentration values.
+        ValueError: If the unit of the measured data cannot be converted into the unit
+            of the calibration model.
+        ValueError: If multiple calibrators resolve to the same species.
+
+    Returns:
+        int: The number of converted measurement series.
+    """
+
+    if os.path.exists(target) and os.path.samefile(source, target):
+        raise ValueError(
+            f"Source and target '{source}' are the same file. Write the converted "
+            "document to another path."
+        )
+
+    if not isinstance(calibrators, list):
+        calibrators = [calibrators]
+
+    if fitted_models is None:
+        fitted_models = compile_calibrators(calibrators)
+
+    tmp_target = f"{target}.{os.getpid()}.tmp"
+    try:
+        converted_count = _stream_convert_document(
+            source,
+            tmp_target,
+            calibrators,
+            fitted_models,
+            extrapolate,
+            chunk_size,
+            warm_start,
+        )
+        os.replace(tmp_target, target)
+    except BaseException:
+        if os.path.exists(tmp_target):
+            os.remove(tmp_target)
+        raise
+
+    symbol = "✅" if converted_count > 0 else "❌"
+    if not silent:
+        print(f"{symbol} Applied calibration to {converted_count} measurements")
+
+    return converted_count
+
+
+def _stream_convert_document(
+    source: str,
+    target: str,
+    calibrators: list[Calibrator],
+    fitted_models: dict[str, FittedModel],
+    extrapolate: bool,
+    chunk_size: int,
+    warm_start: bool,
+) -> int:
+    """Streams the converted document into the target file, see
+    `stream_apply_calibrators`."""
+
+    # species are matched by the molecule ids until the small molecules are read
+    calibrator_by_species, model_by_species = _index_streamed_species(
+        calibrators, fitted_models, []
+    )
+
+    converted_count = 0
+    with open(source, "r") as source_file, open(target, "w") as target_file:
+        reader = JSONStreamReader(source_file, chunk_size=chunk_size)
+
+        target_file.write("{")
+        for idx, key in enumerate(reader.iter_object_keys()):
+            if idx > 0:
+                target_file.write(",")
+            target_file.write(f"{json.dumps(key)}:")
+
+            if key != "measurements":
+                value = reader.read_value()
+                json.dump(value, target_file)
+
+                if key == "small_molecules":
+                    calibrator_by_species, model_by_species = _index_streamed_species(
+                        calibrators, fitted_models, value
+                    )
+                continue
+
+            target_file.write("[")
+            for measurement_idx, measurement in enumerate(reader.iter_array()):
+                if measurement_idx > 0:
+                    target_file.write(",")
+
+                converted_count += _convert_streamed_measurement(
+                    measurement,
+                    calibrator_by_species,
+                    model_by_species,
+                    extrapolate,
+                    warm_start,
+                )
+                json.dump(measurement, target_file)
+            target_file.write("]")
+
+        target_file.write("}")
+
+    return converted_count
+
+
+def compile_calibrators(calibrators: list[Calibrator]) -> dict[str, FittedModel]:
+    """Creates snapshots of the fitted models of the calibrators' standards for the
+    conversion of signals.
+
+    Args:
+        calibrators (list[Calibrator]): The calibrators to compile.
+
+    Raises:
+        AssertionError: If a calibrator has no standard with a calibration model.
+        ValueError: If the calibration model of a standard has not been fitted.
+
+    Returns:
+        dict[str, FittedModel]: The fitted models of the standards by `molecule_id`.
+    """
+
+    fitted_models = {}
+    for calibrator in calibrators:
+        assert calibrator.standard, f"No standard object found for {calibrator.molecule_id}."
+        assert (
+            calibrator.standard.result
+        ), f"No model found in the standard object of {calibrator.molecule_id}."
+
+        fitted_models[calibrator.molecule_id] = calibrator.fitted_model(
+            calibrator.standard.result
+        )
+
+    return fitted_models
+
+
+def index_small_molecules(
+    small_molecules: list[SmallMolecule],
+) -> tuple[dict[str, str], dict[str, str]]:
+    """Builds lookup tables mapping the `ld_id` and the `id` of the small molecules
+    in an EnzymeML document to their `id`.
+
+    Args:
+        small_molecules (list[SmallMolecule]): The list of small molecules in the EnzymeML document.
+
+    Returns:
+        tuple[dict[str, str], dict[str, str]]: The `ld_id` and the `id` index.
+    """
+
+    ld_id_index = {}
+    id_index = {}
+    for molecule in small_molecules:
+        if molecule.ld_id is not None:
+            ld_id_index.setdefault(molecule.ld_id, molecule.id)
+        id_index.setdefault(molecule.id, molecule.id)
+
+    return ld_id_index, id_index
 
 
 def get_small_molecule_id_by_ld_id(
@@ -107,28 +405,94 @@ def get_small_molecule_id_by_id(
     )
 
 
-# def convert_measurement(
-#     calibrator: Calibrator,
-#     model: CalibrationModel,
-#     measured_species: MeasurementData,
-#     extrapolate: bool,
-# ):
-#     """Converts the measured data in concentration values for a given standard.
-
-#     Args:
-#         calibrator: The calibrator to use for the conversion.
-#         model: The calibration model to use for the conversion.
-#         measured_species: The species to convert.
-#     """
-
-#     # assert units are the same
-#     assert measured_species.data_unit.__str__() == calibrator.conc_unit.__str__(), f"""
-#     The unit of the measured data ({measured_species.data_unit.name}) is not
-#     the same as the unit of the calibration model ({calibrator.conc_unit.name}).
-#     """
-
-#     signals = measured_species.data
-#     measured_species.data = calibrator.calculate_concentrations(
-#         model, signals, extrapolate
-#     )
-#     measured_species.data_type = DataTypes.CONCENTRATION
+def _index_streamed_species(
+    calibrators: list[Calibrator],
+    fitted_models: dict[str, FittedModel],
+    small_molecules: list[dict],
+) -> tuple[dict[str, Calibrator], dict[str, FittedModel]]:
+    """Maps the species ids of the raw small molecules of a streamed document to the
+    calibrators and their fitted models."""
+
+    ld_id_index = {}
+    id_index = {}
+    for molecule in small_molecules:
+        if molecule.get("ld_id") is not None:
+            ld_id_index.setdefault(molecule["ld_id"], molecule["id"])
+        id_index.setdefault(molecule["id"], molecule["id"])
+
+    calibrator_by_species = {}
+    model_by_species = {}
+    for calibrator in calibrators:
+        species_id = ld_id_index.get(
+            calibrator.standard.ld_id,  # type: ignore
+            id_index.get(calibrator.molecule_id, calibrator.molecule_id),
+        )
+        if species_id in calibrator_by_species:
+            raise ValueError(
+                f"Multiple calibrators were found for species '{species_id}'."
+            )
+        calibrator_by_species[species_id] = calibrator
+        model_by_species[species_id] = fitted_models[calibrator.molecule_id]
+
+    return calibrator_by_species, model_by_species
+
+
+def _convert_streamed_measurement(
+    measurement: dict,
+    calibrator_by_species: dict[str, Calibrator],
+    model_by_species: dict[str, FittedModel],
+    extrapolate: bool,
+    warm_start: bool,
+) -> int:
+    """Converts the matching species data of a raw measurement in place and returns
+    the number of converted series."""
+
+    converted_count = 0
+    for measured_species in measurement.get("species_data", []):
+        calibrator = calibrator_by_species.get(measured_species.get("species_id"))
+        if calibrator is None:
+            continue
+
+        assert (
+            measured_species.get("data_type") != DataTypes.CONCENTRATION.value
+        ), """
+            The data seems to be already in concentration values.
+        """
+        data_unit = measured_species.get("data_unit")
+        factor = _unit_factor(
+            calibrator,
+            UnitDefinition(**data_unit) if data_unit is not None else None,
+        )
+
+        concs = model_by_species[measured_species["species_id"]].convert(
+            measured_species.get("data", []),
+            extrapolate=extrapolate,
+            warm_start=warm_start,
+        )
+
+        if factor != 1.0:
+            concs *= factor
+
+        # write non-finite values as null, keeping the JSON valid
+        finite = np.isfinite(concs)
+        measured_species["data"] = (
+            concs.tolist() if finite.all() else np.where(finite, concs, None).tolist()
+        )
+        measured_species["data_type"] = DataTypes.CONCENTRATION.value
+        converted_count += 1
+
+    return converted_count
+
+
+def _unit_factor(calibrator: Calibrator, data_unit: UnitDefinition | None) -> float:
+    """Returns the factor converting concentrations of the calibrator into the unit
+    of the measured data."""
+
+    try:
+        return conversion_factor(calibrator.conc_unit, data_unit)
+    except ValueError as e:
+        unit_name = data_unit.name if data_unit is not None else None
+        raise ValueError(
+            f"The unit of the measured data ({unit_name}) cannot be converted into "
+            f"the unit of the calibration model ({calibrator.conc_unit.name}). {e}"
+        ) from e
@@ -0,0 +1,160 @@
+"""Generation of standalone evaluator modules for fitted calibration models"""
+
+from __future__ import annotations
+
+from os import PathLike
+
+from calipytion.model import CalibrationModel
+from calipytion.tools.fitted_model import FittedModel
+
+EVALUATOR_TEMPLATE = '''"""Evaluator of the fitted calibration model '{name}' of '{molecule_id}'.
+
+Generated by CaliPytion. Converts signals into concentrations and requires only
+NumPy. Signal law: {signal_law}
+"""
+
+import numpy
+
+NAME = {name!r}
+MOLECULE_ID = {molecule_id!r}
+SIGNAL_LAW = {signal_law!r}
+PARAMETERS = {parameters!r}
+CONC_LOWER = {conc_lower!r}
+CONC_UPPER = {conc_upper!r}
+
+MAX_ITER = 100
+XTOL = 2e-12
+RTOL = 4 * numpy.finfo(float).eps
+
+
+def signal(conc):
+    """Calculates the signals of the given concentrations."""
+
+    conc = numpy.asarray(conc, dtype=float)
+    return numpy.broadcast_to({signal_code}, conc.shape).astype(float)
+
+
+def derivative(conc):
+    """Calculates the derivative of the signal law at the given concentrations."""
+
+    conc = numpy.asarray(conc, dtype=float)
+    return numpy.broadcast_to({derivative_code}, conc.shape).astype(float)
+
+
+def concentration(signals, out_of_range="nan"):
+    """Calculates the concentrations of the given signals within the calibration range.
+
+    All signals are solved at once by Newton iterations, which fall back to bisection
+    whenever a step leaves the bracket of the root.
+
+    Args:
+        signals: The signals to convert, of any shape.
+        out_of_range: Whether signals outside the calibration range are returned as
+            nan or clipped to the nearest bound of the calibration range. Either "nan"
+            or "clip". Defaults to "nan".
+
+    Returns:
+        numpy.ndarray: The concentrations with the shape of the signals.
+    """
+
+    if out_of_range not in ("nan", "clip"):
+        raise ValueError(
+            f"Unknown out of range policy '{{out_of_range}}'. Use 'nan' or 'clip'."
+        )
+
+    y = numpy.asarray(signals, dtype=float)
+    a = numpy.full(y.shape, CONC_LOWER)
+    b = numpy.full(y.shape, CONC_UPPER)
+    fa = signal(a) - y
+    fb = signal(b) - y
+    valid = numpy.sign(fa) * numpy.sign(fb) <= 0
+
+    x = numpy.where(valid, (a + b) / 2, numpy.nan)
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        for _ in range(MAX_ITER):
+            fx = signal(x) - y
+
+            # shrink the bracket to the side which still encloses the root
+            same_side = numpy.sign(fx) == numpy.sign(fa)
+            a = numpy.where(same_side, x, a)
+            fa = numpy.where(same_side, fx, fa)
+            b = numpy.where(same_side, b, x)
+
+            newton = x - fx / derivative(x)
+            inside = (newton >= numpy.minimum(a, b)) & (newton <= numpy.maximum(a, b))
+            x_new = numpy.where(inside, newton, (a + b) / 2)
+            x_new = numpy.where(fx == 0, x, x_new)
+
+            converged = numpy.abs(x_new - x) <= XTOL + RTOL * numpy.abs(x)
+            x = x_new
+            if numpy.all(converged | ~valid):
+                break
+
+    if out_of_range == "clip":
+        signal_lower, signal_upper = signal([CONC_LOWER, CONC_UPPER])
+        nearest = numpy.where(
+            numpy.abs(y - signal_lower) <= numpy.abs(y - signal_upper),
+            CONC_LOWER,
+            CONC_UPPER,
+        )
+        clip = ~valid & ~numpy.isnan(y)
+        x[clip] = nearest[clip]
+
+    return x
+'''
+
+
+def generate_evaluator(model: CalibrationModel) -> str:
+    """Generates the source code of a standalone evaluator module for a fitted model.
+
+    The module embeds the NumPy code of the signal law and its derivative with the
+    fitted parameter values and the calibration range. It provides the functions
+    `signal`, `derivative` and `concentration` and depends only on NumPy, so it can be
+    imported by conversion workers without CaliPytion and its dependencies.
+
+    Args:
+        model (CalibrationModel): The fitted calibration model.
+
+    Raises:
+        AssertionError: If the model has no signal law, molecule id or calibration range.
+        ValueError: If a parameter of the model has no value.
+        ValueError: If the signal law or its derivative cannot be expressed in NumPy.
+
+    Returns:
+        str: The source code of the evaluator module.
+    """
+
+    fitted_model = FittedModel.from_calibration_model(model)
+    derivative_code, _ = fitted_model.analyze()
+    if not derivative_code or "scipy" in fitted_model.signal_code + derivative_code:
+        raise ValueError(
+            f"The signal law '{fitted_model.signal_law}' or its derivative cannot be "
+            "expressed in NumPy, which the evaluator is limited to."
+        )
+
+    return EVALUATOR_TEMPLATE.format(
+        name=fitted_model.name,
+        molecule_id=fitted_model.molecule_id,
+        signal_law=fitted_model.signal_law,
+        parameters=dict(fitted_model.parameters),
+        conc_lower=fitted_model.conc_lower,
+        conc_upper=fitted_model.conc_upper,
+        signal_code=fitted_model.signal_code,
+        derivative_code=derivative_code,
+    )
+
+
+def write_evaluator(model: CalibrationModel, path: str | PathLike) -> None:
+    """Writes a standalone evaluator module for a fitted model, see `generate_evaluator`.
+
+    Args:
+        model (CalibrationModel): The fitted calibration model.
+        path (str | PathLike): Path of the Python module.
+
+    Raises:
+        AssertionError: If the model has no signal law, molecule id or calibration range.
+        ValueError: If a parameter of the model has no value.
+    """
+
+    with open(path, "w") as file:
+        file.write(generate_evaluator(model))
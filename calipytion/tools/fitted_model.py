@@ -0,0 +1,1041 @@
+from __future__ import annotations
+
+import ast
+import asyncio
+import logging
+import os
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import repeat
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+    Literal,
+)
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from calipytion.model import CalibrationModel
+
+LOGGER = logging.getLogger(__name__)
+
+CONC_VAR = "conc"
+EXTRAPOLATION_LIMIT = 1e12
+# Factor by which the bracket grows per expansion step when extrapolating
+BRACKET_GROWTH = 10.0
+# Tolerances of the warm-started Newton iteration, matching those of brentq
+NEWTON_MAX_ITER = 20
+NEWTON_XTOL = 2e-12
+NEWTON_RTOL = 4 * np.finfo(float).eps
+
+# Node types of arithmetic expressions as printed by sympy's NumPyPrinter
+_SAFE_NODES = (
+    ast.Expression,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.Compare,
+    ast.BoolOp,
+    ast.List,
+    ast.Tuple,
+    ast.keyword,
+    ast.Load,
+    ast.operator,
+    ast.unaryop,
+    ast.cmpop,
+    ast.boolop,
+)
+# NumPy members allowed in the code of restored snapshots besides ufuncs
+_NUMPY_CONSTANTS = {"pi", "e", "euler_gamma", "inf", "nan"}
+_NUMPY_FUNCTIONS = {"select"}
+# SciPy modules, of which ufuncs and numeric constants are allowed
+_SCIPY_MODULES = {"scipy.special", "scipy.constants"}
+
+
+@dataclass(frozen=True)
+class ConversionChunk:
+    """Concentrations of a chunk of a signal stream together with running counts."""
+
+    concentrations: np.ndarray
+    out_of_range: int
+    total_signals: int
+    total_out_of_range: int
+
+
+@dataclass(frozen=True)
+class ConversionStats:
+    """Counts of a single conversion, returned by `FittedModel.convert` on request."""
+
+    total_signals: int
+    solved_signals: int
+    out_of_range: int
+
+    @property
+    def deduplication_ratio(self) -> float:
+        """Number of signals per root search, 1.0 without deduplication."""
+
+        if self.solved_signals == 0:
+            return 1.0
+
+        return self.total_signals / self.solved_signals
+
+
+@dataclass(frozen=True)
+class FittedModel:
+    """Immutable snapshot of a fitted calibration model.
+
+    The signal law is compiled with the fitted parameter values into NumPy code, so
+    the snapshot is independent of later changes to the `CalibrationModel` or its
+    `Parameter` objects. All methods are free of side effects, which allows sharing a
+    snapshot between threads without locks. When pickled, e.g. for process pools,
+    only the generated code is transferred and recompiled without sympy.
+
+    The derivative and the critical points of the signal law are only required for
+    extrapolation and warm starts, so they are derived on first use. If sympy cannot
+    derive them, the model is converted without critical points and warm starts.
+    """
+
+    name: str
+    molecule_id: str
+    signal_law: str
+    parameters: tuple[tuple[str, float], ...]
+    conc_lower: float
+    conc_upper: float
+    signal_code: str
+    # None until derived, "" if the signal law has no printable derivative
+    derivative_code: str | None = field(default=None, compare=False)
+    # None if the critical points could not be determined
+    critical_points: tuple[tuple[float, float], ...] | None = field(
+        default=None, compare=False
+    )
+    signal_lower: float | None = None
+    signal_upper: float | None = None
+    signal_fn: Callable = field(init=False, repr=False, compare=False)
+    derivative_fn: Callable | None = field(
+        init=False, default=None, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        try:
+            signal_fn = _compile_code(self.signal_code)
+        except ValueError:
+            # functions outside the whitelist of generated code are evaluated by sympy
+            signal_fn = _lambdify_signal_law(
+                self.signal_law, self.molecule_id, self.parameters
+            )
+        object.__setattr__(self, "signal_fn", signal_fn)
+        object.__setattr__(self, "derivative_fn", None)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["signal_fn"]
+        del state["derivative_fn"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.__post_init__()
+
+    @classmethod
+    def from_calibration_model(cls, model: CalibrationModel) -> FittedModel:
+        """Creates a snapshot of a fitted calibration model.
+
+        Args:
+            model (CalibrationModel): The fitted calibration model.
+
+        Raises:
+            AssertionError: If the model has no signal law, molecule id or calibration range.
+            ValueError: If a parameter of the model has no value.
+
+        Returns:
+            FittedModel: The snapshot of the model.
+        """
+
+        return _build_fitted_model(*_calibration_model_key(model))
+
+    @classmethod
+    def from_equation(
+        cls,
+        equation: str,
+        indep_var: str,
+        parameters: dict[str, float],
+        conc_lower: float,
+        conc_upper: float,
+        signal_lower: float | None = None,
+        signal_upper: float | None = None,
+        name: str = "",
+    ) -> FittedModel:
+        """Creates a snapshot from an equation and its parameter values. Snapshots
+        of identical models are cached, so the equation is only compiled once.
+
+        Args:
+            equation (str): The signal law.
+            indep_var (str): The symbol of the concentration in the signal law.
+            parameters (dict[str, float]): The values of the parameters.
+            conc_lower (float): The lower concentration bound of the calibration range.
+            conc_upper (float): The upper concentration bound of the calibration range.
+            signal_lower (float | None, optional): The lower signal bound. Defaults to None.
+            signal_upper (float | None, optional): The upper signal bound. Defaults to None.
+            name (str, optional): The name of the model. Defaults to "".
+
+        Returns:
+            FittedModel: The snapshot of the model.
+        """
+
+        return _build_fitted_model(
+            *_equation_key(
+                equation,
+                indep_var,
+                parameters,
+                conc_lower,
+                conc_upper,
+                signal_lower,
+                signal_upper,
+                name,
+            )
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict) -> FittedModel:
+        """Restores a snapshot from the output of `to_dict` without sympy.
+
+        Args:
+            data (dict): The snapshot data.
+
+        Raises:
+            ValueError: If the stored code is not an arithmetic expression of the
+                concentration.
+
+        Returns:
+            FittedModel: The snapshot of the model.
+        """
+
+        _check_code(data["signal_code"])
+        if data.get("derivative_code"):
+            _check_code(data["derivative_code"])
+
+        critical_points = data.get("critical_points")
+        if critical_points is not None:
+            critical_points = tuple(
+                (float(conc), float(signal)) for conc, signal in critical_points
+            )
+
+        return cls(
+            **{
+                **data,
+                "parameters": tuple(
+                    (symbol, float(value)) for symbol, value in data["parameters"]
+                ),
+                "critical_points": critical_points,
+            }
+        )
+
+    def analyze(self) -> tuple[str, tuple[tuple[float, float], ...] | None]:
+        """Derives the signal law with sympy, unless done before.
+
+        Returns:
+            tuple[str, tuple[tuple[float, float], ...] | None]: The NumPy code of the
+                derivative, empty if it is not available, and the concentrations and
+                signals of the critical points, None if they could not be determined.
+        """
+
+        if self.derivative_code is None:
+            derivative_code, critical_points = _analyze_signal_law(
+                self.signal_law, self.molecule_id, self.parameters
+            )
+            object.__setattr__(self, "critical_points", critical_points)
+            object.__setattr__(self, "derivative_code", derivative_code)
+
+        return self.derivative_code, self.critical_points  # type: ignore
+
+    def matches(self, model: CalibrationModel) -> bool:
+        """Checks whether the snapshot was taken of the current state of a model.
+
+        Args:
+            model (CalibrationModel): The calibration model.
+
+        Raises:
+            AssertionError: If the model has no signal law, molecule id or calibration range.
+            ValueError: If a parameter of the model has no value.
+
+        Returns:
+            bool: Whether the model and its fitted parameters are those of the snapshot.
+        """
+
+        return self._key() == _calibration_model_key(model)
+
+    def to_dict(self) -> dict:
+        """Returns the JSON-serializable data of the snapshot, including the generated
+        code, from which `from_dict` restores the snapshot.
+
+        Returns:
+            dict: The snapshot data.
+        """
+
+        # snapshots are restored without sympy, so they include the derivative
+        _, critical_points = self.analyze()
+
+        state = self.__getstate__()
+        state["parameters"] = [list(param) for param in self.parameters]
+        if critical_points is not None:
+            state["critical_points"] = [list(point) for point in critical_points]
+
+        return state
+
+    def predict(self, concs: np.ndarray) -> np.ndarray:
+        """Calculates the signals for the given concentrations.
+
+        Args:
+            concs (np.ndarray): The concentrations.
+
+        Returns:
+            np.ndarray: The predicted signals.
+        """
+        concs = np.asarray(concs, dtype=float)
+        return np.broadcast_to(self.signal_fn(concs), concs.shape).astype(float)
+
+    def convert(
+        self,
+        signals: ArrayLike,
+        extrapolate: bool = False,
+        executor: Executor | None = None,
+        chunk_size: int | None = None,
+        out: np.ndarray | None = None,
+        deduplicate: bool = False,
+        out_of_range: Literal["nan", "clip"] = "nan",
+        return_mask: bool = False,
+        warm_start: bool = False,
+        return_stats: bool = False,
+    ) -> (
+        np.ndarray
+        | tuple[np.ndarray, np.ndarray]
+        | tuple[np.ndarray, ConversionStats]
+        | tuple[np.ndarray, np.ndarray, ConversionStats]
+    ):
+        """Calculates the concentrations for the given signals.
+
+        Signals without a solution within the bracket of the root search are detected
+        up front and, depending on `out_of_range`, returned as nan or clipped to the
+        bracket endpoint with the nearest signal. The bracket is determined once for
+        all signals. If an executor is provided, the signals are split into contiguous
+        chunks which are solved in parallel and reassembled in their original order.
+
+        Args:
+            signals (ArrayLike): The signals to convert. Any array-like or buffer of any
+                shape and floating point type, including non-contiguous views.
+            extrapolate (bool, optional): Whether to extrapolate the concentration outside the
+                calibration range. Defaults to False.
+            executor (Executor | None, optional): Executor used to solve chunks of the
+                signals in parallel. Defaults to None.
+            chunk_size (int | None, optional): Number of signals per chunk. Defaults to
+                an even split across the available CPU cores.
+            out (np.ndarray | None, optional): Floating point array of the same shape as
+                the signals into which the concentrations are written. Defaults to None.
+            deduplicate (bool, optional): Whether to solve each distinct signal value only
+                once and scatter the results back to all occurrences. Speeds up the
+                conversion of quantized signals with many repeated values. Defaults to False.
+            out_of_range (Literal["nan", "clip"], optional): Whether signals outside the
+                bracket are returned as nan or clipped to the nearest bracket endpoint.
+                Defaults to "nan".
+            return_mask (bool, optional): Whether to additionally return a boolean mask,
+                which is True for signals outside the bracket. Defaults to False.
+            warm_start (bool, optional): Whether to treat the signals as an ordered trace,
+                such as a kinetic time course, and start the Newton iteration of each
+                signal from the concentration of the previous one. Defaults to False.
+            return_stats (bool, optional): Whether to additionally return the
+                `ConversionStats` of the conversion, which include the number of root
+                searches and thereby the deduplication ratio. Defaults to False.
+
+        Raises:
+            ValueError: If the out of range policy is unknown.
+            ValueError: If the output array has another shape or no floating point type.
+
+        Returns:
+            np.ndarray | tuple: The calculated concentrations with the shape of the
+                signals, followed by the out of range mask and the conversion stats if
+                requested.
+        """
+
+        if out_of_range not in ("nan", "clip"):
+            raise ValueError(
+                f"Unknown out of range policy '{out_of_range}'. Use 'nan' or 'clip'."
+            )
+
+        y = np.asarray(signals, dtype=float)
+        bracket = self.bracket(y, extrapolate)
+
+        if not deduplicate or y.size == 0:
+            solved_signals = y.size
+            roots = self._solve_all(y, bracket, executor, chunk_size, out, warm_start)
+        else:
+            unique_y, inverse = np.unique(y, return_inverse=True)
+            solved_signals = unique_y.size
+            LOGGER.info(
+                f"Solving {unique_y.size} distinct of {y.size} signals "
+                f"(deduplication ratio {y.size / unique_y.size:.1f})."
+            )
+
+            unique_roots = self._solve_all(
+                unique_y, bracket, executor, chunk_size, None, warm_start
+            )
+            roots = unique_roots[inverse.reshape(y.shape)]
+
+            if out is not None:
+                _check_out(out, y.shape)
+                out[...] = roots
+                roots = out
+
+        if out_of_range == "nan" and not return_mask and not return_stats:
+            return roots
+
+        mask = ~self.invertible(y, bracket)
+
+        if out_of_range == "clip":
+            signal_a, signal_b = self._bracket_signals(bracket)
+            nearest = np.where(
+                np.abs(y - signal_a) <= np.abs(y - signal_b), bracket[0], bracket[1]
+            )
+            clip = mask & ~np.isnan(y)
+            roots[clip] = nearest[clip]
+
+        if not return_stats:
+            return (roots, mask) if return_mask else roots
+
+        stats = ConversionStats(
+            total_signals=y.size,
+            solved_signals=solved_signals,
+            out_of_range=int(np.count_nonzero(mask)),
+        )
+
+        return (roots, mask, stats) if return_mask else (roots, stats)
+
+    def iter_convert(
+        self,
+        chunks: Iterable[ArrayLike],
+        extrapolate: bool = False,
+    ) -> Iterator[ConversionChunk]:
+        """Converts a stream of signal chunks into a stream of concentration chunks.
+
+        Each chunk is converted as soon as it is received, so memory usage is bounded
+        by the size of a single chunk, independent of the length of the stream.
+
+        Args:
+            chunks (Iterable[ArrayLike]): The chunks of signals.
+            extrapolate (bool, optional): Whether to extrapolate the concentration outside the
+                calibration range. Defaults to False.
+
+        Yields:
+            ConversionChunk: The concentrations of each chunk with the number of
+                signals which could not be converted and running totals.
+        """
+
+        total_signals = 0
+        total_out_of_range = 0
+        for chunk in chunks:
+            concs = self.convert(chunk, extrapolate=extrapolate)
+            out_of_range = int(np.count_nonzero(np.isnan(concs)))
+
+            total_signals += concs.size
+            total_out_of_range += out_of_range
+
+            yield ConversionChunk(
+                concentrations=concs,
+                out_of_range=out_of_range,
+                total_signals=total_signals,
+                total_out_of_range=total_out_of_range,
+            )
+
+    async def aiter_convert(
+        self,
+        chunks: AsyncIterable[ArrayLike],
+        extrapolate: bool = False,
+    ) -> AsyncIterator[ConversionChunk]:
+        """Converts an asynchronous stream of signal chunks into concentration chunks.
+
+        The conversion of each chunk runs in a worker thread, so the event loop is not
+        blocked while solving.
+
+        Args:
+            chunks (AsyncIterable[ArrayLike]): The chunks of signals.
+            extrapolate (bool, optional): Whether to extrapolate the concentration outside the
+                calibration range. Defaults to False.
+
+        Yields:
+            ConversionChunk: The concentrations of each chunk with the number of
+                signals which could not be converted and running totals.
+        """
+
+        total_signals = 0
+        total_out_of_range = 0
+        async for chunk in chunks:
+            concs = await asyncio.to_thread(self.convert, chunk, extrapolate)
+            out_of_range = int(np.count_nonzero(np.isnan(concs)))
+
+            total_signals += concs.size
+            total_out_of_range += out_of_range
+
+            yield ConversionChunk(
+                concentrations=concs,
+                out_of_range=out_of_range,
+                total_signals=total_signals,
+                total_out_of_range=total_out_of_range,
+            )
+
+    def bracket(self, signals: np.ndarray, extrapolate: bool) -> list[float]:
+        """Determines the bracket for the root search of the given signals.
+        Without extrapolation, the bracket is the calibration range. Otherwise the
+        bracket starts from the calibration range and is expanded geometrically within
+        the monotonic interval of the signal law around the calibration range, only as
+        far as required to enclose all signals of the batch.
+
+        Args:
+            signals (np.ndarray): The signals for which the roots should be calculated.
+            extrapolate (bool): If True, the bracket is extended beyond the calibration range.
+
+        Returns:
+            list[float]: The bracket used for the root search.
+        """
+
+        if not extrapolate:
+            return [self.conc_lower, self.conc_upper]
+
+        y = np.asarray(signals, dtype=float)
+        limits = self._extrapolation_limits()
+        if limits is None:
+            return [self.conc_lower, self.conc_upper]
+
+        return self._expand_bracket(y, limits)
+
+    def invertible(self, signals: ArrayLike, bracket: list[float]) -> np.ndarray:
+        """Determines which signals have a root within the given bracket.
+
+        A signal is invertible if the signal law evaluated at the bracket endpoints
+        lies on both sides of it. Without extrapolation, these endpoint values are
+        the signal range of the calibration.
+
+        Args:
+            signals (ArrayLike): The signals to check.
+            bracket (list[float]): The bracket used for the root search.
+
+        Returns:
+            np.ndarray: Boolean mask with the shape of the signals, which is True for
+                invertible signals.
+        """
+
+        y = np.asarray(signals, dtype=float)
+        signal_a, signal_b = self._bracket_signals(bracket)
+
+        return np.sign(signal_a - y) * np.sign(signal_b - y) <= 0
+
+    def solve(
+        self,
+        signals: ArrayLike,
+        bracket: list[float],
+        out: np.ndarray | None = None,
+        warm_start: bool = False,
+    ) -> np.ndarray:
+        """Solves the signal law for each signal within the given bracket.
+        Signals without a root in the bracket are returned as nan. These signals are
+        screened out up front via `invertible`, so only solvable signals reach the
+        root solver.
+
+        With `warm_start`, the signals are treated as an ordered trace. Each signal is
+        first solved by Newton's method with the analytic derivative, starting from the
+        root of the previous signal, and only solved by bracketing if Newton's method
+        leaves the bracket or does not converge. If the signal law is not monotonic
+        within the bracket, Newton's method could converge to another root than the
+        bracketing solver, so all signals are solved by bracketing instead.
+
+        Args:
+            signals (ArrayLike): The signals for which the roots should be calculated.
+            bracket (list[float]): The bracket used for the root search.
+            out (np.ndarray | None, optional): Floating point array of the same shape as
+                the signals into which the roots are written. Defaults to None.
+            warm_start (bool, optional): Whether to start the root search of each signal
+                from the root of the previous signal. Defaults to False.
+
+        Returns:
+            np.ndarray: The roots for the given signals.
+        """
+
+        from scipy.optimize import brentq
+
+        y = np.asarray(signals, dtype=float)
+
+        if out is None:
+            out = np.empty(y.shape)
+        else:
+            _check_out(out, y.shape)
+
+        # solve directly into the output buffer if possible
+        direct = out.dtype == np.float64 and out.flags.c_contiguous
+        roots = out.reshape(-1) if direct else np.empty(y.size)
+
+        signal_fn = self.signal_fn
+        a, b = bracket
+        derivative_fn = self._derivative_fn() if warm_start else None
+        warm_start = derivative_fn is not None and self._is_monotonic(a, b)
+
+        # only signals with a sign change across the bracket have a root
+        flat_y = y.reshape(-1)
+        roots[:] = np.nan
+        previous = np.nan
+        for idx in np.flatnonzero(self.invertible(flat_y, bracket)):
+            signal = flat_y[idx]
+
+            if warm_start and not np.isnan(previous):
+                root = self._newton(signal, previous, a, b, derivative_fn)
+                if not np.isnan(root):
+                    roots[idx] = previous = root
+                    continue
+
+            try:
+                roots[idx] = brentq(lambda x: signal_fn(x) - signal, a, b)
+            except ValueError:
+                roots[idx] = np.nan
+            previous = roots[idx]
+
+        if not direct:
+            out[...] = roots.reshape(y.shape)
+
+        return out
+
+    def _solve_all(
+        self,
+        y: np.ndarray,
+        bracket: list[float],
+        executor: Executor | None,
+        chunk_size: int | None,
+        out: np.ndarray | None,
+        warm_start: bool = False,
+    ) -> np.ndarray:
+        """Solves all signals within the bracket, optionally in parallel chunks."""
+
+        if executor is None or y.size == 0:
+            return self.solve(y, bracket, out=out, warm_start=warm_start)
+
+        flat_y = np.ascontiguousarray(y).reshape(-1)
+        if chunk_size is None:
+            chunk_size = -(-flat_y.size // (os.cpu_count() or 1))
+        chunks = [
+            flat_y[idx : idx + chunk_size] for idx in range(0, flat_y.size, chunk_size)
+        ]
+
+        results = executor.map(
+            _solve_chunk, repeat(self), chunks, repeat(bracket), repeat(warm_start)
+        )
+        roots = np.concatenate(list(results)).reshape(y.shape)
+
+        if out is None:
+            return roots
+
+        _check_out(out, y.shape)
+        out[...] = roots
+        return out
+
+    def _key(self) -> tuple:
+        return (
+            self.name,
+            self.signal_law,
+            self.molecule_id,
+            self.parameters,
+            self.conc_lower,
+            self.conc_upper,
+            self.signal_lower,
+            self.signal_upper,
+        )
+
+    def _bracket_signals(self, bracket: list[float]) -> tuple[float, float]:
+        """Evaluates the signal law at both endpoints of the bracket."""
+
+        with np.errstate(over="ignore", invalid="ignore"):
+            return float(self.signal_fn(bracket[0])), float(self.signal_fn(bracket[1]))
+
+    def _derivative_fn(self) -> Callable | None:
+        """Compiles the derivative on first use, None if it is not available."""
+
+        if self.derivative_fn is None:
+            derivative_code, _ = self.analyze()
+            if not derivative_code:
+                return None
+            try:
+                object.__setattr__(
+                    self, "derivative_fn", _compile_code(derivative_code)
+                )
+            except ValueError:
+                return None
+
+        return self.derivative_fn
+
+    def _is_monotonic(self, a: float, b: float) -> bool:
+        """Whether no critical point of the signal law lies inside the bracket.
+        False if the critical points could not be determined."""
+
+        _, critical_points = self.analyze()
+        if critical_points is None:
+            return False
+
+        lower, upper = min(a, b), max(a, b)
+        return not any(lower < conc < upper for conc, _ in critical_points)
+
+    def _newton(
+        self,
+        signal: float,
+        start: float,
+        a: float,
+        b: float,
+        derivative_fn: Callable,
+    ) -> float:
+        """Solves a single signal by Newton's method from the given start value.
+        Returns nan if an iterate leaves the bracket or the method does not converge."""
+
+        lower, upper = min(a, b), max(a, b)
+        conc = start
+        for _ in range(NEWTON_MAX_ITER):
+            slope = derivative_fn(conc)
+            if slope == 0 or not np.isfinite(slope):
+                return np.nan
+
+            step = (self.signal_fn(conc) - signal) / slope
+            conc = conc - step
+            if not lower <= conc <= upper:
+                return np.nan
+
+            if abs(step) <= NEWTON_XTOL + NEWTON_RTOL * abs(conc):
+                return float(conc)
+
+        return np.nan
+
+    def _extrapolation_limits(self) -> list[float] | None:
+        """Determines the monotonic interval of the signal law which contains the
+        calibration range, or None if extrapolation is not possible."""
+
+        _, critical_points = self.analyze()
+        concs = [conc for conc, _ in critical_points or ()]
+
+        # a critical point within the calibration range splits it into two branches
+        if any(self.conc_lower < conc < self.conc_upper for conc in concs):
+            LOGGER.warning(
+                f"The signal law {self.signal_law} is not monotonic within the "
+                "calibration range. Extrapolation not possible."
+            )
+            return None
+
+        # the neighbouring critical points bound the interval, if there are any
+        lower_limit = max(
+            (conc for conc in concs if conc <= self.conc_lower),
+            default=-EXTRAPOLATION_LIMIT,
+        )
+        upper_limit = min(
+            (conc for conc in concs if conc >= self.conc_upper),
+            default=EXTRAPOLATION_LIMIT,
+        )
+        return [lower_limit, upper_limit]
+
+    def _expand_bracket(self, y: np.ndarray, limits: list[float]) -> list[float]:
+        """Expands the calibration range geometrically towards the limits until the
+        signal law at the bracket endpoints encloses all finite signals. The limits
+        contain the calibration range, so the bracket never shrinks below it."""
+
+        lower_limit, upper_limit = limits
+        lower, upper = self.conc_lower, self.conc_upper
+
+        finite_y = y[np.isfinite(y)]
+        if finite_y.size == 0:
+            return [lower, upper]
+        y_min, y_max = finite_y.min(), finite_y.max()
+
+        step = (upper - lower) or 1.0
+        while True:
+            signal_lower, signal_upper = self._bracket_signals([lower, upper])
+
+            # the signal law is monotonic within the limits
+            if signal_lower <= signal_upper:
+                expand_lower = y_min < signal_lower
+                expand_upper = y_max > signal_upper
+            else:
+                expand_lower = y_max > signal_lower
+                expand_upper = y_min < signal_upper
+
+            expand_lower = expand_lower and lower > lower_limit
+            expand_upper = expand_upper and upper < upper_limit
+            if not (expand_lower or expand_upper):
+                return [lower, upper]
+
+            if expand_lower:
+                lower = max(lower - step, lower_limit)
+            if expand_upper:
+                upper = min(upper + step, upper_limit)
+            step *= BRACKET_GROWTH
+
+
+def _solve_chunk(
+    fitted_model: FittedModel,
+    y: np.ndarray,
+    bracket: list[float],
+    warm_start: bool = False,
+) -> np.ndarray:
+    """Solves a chunk of signals. Defined on module level to be picklable for
+    process-based executors."""
+
+    return fitted_model.solve(y, bracket, warm_start=warm_start)
+
+
+def _calibration_model_key(model: CalibrationModel) -> tuple:
+    """Returns the arguments of `_build_fitted_model` for a calibration model."""
+
+    assert model.signal_law is not None, "Calibration model has no signal law."
+    assert model.molecule_id is not None, "Calibration model has no molecule symbol."
+    assert model.calibration_range, "Calibration range not set."
+
+    for param in model.parameters:
+        if param.value is None:
+            raise ValueError(f"Parameter '{param.symbol}' has no value set.")
+
+    return _equation_key(
+        equation=model.signal_law,
+        indep_var=model.molecule_id,
+        parameters={param.symbol: param.value for param in model.parameters},  # type: ignore
+        conc_lower=model.calibration_range.conc_lower,
+        conc_upper=model.calibration_range.conc_upper,
+        signal_lower=model.calibration_range.signal_lower,
+        signal_upper=model.calibration_range.signal_upper,
+        name=model.name,
+    )
+
+
+def _equation_key(
+    equation: str,
+    indep_var: str,
+    parameters: dict[str, float],
+    conc_lower: float,
+    conc_upper: float,
+    signal_lower: float | None,
+    signal_upper: float | None,
+    name: str,
+) -> tuple:
+    """Returns the arguments of `_build_fitted_model` for an equation."""
+
+    return (
+        name,
+        equation,
+        indep_var,
+        tuple((symbol, float(value)) for symbol, value in parameters.items()),
+        float(conc_lower),
+        float(conc_upper),
+        None if signal_lower is None else float(signal_lower),
+        None if signal_upper is None else float(signal_upper),
+    )
+
+
+def _compile_code(code: str) -> Callable:
+    """Compiles a NumPy expression of the concentration into a function.
+
+    The code may come from a snapshot file, so it is checked by `_check_code` before
+    it is evaluated without builtins.
+
+    Raises:
+        ValueError: If the code is not an arithmetic expression of the concentration.
+    """
+
+    _check_code(code)
+
+    namespace = {"__builtins__": {}, "abs": abs, "numpy": np}
+    if "scipy" in code:
+        import scipy.constants
+        import scipy.special
+
+        namespace["scipy"] = scipy
+
+    return eval(f"lambda {CONC_VAR}: {code}", namespace)
+
+
+def _check_code(code: str) -> None:
+    """Checks that code is an arithmetic expression of the concentration, numbers,
+    NumPy and `scipy.special` ufuncs and constants, as printed by sympy.
+
+    Raises:
+        ValueError: If the code contains anything else.
+    """
+
+    try:
+        tree = ast.parse(code, mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid code of fitted model: {code!r}") from e
+
+    for node in ast.walk(tree):
+        if not _is_safe_node(node):
+            raise ValueError(
+                f"Code of fitted model contains '{ast.unparse(node)}', which is not "
+                "an arithmetic expression of the concentration."
+            )
+
+
+def _is_safe_node(node: ast.AST) -> bool:
+    if isinstance(node, _SAFE_NODES):
+        return True
+    if isinstance(node, ast.Constant):
+        return isinstance(node.value, (int, float, complex))
+    if isinstance(node, ast.Name):
+        return node.id in (CONC_VAR, "abs", "numpy", "scipy")
+    if isinstance(node, ast.Attribute):
+        return _is_allowed_member(node)
+    if isinstance(node, ast.Call):
+        return (
+            isinstance(node.func, ast.Name) and node.func.id == "abs"
+        ) or isinstance(node.func, ast.Attribute)
+    return False
+
+
+def _is_allowed_member(node: ast.Attribute) -> bool:
+    parts = [node.attr]
+    value = node.value
+    while isinstance(value, ast.Attribute):
+        parts.insert(0, value.attr)
+        value = value.value
+    if not isinstance(value, ast.Name) or any(part.startswith("_") for part in parts):
+        return False
+
+    path = ".".join([value.id, *parts])
+    module, _, member = path.rpartition(".")
+    if path in _SCIPY_MODULES:
+        return True
+    if module == "numpy":
+        if member in _NUMPY_CONSTANTS or member in _NUMPY_FUNCTIONS:
+            return True
+        return isinstance(getattr(np, member, None), np.ufunc)
+    if module == "scipy.special":
+        import scipy.special
+
+        return isinstance(getattr(scipy.special, member, None), np.ufunc)
+    if module == "scipy.constants":
+        import scipy.constants
+
+        return isinstance(getattr(scipy.constants, member, None), float)
+    return False
+
+
+def _parse_signal_law(
+    equation: str, indep_var: str, parameters: tuple[tuple[str, float], ...]
+) -> tuple[Any, Any]:
+    """Substitutes the parameter values into the signal law and returns the real
+    concentration symbol and the expression."""
+
+    import sympy as sp
+
+    conc = sp.Symbol(CONC_VAR, real=True)
+    expression = sp.sympify(equation).subs(
+        {sp.Symbol(symbol): value for symbol, value in parameters}
+    )
+    expression = expression.subs(sp.Symbol(indep_var), conc)
+
+    for symbol in expression.free_symbols - {conc}:
+        raise ValueError(f"Parameter '{symbol}' has no value set.")
+
+    return conc, expression
+
+
+def _print_code(expression: Any) -> str:
+    """Prints an expression as NumPy and SciPy code. Expressions the printer does
+    not support are returned in sympy syntax, which `_check_code` rejects."""
+
+    from sympy.printing.numpy import SciPyPrinter
+
+    try:
+        return SciPyPrinter().doprint(expression)
+    except Exception:
+        return str(expression)
+
+
+def _lambdify_signal_law(
+    equation: str, indep_var: str, parameters: tuple[tuple[str, float], ...]
+) -> Callable:
+    """Creates the signal function with sympy, for code `_check_code` rejects."""
+
+    import sympy as sp
+
+    conc, expression = _parse_signal_law(equation, indep_var, parameters)
+    return sp.lambdify(conc, expression, modules=["scipy", "numpy"])
+
+
+@lru_cache(maxsize=256)
+def _analyze_signal_law(
+    equation: str, indep_var: str, parameters: tuple[tuple[str, float], ...]
+) -> tuple[str, tuple[tuple[float, float], ...] | None]:
+    """Derives the signal law and determines its critical points, see
+    `FittedModel.analyze`."""
+
+    import sympy as sp
+
+    conc, expression = _parse_signal_law(equation, indep_var, parameters)
+
+    try:
+        derivative = sp.diff(expression, conc)
+    except Exception:
+        return "", None
+
+    derivative_code = _print_code(derivative)
+    try:
+        _check_code(derivative_code)
+    except ValueError:
+        derivative_code = ""
+
+    # critical points of the signal law limit the bracket for extrapolation
+    try:
+        critical_points = []
+        for cp in sp.solve(derivative, conc):
+            y = expression.subs(conc, cp)
+            if y.is_real:
+                critical_points.append((float(sp.re(cp)), float(y)))
+    except Exception:
+        LOGGER.debug(f"Could not determine the critical points of {equation}.")
+        return derivative_code, None
+
+    return derivative_code, tuple(critical_points)
+
+
+@lru_cache(maxsize=256)
+def _build_fitted_model(
+    name: str,
+    equation: str,
+    indep_var: str,
+    parameters: tuple[tuple[str, float], ...],
+    conc_lower: float,
+    conc_upper: float,
+    signal_lower: float | None,
+    signal_upper: float | None,
+) -> FittedModel:
+    _, expression = _parse_signal_law(equation, indep_var, parameters)
+
+    return FittedModel(
+        name=name,
+        molecule_id=indep_var,
+        signal_law=equation,
+        parameters=parameters,
+        conc_lower=conc_lower,
+        conc_upper=conc_upper,
+        signal_lower=signal_lower,
+        signal_upper=signal_upper,
+        signal_code=_print_code(expression),
+    )
+
+
+def _check_out(out: np.ndarray, shape: tuple[int, ...]) -> None:
+    """Validates a caller-provided output array."""
+
+    if not isinstance(out, np.ndarray):
+        raise TypeError("The output must be a numpy array.")
+    if out.shape != shape:
+        raise ValueError(
+            f"The output shape {out.shape} does not match the signal shape {shape}."
+        )
+    if not np.issubdtype(out.dtype, np.floating):
+        raise ValueError(
+            f"The output dtype {out.dtype} is not a floating point type, which is "
+            "required to hold nan for signals without a concentration."
+        )
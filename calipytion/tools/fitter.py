@@ -1,4 +1,5 @@
 import logging
+from concurrent.futures import Executor
 from typing import Callable
 
 import numpy as np
@@ -7,9 +8,9 @@ from lmfit import Model as LMFitModel
 from lmfit import Parameters
 from lmfit.model import ModelResult
 from loguru import logger
-from scipy.optimize import root_scalar
 
 from calipytion.model import CalibrationModel, FitStatistics, Parameter
+from calipytion.tools.fitted_model import FittedModel
 from calipytion.tools.utility import calculate_rmsd
 
 LOGGER = logging.getLogger(__name__)
@@ -57,118 +58,65 @@ class Fitter:
         lower_bond: float,
         upper_bond: float,
         extrapolate: bool,
+        executor: Executor | None = None,
+        chunk_size: int | None = None,
+        deduplicate: bool = False,
     ) -> tuple[np.ndarray, list[float]]:
         """
         Calculate the roots of the equation for the given signals.
         If the extrapolate flag is set to True, the function will try to find the roots
+        outside of the calibration range.
+
+        The bracket for the root search is determined once for all signals. If an
+        executor is provided, the signals are split into contiguous chunks which are
+        solved in parallel and reassembled in their original order.
 
         Args:
             y (np.ndarray): The signals for which the roots should be calculated.
             lower_bond (float): The lower bound for the root search.
             upper_bond (float): The upper bound for the root search.
             extrapolate (bool): If True, the function will try to extrapolate the calibration range.
+            executor (Executor | None, optional): Executor used to solve chunks of the
+                signals in parallel. Defaults to None.
+            chunk_size (int | None, optional): Number of signals per chunk. Defaults to
+                an even split across the available CPU cores.
+            deduplicate (bool, optional): Whether to solve each distinct signal only once
+                and scatter the roots back to all occurrences. Defaults to False.
 
         Returns:
             tuple[np.ndarray, list[float]]: The roots and the bracket used for the root search.
         """
 
-        root_eq = self._get_root_eq()
-
         for param in self.params:
             if param.value is None:
                 raise ValueError(f"Parameter '{param.symbol}' has no value set.")
 
-        params = [{param.symbol: param.value for param in self.params}] * len(y)
-        params = [
-            {**param, self.signal_var: signal} for param, signal in zip(params, y)
-        ]
-        if not extrapolate:
-            bracket = [lower_bond, upper_bond]
-
-            roots = []
-            failed_signals = []
-            for param in params:
-                try:
-                    root = root_scalar(
-                        root_eq, bracket=bracket, args=tuple(param.values())
-                    )
-                    roots.append(root.root)
-                except ValueError:
-                    roots.append(np.nan)
-                    failed_signals.append(param[self.signal_var])
-
-            return np.array(roots), bracket
-
-        else:
-            # update the bracket for the root search
-            critical_points = self.calculate_critical_points()
-            critical_points = sorted(critical_points, key=lambda x: x[0])
-
-            # monotonically increasing function, no need to define sensible bracket
-            if len(critical_points) == 0:
-                bracket = [1e12, -1e12]
-
-            elif len(critical_points) == 1:
-                # if all signals are above the critical point y, crit must be the lower bound
-                if all(y > critical_points[0][1]):
-                    bracket = [critical_points[0][0], 1e12]
-                # ... must be the upper bound
-                elif all(y < critical_points[0][1]):
-                    bracket = [1e12, critical_points[0][0]]
-                # if signals are above and below the critical point y, extrapolation not possible
-                else:
-                    bracket = [lower_bond, upper_bond]
-                    logger.warning(
-                        f"Setting extended calibration range for {self.equation} not possible. Extrapolation not possible."
-                    )
-            elif len(critical_points) == 2:
-                # if crit x1 has lower y value than crit x2, crit x1 must be the lower bound, since only monotonically increasing interval in function
-                if critical_points[0][1] < critical_points[1][1]:
-                    bracket = [critical_points[0][0], critical_points[1][0]]
-                else:
-                    if (
-                        lower_bond - critical_points[1][0]
-                        < critical_points[0][0] - upper_bond
-                    ):
-                        bracket = [critical_points[0][0], 1e12]
-                    else:
-                        bracket = [1e12, critical_points[1][0]]
-
-            else:
-                bracket = [lower_bond, upper_bond]
-                logger.warning(
-                    f"More than two critical points found for {self.equation}. Extrapolation not possible."
-                )
-
-            roots = []
-            failed_signals = []
-            for param in params:
-                try:
-                    # eq = self.equation + " - " + self.signal_var
-                    # eqq = sp.sympify(eq)
-                    # params_lower = {param.symbol: param.value for param in self.params}
-                    # params_upper = {param.symbol: param.value for param in self.params}
-                    # params_lower["SIGNAL_PLACEHOLDER"] = 4
-                    # params_upper["SIGNAL_PLACEHOLDER"] = 4
-                    # print(f"f(lower_bound) = {eqq.subs(params_lower)}")
-                    # print(f"f(upper_bound) = {eqq.subs(params_upper)}")
-                    root = root_scalar(
-                        root_eq,
-                        bracket=bracket,
-                        args=tuple(param.values()),
-                    )
-                    roots.append(root.root)
-                except ValueError:
-                    roots.append(np.nan)
-                    failed_signals.append(param[self.signal_var])
-
-            if failed_signals:
-                logger.warning(
-                    f"Could not find roots for signals: {failed_signals} "
-                    f"in extended calibration range {bracket}."
-                )
-
-            return np.array(roots), bracket
+        fitted_model = FittedModel.from_equation(
+            equation=self.equation,
+            indep_var=self.indep_var,
+            parameters={param.symbol: param.value for param in self.params},  # type: ignore
+            conc_lower=lower_bond,
+            conc_upper=upper_bond,
+        )
+
+        y = np.asarray(y, dtype=float)
+        bracket = fitted_model.bracket(y, extrapolate)
+        roots = fitted_model.convert(
+            y,
+            extrapolate=extrapolate,
+            executor=executor,
+            chunk_size=chunk_size,
+            deduplicate=deduplicate,
+        )
+
+        failed_signals = y[np.isnan(roots)].tolist()
+        if extrapolate and failed_signals:
+            logger.warning(
+                f"Could not find roots for signals: {failed_signals} "
+                f"in extended calibration range {bracket}."
+            )
+
+        return roots, bracket
 
     # function that allows to define the nearest critical points from the root equation to determine the maximal calibration range during concentration calculations with extrapolation
     def calculate_critical_points(self) -> list[tuple[float, float]]:
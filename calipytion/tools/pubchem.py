@@ -0,0 +1,437 @@
+"""Cached and batched PubChem lookups"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Mapping
+
+import httpx
+
+from calipytion.ioutils.cache import get_cache_dir
+
+LOGGER = logging.getLogger(__name__)
+
+OFFLINE_ENV = "CALIPYTION_OFFLINE"
+DEFAULT_TTL = 30 * 24 * 60 * 60
+PUBCHEM_URL = "https://pubchem.ncbi.nlm.nih.gov/rest/pug"
+
+_default_cache: PubChemCache | None = None
+
+
+@dataclass
+class CacheStats:
+    """Counts of the lookups of a `PubChemCache`."""
+
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    expired: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from memory or disk."""
+
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0
+
+
+class PubChemCache:
+    """Cache of molecule names by PubChem CID.
+
+    Names are kept in an in-process LRU in front of a persistent sqlite store, so
+    they survive across sessions. Entries older than the time to live are treated as
+    missing and fetched again, unless the cache is in offline mode, in which case
+    expired entries are still served and no network requests should be made.
+
+    Args:
+        cache_dir (str | Path | None, optional): Directory of the sqlite store. Defaults
+            to the `CALIPYTION_CACHE_DIR` environment variable or `~/.cache/calipytion`.
+        ttl (float, optional): Time to live of an entry in seconds. Defaults to 30 days.
+        maxsize (int, optional): Number of names held in memory. Defaults to 1024.
+        offline (bool | None, optional): Whether lookups must not access the network.
+            Defaults to the `CALIPYTION_OFFLINE` environment variable.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path | None = None,
+        ttl: float = DEFAULT_TTL,
+        maxsize: int = 1024,
+        offline: bool | None = None,
+    ):
+        if offline is None:
+            offline = os.environ.get(OFFLINE_ENV, "").lower() in ("1", "true", "yes")
+
+        self.path = get_cache_dir(cache_dir) / "pubchem.sqlite"
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.offline = offline
+        self.stats = CacheStats()
+        self._memory: OrderedDict[int, tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_available = True
+
+    def get(self, pubchem_cid: int) -> str | None:
+        """Returns the cached molecule name of a CID.
+
+        Args:
+            pubchem_cid (int): PubChem Compound Identifier.
+
+        Returns:
+            str | None: The molecule name or None if it is not cached or expired.
+        """
+
+        with self._lock:
+            entry = self._memory.get(pubchem_cid)
+            if entry is not None and self._is_valid(entry[1]):
+                self._memory.move_to_end(pubchem_cid)
+                self.stats.memory_hits += 1
+                return entry[0]
+
+        entry = self._read(pubchem_cid)
+
+        with self._lock:
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            if not self._is_valid(entry[1]):
+                self.stats.expired += 1
+                self.stats.misses += 1
+                return None
+
+            self.stats.disk_hits += 1
+            self._remember(pubchem_cid, entry)
+            return entry[0]
+
+    def set(self, pubchem_cid: int, molecule_name: str) -> None:
+        """Stores the molecule name of a CID.
+
+        Args:
+            pubchem_cid (int): PubChem Compound Identifier.
+            molecule_name (str): The molecule name.
+        """
+
+        self.set_many({pubchem_cid: molecule_name})
+
+    def set_many(self, molecule_names: Mapping[int, str]) -> None:
+        """Stores the molecule names of several CIDs in a single transaction.
+
+        Args:
+            molecule_names (Mapping[int, str]): The molecule names by CID.
+        """
+
+        if not molecule_names:
+            return
+
+        fetched_at = time.time()
+        with self._lock:
+            for pubchem_cid, molecule_name in molecule_names.items():
+                self._remember(pubchem_cid, (molecule_name, fetched_at))
+
+        self._write(
+            [
+                (pubchem_cid, molecule_name, fetched_at)
+                for pubchem_cid, molecule_name in molecule_names.items()
+            ]
+        )
+
+    def clear(self) -> None:
+        """Removes all entries from memory and disk and resets the statistics."""
+
+        with self._lock:
+            self._memory.clear()
+            self.stats = CacheStats()
+
+        if self.path.exists():
+            with self._connect() as connection:
+                connection.execute("DELETE FROM molecule_names")
+
+    def _is_valid(self, fetched_at: float) -> bool:
+        return self.offline or time.time() - fetched_at < self.ttl
+
+    def _remember(self, pubchem_cid: int, entry: tuple[str, float]) -> None:
+        self._memory[pubchem_cid] = entry
+        self._memory.move_to_end(pubchem_cid)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def _read(self, pubchem_cid: int) -> tuple[str, float] | None:
+        if not self._disk_available or not self.path.exists():
+            return None
+
+        try:
+            with self._connect() as connection:
+                row = connection.execute(
+                    "SELECT name, fetched_at FROM molecule_names WHERE cid = ?",
+                    (pubchem_cid,),
+                ).fetchone()
+        except sqlite3.Error as e:
+            LOGGER.warning(f"⚠️ Could not read PubChem cache {self.path}: {e}")
+            return None
+
+        return (row[0], row[1]) if row else None
+
+    def _write(self, rows: list[tuple[int, str, float]]) -> None:
+        if not self._disk_available:
+            return
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._connect() as connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO molecule_names VALUES (?, ?, ?)", rows
+                )
+        except (OSError, sqlite3.Error) as e:
+            # a read-only or full disk should not break the lookup itself
+            self._disk_available = False
+            LOGGER.warning(f"⚠️ Could not write PubChem cache {self.path}: {e}")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Opens the store, commits on success and always closes the connection."""
+
+        connection = sqlite3.connect(self.path, timeout=10)
+        try:
+            with connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS molecule_names "
+                    "(cid INTEGER PRIMARY KEY, name TEXT NOT NULL, fetched_at REAL NOT NULL)"
+                )
+                yield connection
+        finally:
+            connection.close()
+
+
+def get_pubchem_cache() -> PubChemCache:
+    """Returns the cache used for PubChem lookups, creating it on first use.
+
+    Returns:
+        PubChemCache: The default cache.
+    """
+
+    global _default_cache
+
+    if _default_cache is None:
+        _default_cache = PubChemCache()
+
+    return _default_cache
+
+
+def set_pubchem_cache(cache: PubChemCache | None) -> None:
+    """Replaces the cache used for PubChem lookups, e.g. to change its directory or
+    to enable offline mode. Passing None recreates the default cache on next use.
+
+    Args:
+        cache (PubChemCache | None): The cache to use.
+    """
+
+    global _default_cache
+
+    _default_cache = cache
+
+
+def resolve_molecule_names(
+    pubchem_cids: Iterable[int],
+    client: httpx.Client | None = None,
+    cache: PubChemCache | None = None,
+    batch_size: int = 100,
+    timeout: float = 10.0,
+    base_url: str = PUBCHEM_URL,
+) -> dict[int, str]:
+    """Retrieves the molecule names of many CIDs with as few requests as possible.
+
+    Cached names are served from the cache. The remaining CIDs are grouped into
+    multi-CID property requests, which are sent over a single pooled connection.
+    In offline mode, only cached names are returned.
+
+    Args:
+        pubchem_cids (Iterable[int]): PubChem Compound Identifiers.
+        client (httpx.Client | None, optional): Client used for the requests. Defaults
+            to a new client, which is closed afterwards.
+        cache (PubChemCache | None, optional): The cache to use. Defaults to the cache
+            returned by `get_pubchem_cache`.
+        batch_size (int, optional): Number of CIDs per request. Defaults to 100.
+        timeout (float, optional): Timeout of a request in seconds, if no client is
+            given. Defaults to 10.0.
+        base_url (str, optional): Base URL of the PubChem REST API. Defaults to PubChem.
+
+    Raises:
+        ValueError: If a request fails.
+
+    Returns:
+        dict[int, str]: Molecule names by CID. CIDs unknown to PubChem are omitted.
+    """
+
+    cache = cache or get_pubchem_cache()
+    names, missing = _lookup_cached(pubchem_cids, cache)
+    if not missing or cache.offline:
+        return names
+
+    own_client = client is None
+    if own_client:
+        client = httpx.Client(timeout=timeout)
+
+    try:
+        for batch in _batches(missing, batch_size):
+            response = client.get(_property_url(base_url, batch))  # type: ignore
+            fetched = _parse_titles(response)
+            cache.set_many(fetched)
+            names.update(fetched)
+    finally:
+        if own_client:
+            client.close()  # type: ignore
+
+    return names
+
+
+async def aresolve_molecule_names(
+    pubchem_cids: Iterable[int],
+    client: httpx.AsyncClient | None = None,
+    cache: PubChemCache | None = None,
+    batch_size: int = 100,
+    max_concurrency: int = 4,
+    timeout: float = 10.0,
+    base_url: str = PUBCHEM_URL,
+) -> dict[int, str]:
+    """Asynchronous variant of `resolve_molecule_names`, which sends up to
+    `max_concurrency` multi-CID requests at the same time.
+
+    Args:
+        pubchem_cids (Iterable[int]): PubChem Compound Identifiers.
+        client (httpx.AsyncClient | None, optional): Client used for the requests.
+            Defaults to a new client, which is closed afterwards.
+        cache (PubChemCache | None, optional): The cache to use. Defaults to the cache
+            returned by `get_pubchem_cache`.
+        batch_size (int, optional): Number of CIDs per request. Defaults to 100.
+        max_concurrency (int, optional): Maximum number of concurrent requests.
+            Defaults to 4.
+        timeout (float, optional): Timeout of a request in seconds, if no client is
+            given. Defaults to 10.0.
+        base_url (str, optional): Base URL of the PubChem REST API. Defaults to PubChem.
+
+    Raises:
+        ValueError: If a request fails.
+
+    Returns:
+        dict[int, str]: Molecule names by CID. CIDs unknown to PubChem are omitted.
+    """
+
+    cache = cache or get_pubchem_cache()
+    # the sqlite store is read and written in a worker thread to not block the loop
+    names, missing = await asyncio.to_thread(_lookup_cached, pubchem_cids, cache)
+    if not missing or cache.offline:
+        return names
+
+    own_client = client is None
+    if own_client:
+        client = httpx.AsyncClient(timeout=timeout)
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def request(batch: list[int]) -> dict[int, str]:
+        async with semaphore:
+            response = await client.get(_property_url(base_url, batch))  # type: ignore
+        return _parse_titles(response)
+
+    try:
+        results = await asyncio.gather(
+            *(request(batch) for batch in _batches(missing, batch_size))
+        )
+    finally:
+        if own_client:
+            await client.aclose()  # type: ignore
+
+    fetched = {}
+    for result in results:
+        fetched.update(result)
+
+    await asyncio.to_thread(cache.set_many, fetched)
+    names.update(fetched)
+
+    return names
+
+
+def populate_molecule_names(
+    calibrator_kwargs: list[dict[str, Any]], **kwargs: Any
+) -> list[dict[str, Any]]:
+    """Fills in the `molecule_name` of calibrator arguments before validation, so
+    that constructing the calibrators does not request each name separately.
+
+    Args:
+        calibrator_kwargs (list[dict[str, Any]]): Keyword arguments of calibrators
+            with a `pubchem_cid`. Entries with a `molecule_name` are left unchanged.
+        **kwargs: Further arguments passed to `resolve_molecule_names`.
+
+    Returns:
+        list[dict[str, Any]]: The updated keyword arguments.
+    """
+
+    pubchem_cids = [
+        data["pubchem_cid"] for data in calibrator_kwargs if "molecule_name" not in data
+    ]
+    names = resolve_molecule_names(pubchem_cids, **kwargs)
+
+    for data in calibrator_kwargs:
+        if "molecule_name" not in data and data["pubchem_cid"] in names:
+            data["molecule_name"] = names[data["pubchem_cid"]]
+
+    return calibrator_kwargs
+
+
+def _lookup_cached(
+    pubchem_cids: Iterable[int], cache: PubChemCache
+) -> tuple[dict[int, str], list[int]]:
+    """Splits unique CIDs into cached names and CIDs which need to be requested."""
+
+    names: dict[int, str] = {}
+    missing: list[int] = []
+    for pubchem_cid in dict.fromkeys(pubchem_cids):
+        molecule_name = cache.get(pubchem_cid)
+        if molecule_name is None:
+            missing.append(pubchem_cid)
+        else:
+            names[pubchem_cid] = molecule_name
+
+    return names, missing
+
+
+def _batches(pubchem_cids: list[int], batch_size: int) -> Iterator[list[int]]:
+    for idx in range(0, len(pubchem_cids), batch_size):
+        yield pubchem_cids[idx : idx + batch_size]
+
+
+def _property_url(base_url: str, pubchem_cids: list[int]) -> str:
+    cids = ",".join(str(pubchem_cid) for pubchem_cid in pubchem_cids)
+    return f"{base_url}/compound/cid/{cids}/property/Title/JSON"
+
+
+def _parse_titles(response: httpx.Response) -> dict[int, str]:
+    """Extracts the names of a property response."""
+
+    # PubChem responds with 404 if none of the CIDs exist
+    if response.status_code == 404:
+        return {}
+    if response.status_code != 200:
+        raise ValueError(
+            f"Failed to retrieve molecule names from PubChem ({response.status_code})"
+        )
+
+    try:
+        properties = response.json()["PropertyTable"]["Properties"]
+        names = {int(entry["CID"]): entry["Title"] for entry in properties}
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(
+            "Unexpected response structure while retrieving molecule names from PubChem"
+        )
+
+    return names
+
@@ -0,0 +1,304 @@
+"""Indexed local registry of fitted calibration Standards"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from calipytion.ioutils.cache import get_cache_dir
+from calipytion.model import CalibrationModel, Standard
+from calipytion.tools.fitted_model import FittedModel
+
+LOGGER = logging.getLogger(__name__)
+
+INDEXED_FIELDS = (
+    "molecule_id",
+    "pubchem_cid",
+    "wavelength",
+    "ph",
+    "temperature",
+    "retention_time",
+)
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS standards ("
+    "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+    "molecule_id TEXT NOT NULL, "
+    "pubchem_cid INTEGER NOT NULL, "
+    "wavelength REAL, "
+    "ph REAL NOT NULL, "
+    "temperature REAL NOT NULL, "
+    "retention_time REAL, "
+    "added_at REAL NOT NULL, "
+    "result TEXT NOT NULL, "
+    "standard TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS standards_molecule "
+    "ON standards (molecule_id, wavelength, ph, temperature)",
+    "CREATE INDEX IF NOT EXISTS standards_cid "
+    "ON standards (pubchem_cid, wavelength, ph, temperature)",
+)
+
+
+class CalibrationRegistry:
+    """Local registry of fitted Standards, indexed by their measurement conditions.
+
+    Standards are stored in a sqlite database with an index over the molecule id,
+    PubChem CID, wavelength, pH, temperature and retention time. If several
+    Standards match a query, the most recently added one is the current Standard.
+    Fitted models are compiled once and kept in an in-process LRU, so repeated
+    conversions with the same Standard skip parsing and compilation.
+
+    Args:
+        path (str | Path | None, optional): Path of the database file. Defaults to
+            `registry.sqlite` in the CaliPytion cache directory.
+        maxsize (int, optional): Number of fitted models held in memory. Defaults to 128.
+    """
+
+    def __init__(self, path: str | Path | None = None, maxsize: int = 128):
+        if path is None:
+            path = get_cache_dir() / "registry.sqlite"
+
+        self.path = Path(path).expanduser()
+        self.maxsize = maxsize
+        self._models: OrderedDict[int, FittedModel] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(
+            self.path, timeout=10, check_same_thread=False
+        )
+        with self._connection:
+            for statement in _SCHEMA:
+                self._connection.execute(statement)
+
+    def __enter__(self) -> CalibrationRegistry:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            row = self._connection.execute("SELECT COUNT(*) FROM standards").fetchone()
+
+        return row[0]
+
+    def close(self) -> None:
+        """Closes the database connection."""
+
+        with self._lock:
+            self._connection.close()
+
+    def add(self, standard: Standard) -> int:
+        """Adds a fitted Standard to the registry.
+
+        Args:
+            standard (Standard): The Standard with a fitted calibration model as result.
+
+        Raises:
+            ValueError: If the Standard has no fitted calibration model.
+
+        Returns:
+            int: The id of the Standard in the registry.
+        """
+
+        if standard.result is None or not standard.result.was_fitted:
+            raise ValueError(
+                f"Standard of '{standard.molecule_id}' has no fitted calibration model."
+            )
+
+        # compile up front to reject models which cannot be used for conversions
+        fitted_model = FittedModel.from_calibration_model(standard.result)
+
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                "INSERT INTO standards (molecule_id, pubchem_cid, wavelength, ph, "
+                "temperature, retention_time, added_at, result, standard) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    *(getattr(standard, name) for name in INDEXED_FIELDS),
+                    time.time(),
+                    standard.result.model_dump_json(),
+                    standard.model_dump_json(),
+                ),
+            )
+            standard_id = cursor.lastrowid
+            self._remember(standard_id, fitted_model)  # type: ignore
+
+        LOGGER.info(f"Registered standard of '{standard.molecule_id}' as {standard_id}.")
+
+        return standard_id  # type: ignore
+
+    def remove(self, standard_id: int) -> None:
+        """Removes a Standard from the registry.
+
+        Args:
+            standard_id (int): The id of the Standard in the registry.
+        """
+
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM standards WHERE id = ?", (standard_id,)
+            )
+            self._models.pop(standard_id, None)
+
+    def find(
+        self,
+        molecule_id: str | None = None,
+        pubchem_cid: int | None = None,
+        wavelength: float | None = None,
+        ph: float | None = None,
+        temperature: float | None = None,
+        retention_time: float | None = None,
+        tolerance: float = 1e-6,
+    ) -> list[int]:
+        """Finds the Standards measured under the given conditions.
+
+        Conditions which are None are not used for filtering. Numeric conditions
+        match within the absolute tolerance.
+
+        Args:
+            molecule_id (str | None, optional): The molecule id. Defaults to None.
+            pubchem_cid (int | None, optional): The PubChem CID. Defaults to None.
+            wavelength (float | None, optional): The wavelength. Defaults to None.
+            ph (float | None, optional): The pH. Defaults to None.
+            temperature (float | None, optional): The temperature. Defaults to None.
+            retention_time (float | None, optional): The retention time. Defaults to None.
+            tolerance (float, optional): Absolute tolerance of numeric conditions.
+                Defaults to 1e-6.
+
+        Returns:
+            list[int]: Ids of the matching Standards, most recently added first.
+        """
+
+        clauses = []
+        values: list[str | float] = []
+        for name, value in (
+            ("molecule_id", molecule_id),
+            ("pubchem_cid", pubchem_cid),
+        ):
+            if value is not None:
+                clauses.append(f"{name} = ?")
+                values.append(value)
+
+        for name, value in (
+            ("wavelength", wavelength),
+            ("ph", ph),
+            ("temperature", temperature),
+            ("retention_time", retention_time),
+        ):
+            if value is not None:
+                clauses.append(f"{name} BETWEEN ? AND ?")
+                values.extend((value - tolerance, value + tolerance))
+
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT id FROM standards {where}ORDER BY added_at DESC, id DESC",
+                values,
+            ).fetchall()
+
+        return [row[0] for row in rows]
+
+    def get_standard(self, standard_id: int) -> Standard:
+        """Returns a registered Standard including its samples.
+
+        Args:
+            standard_id (int): The id of the Standard in the registry.
+
+        Raises:
+            ValueError: If no Standard with the id is registered.
+
+        Returns:
+            Standard: The Standard object.
+        """
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT standard FROM standards WHERE id = ?", (standard_id,)
+            ).fetchone()
+
+        if row is None:
+            raise ValueError(f"No standard with id {standard_id} in the registry.")
+
+        return Standard(**json.loads(row[0]))
+
+    def get_model(self, standard_id: int | None = None, **conditions) -> FittedModel:
+        """Returns the compiled fitted model of a registered Standard.
+
+        Args:
+            standard_id (int | None, optional): The id of the Standard. Defaults to the
+                current Standard matching the conditions.
+            **conditions: Conditions passed to `find`, if no id is given.
+
+        Raises:
+            ValueError: If no Standard matches.
+
+        Returns:
+            FittedModel: The fitted model of the Standard.
+        """
+
+        if standard_id is None:
+            matches = self.find(**conditions)
+            if not matches:
+                raise ValueError(f"No standard in the registry matches {conditions}.")
+            standard_id = matches[0]
+
+        with self._lock:
+            fitted_model = self._models.get(standard_id)
+            if fitted_model is not None:
+                self._models.move_to_end(standard_id)
+                return fitted_model
+
+            row = self._connection.execute(
+                "SELECT result FROM standards WHERE id = ?", (standard_id,)
+            ).fetchone()
+
+        if row is None:
+            raise ValueError(f"No standard with id {standard_id} in the registry.")
+
+        fitted_model = FittedModel.from_calibration_model(
+            CalibrationModel(**json.loads(row[0]))
+        )
+
+        with self._lock:
+            self._remember(standard_id, fitted_model)
+
+        return fitted_model
+
+    def convert(
+        self,
+        signals: ArrayLike,
+        extrapolate: bool = False,
+        **conditions,
+    ) -> np.ndarray:
+        """Converts signals with the current Standard matching the conditions.
+
+        Args:
+            signals (ArrayLike): The signals to convert.
+            extrapolate (bool, optional): Whether to extrapolate the concentration
+                outside the calibration range. Defaults to False.
+            **conditions: Conditions passed to `find`, e.g. `molecule_id` and `wavelength`.
+
+        Raises:
+            ValueError: If no Standard matches.
+
+        Returns:
+            np.ndarray: The calculated concentrations.
+        """
+
+        return self.get_model(**conditions).convert(signals, extrapolate=extrapolate)
+
+    def _remember(self, standard_id: int, fitted_model: FittedModel) -> None:
+        self._models[standard_id] = fitted_model
+        self._models.move_to_end(standard_id)
+        while len(self._models) > self.maxsize:
+            self._models.popitem(last=False)
@@ -1,6 +1,8 @@
 import httpx
 import numpy as np
 
+from calipytion.tools.pubchem import PubChemCache, get_pubchem_cache
+
 
 def calculate_rmsd(residuals: np.ndarray) -> float:
     """Calculates root mean square deviation between measurements and fitted model."""
@@ -8,8 +10,47 @@ def calculate_rmsd(residuals: np.ndarray) -> float:
     return float(np.sqrt(sum(residuals**2) / len(residuals)))
 
 
-def pubchem_request_molecule_name(pubchem_cid: int) -> str:
-    """Retrieves molecule name from PubChem database based on CID."""
+def pubchem_request_molecule_name(
+    pubchem_cid: int, cache: PubChemCache | None = None
+) -> str:
+    """Retrieves molecule name from PubChem database based on CID.
+
+    The local cache is consulted before the network and updated with fetched names.
+    In offline mode, only cached names are returned.
+
+    Args:
+        pubchem_cid (int): PubChem Compound Identifier.
+        cache (PubChemCache | None, optional): The cache to use. Defaults to the cache
+            returned by `get_pubchem_cache`.
+
+    Raises:
+        ValueError: If the name is not cached in offline mode or cannot be retrieved.
+
+    Returns:
+        str: The molecule name.
+    """
+
+    if cache is None:
+        cache = get_pubchem_cache()
+
+    molecule_name = cache.get(pubchem_cid)
+    if molecule_name is not None:
+        return molecule_name
+
+    if cache.offline:
+        raise ValueError(
+            f"Molecule name of PubChem CID {pubchem_cid} is not cached and cannot be "
+            "retrieved in offline mode. Provide 'molecule_name' explicitly."
+        )
+
+    molecule_name = _fetch_molecule_name(pubchem_cid)
+    cache.set(pubchem_cid, molecule_name)
+
+    return molecule_name
+
+
+def _fetch_molecule_name(pubchem_cid: int) -> str:
+    """Requests the molecule name of a CID from PubChem."""
 
     url = f"https://pubchem.ncbi.nlm.nih.gov/rest/pug/compound/cid/{pubchem_cid}/property/Title/JSON"
     response = httpx.get(url)
@@ -1 +1,2 @@
 from .predefined import *  # noqa: F403
+from .conversion import conversion_factor
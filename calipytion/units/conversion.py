@@ -0,0 +1,118 @@
+from functools import lru_cache
+from typing import Any
+
+UnitKey = tuple[tuple[str, int, float, float], ...]
+
+# Kinds which are expressed through another kind and a power of ten
+DERIVED_KINDS = {
+    "kilogram": ("gram", 3),
+}
+
+# Kinds without a dimension
+DIMENSIONLESS_KINDS = {"dimensionless"}
+
+# Kinds with an offset-based scale which cannot be converted by a factor
+OFFSET_KINDS = {"celsius"}
+
+
+def conversion_factor(from_unit: Any, to_unit: Any) -> float:
+    """Calculates the factor to convert values from one unit into another.
+
+    Works for any unit definition consisting of base units with a `kind`, `exponent`,
+    `multiplier` and `scale`, such as the `UnitDefinition` of CaliPytion or of an
+    EnzymeML document. Following the convention of `calipytion.units`, a scale of `1`
+    denotes an unprefixed base unit. Factors are cached per pair of units.
+
+    Args:
+        from_unit (UnitDefinition): The unit of the values.
+        to_unit (UnitDefinition): The unit into which the values should be converted.
+
+    Raises:
+        ValueError: If the units have different dimensions.
+
+    Returns:
+        float: The factor by which values need to be multiplied.
+    """
+
+    return _conversion_factor(unit_key(from_unit), unit_key(to_unit))
+
+
+def unit_key(unit: Any) -> UnitKey:
+    """Creates a hashable representation of a unit definition.
+
+    Args:
+        unit (UnitDefinition): The unit definition.
+
+    Raises:
+        ValueError: If the unit is not defined or has no base units.
+
+    Returns:
+        UnitKey: Tuple of kind, exponent, multiplier and scale of each base unit.
+    """
+
+    if unit is None or not unit.base_units:
+        raise ValueError(f"Unit '{unit}' has no base units and cannot be converted.")
+
+    return tuple(
+        sorted(
+            (
+                str(getattr(base.kind, "value", base.kind)),
+                int(base.exponent),
+                float(base.multiplier) if base.multiplier is not None else 1.0,
+                _effective_scale(base.scale),
+            )
+            for base in unit.base_units
+        )
+    )
+
+
+@lru_cache(maxsize=256)
+def _conversion_factor(from_key: UnitKey, to_key: UnitKey) -> float:
+    if from_key == to_key:
+        return 1.0
+
+    from_magnitude, from_dimension = _decompose(from_key)
+    to_magnitude, to_dimension = _decompose(to_key)
+
+    if from_dimension != to_dimension:
+        raise ValueError(
+            f"Cannot convert between units of different dimensions "
+            f"{dict(from_dimension)} and {dict(to_dimension)}."
+        )
+
+    return from_magnitude / to_magnitude
+
+
+def _decompose(key: UnitKey) -> tuple[float, tuple[tuple[str, int], ...]]:
+    """Splits a unit into its magnitude relative to the unprefixed base units and
+    its dimension."""
+
+    magnitude = 1.0
+    dimension: dict[str, int] = {}
+    for kind, exponent, multiplier, scale in key:
+        if kind in OFFSET_KINDS:
+            raise ValueError(f"Units of kind '{kind}' cannot be converted by a factor.")
+
+        if kind in DERIVED_KINDS:
+            kind, kind_scale = DERIVED_KINDS[kind]
+            scale += kind_scale
+
+        magnitude *= (multiplier * 10**scale) ** exponent
+
+        if kind in DIMENSIONLESS_KINDS:
+            continue
+        dimension[kind] = dimension.get(kind, 0) + exponent
+
+    return magnitude, tuple(
+        sorted((kind, exponent) for kind, exponent in dimension.items() if exponent)
+    )
+
+
+def _effective_scale(scale: float | None) -> float:
+    """Returns the power of ten of a base unit, where `None` and `1` denote an
+    unprefixed unit."""
+
+    if scale is None or scale == 1:
+        return 0.0
+
+    return float(scale)
@@ -0,0 +1,67 @@
+import subprocess
+import sys
+
+import pytest
+
+from calipytion.ioutils import animlio
+
+SPEC = """# Minimal AnIML
+
+### Sample
+
+- name
+  - Type: string
+"""
+
+
+@pytest.fixture
+def spec_env(tmp_path, monkeypatch):
+    spec_path = tmp_path / "animl.md"
+    spec_path.write_text(SPEC)
+    monkeypatch.setenv(animlio.ANIML_SPEC_ENV, str(spec_path))
+    monkeypatch.setenv("CALIPYTION_CACHE_DIR", str(tmp_path / "cache"))
+
+    animlio.get_animl_lib.cache_clear()
+    yield spec_path
+    animlio.get_animl_lib.cache_clear()
+
+
+def test_import_does_not_load_animl_lib():
+    code = (
+        "import calipytion.tools.calibrator\n"
+        "from calipytion.ioutils.animlio import get_animl_lib\n"
+        "assert get_animl_lib.cache_info().currsize == 0\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert "GitHub" not in result.stdout
+
+
+def test_get_animl_lib_from_local_spec(spec_env):
+    lib = animlio.get_animl_lib()
+
+    assert lib.Sample(name="test").name == "test"
+    assert animlio.get_animl_lib() is lib
+
+
+def test_encode_decode_values():
+    import numpy as np
+
+    values = np.array([0.0, 0.25, 1e-9, 3.5e6])
+    encoded = animlio.encode_values(values)
+
+    assert isinstance(encoded, str)
+    np.testing.assert_array_equal(animlio.decode_values(encoded), values)
+
+
+def test_id_allocator():
+    ids = animlio._IdAllocator()
+
+    assert [ids.next("step"), ids.next("series"), ids.next("step")] == [
+        "step0000",
+        "series0000",
+        "step0001",
+    ]
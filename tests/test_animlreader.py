@@ -0,0 +1,306 @@
+import numpy as np
+import pytest
+
+from calipytion.ioutils.animlio import encode_values
+from calipytion.tools.calibrator import Calibrator
+from calipytion.units import C, mM
+
+HEADER = """<?xml version="1.0" encoding="UTF-8"?>
+<AnIML xmlns="urn:org:astm:animl:schema:core:draft:0.90">
+  <SampleSet>
+    <Sample name="Test Sample" sampleID="sample0000">
+      <Category name="Description">
+        <Parameter name="Descriptive Name" parameterType="string"><S>s1</S></Parameter>
+        <Parameter name="Temperature" parameterType="float">
+          <F>25.0</F><Unit label="Celsius"/>
+        </Parameter>
+        <Parameter name="pH" parameterType="float">
+          <F>7.4</F><Unit label="quantity of dimension one"/>
+        </Parameter>
+      </Category>
+    </Sample>
+  </SampleSet>
+  <ExperimentStepSet>
+"""
+
+SAMPLE_STEP = """
+    <ExperimentStep name="Standard" experimentStepID="step{idx:04d}">
+      <Result name="Spectrum">
+        <SeriesSet name="Spectrum" length="1">
+          <Series name="Concentration" dependency="independent" seriesID="a">
+            <IndividualValueSet><F>{conc}</F></IndividualValueSet>
+            <Unit label="mmol / l"/>
+          </Series>
+          <Series name="Wavelength" dependency="independent" seriesID="b">
+            <IndividualValueSet><F>420.0</F></IndividualValueSet>
+            <Unit label="nm"/>
+          </Series>
+          <Series name="Intensity" dependency="dependent" seriesID="c">
+            <IndividualValueSet><F>{signal}</F></IndividualValueSet>
+            <Unit label="AU" quantity="intensity"/>
+          </Series>
+        </SeriesSet>
+        <Category name="Measurement Description">
+          <Parameter name="Experiment Duration" parameterType="integer"><I>0</I></Parameter>
+        </Category>
+      </Result>
+      <Method name="Common Method">
+        <Category name="Instrument Settings">
+          <Parameter name="Measurment Type" parameterType="string"><S>Single</S></Parameter>
+        </Category>
+      </Method>
+    </ExperimentStep>
+"""
+
+COMPACT_STEP = """
+    <ExperimentStep name="Standard" experimentStepID="step0000">
+      <Result name="Spectrum">
+        <SeriesSet name="Spectrum" length="{length}">
+          <Series name="Concentration" dependency="independent" seriesID="a">
+            <EncodedValueSet>{concs}</EncodedValueSet>
+            <Unit label="mmol / l"/>
+          </Series>
+          <Series name="Wavelength" dependency="independent" seriesID="b">
+            <AutoIncrementedValueSet>
+              <StartValue><F>420.0</F></StartValue>
+              <Increment><F>0.0</F></Increment>
+            </AutoIncrementedValueSet>
+            <Unit label="nm"/>
+          </Series>
+          <Series name="Intensity" dependency="dependent" seriesID="c">
+            <EncodedValueSet>{signals}</EncodedValueSet>
+            <Unit label="AU" quantity="intensity"/>
+          </Series>
+        </SeriesSet>
+      </Result>
+    </ExperimentStep>
+"""
+
+MODEL_STEP = """
+    <ExperimentStep name="Calibration Model" experimentStepID="step9999">
+      <Result name="Calibration Model">
+        <Category name="linear">
+          <Parameter name="Model Equation" parameterType="string"><S>a * s1</S></Parameter>
+          <Category name="Model Parameters">
+            <Parameter name="a" parameterType="float"><F>2.0</F></Parameter>
+            <Parameter name="Initial value" parameterType="float"><F>1.0</F></Parameter>
+            <Parameter name="Standard error" parameterType="float"><F>0.01</F></Parameter>
+            <Parameter name="Lower bound" parameterType="float"><F>-1e6</F></Parameter>
+            <Parameter name="Upper bound" parameterType="float"><F>1e6</F></Parameter>
+          </Category>
+          <Category name="Calibration Range">
+            <Parameter name="Concentration lower bound" parameterType="float"><F>0.0</F></Parameter>
+            <Parameter name="Concentration upper bound" parameterType="float"><F>4.0</F></Parameter>
+            <Parameter name="Intensity lower bound" parameterType="float"><F>0.0</F></Parameter>
+            <Parameter name="Intensity upper bound" parameterType="float"><F>8.0</F></Parameter>
+          </Category>
+          <Category name="Fit statistics">
+            <Parameter name="Akaike information criterion (aic)" parameterType="float"><F>-10.0</F></Parameter>
+            <Parameter name="Bayesian information criterion (bic)" parameterType="float"><F>-9.0</F></Parameter>
+            <Parameter name="Coefficient of determination (r^2)" parameterType="float"><F>0.99</F></Parameter>
+            <Parameter name="Root mean square deviation (RMSD)" parameterType="float"><F>0.1</F></Parameter>
+          </Category>
+        </Category>
+      </Result>
+    </ExperimentStep>
+"""
+
+FOOTER = """
+  </ExperimentStepSet>
+</AnIML>
+"""
+
+CONCS = [0.0, 1.0, 2.0, 3.0, 4.0]
+SIGNALS = [0.0, 2.1, 3.9, 6.0, 8.0]
+
+
+@pytest.fixture
+def animl_spec(monkeypatch):
+    # build the AnIML data model from the test fixture instead of GitHub
+    from calipytion.ioutils import animlio
+
+    monkeypatch.setenv(animlio.ANIML_SPEC_ENV, "tests/test_data/animl_spec.md")
+    animlio.get_animl_lib.cache_clear()
+    yield
+    animlio.get_animl_lib.cache_clear()
+
+
+def fitted_calibrator(molecule_id: str = "s1", scale: float = 1.0) -> Calibrator:
+    calibrator = Calibrator(
+        molecule_id=molecule_id,
+        pubchem_cid=887,
+        molecule_name="X",
+        concentrations=CONCS,
+        signals=[scale * signal for signal in SIGNALS],
+        conc_unit=mM,
+        wavelength=420.0,
+    )
+    calibrator.fit_models(silent=True)
+    calibrator.create_standard(
+        model=calibrator.get_model("linear"),
+        ph=7.4,
+        temperature=25.0,
+        temp_unit=C,
+    )
+
+    return calibrator
+
+
+def test_from_animl(tmp_path):
+    path = tmp_path / "standard.animl"
+    steps = "".join(
+        SAMPLE_STEP.format(idx=idx, conc=conc, signal=signal)
+        for idx, (conc, signal) in enumerate(zip(CONCS, SIGNALS))
+    )
+    path.write_text(HEADER + steps + MODEL_STEP + FOOTER)
+
+    calibrator = Calibrator.from_animl(str(path), pubchem_cid=887, molecule_name="X")
+
+    assert calibrator.molecule_id == "s1"
+    assert calibrator.concentrations == CONCS
+    assert calibrator.signals == SIGNALS
+    assert calibrator.conc_unit.name == "mmol / l"
+    assert calibrator.standard.temperature == 25.0
+    assert calibrator.standard.temp_unit.name == "Celsius"
+    assert calibrator.standard.ph == 7.4
+    assert calibrator.standard.wavelength == 420.0
+
+    model = calibrator.standard.result
+    assert model.name == "linear"
+    assert model.signal_law == "a * s1"
+    assert model.parameters[0].symbol == "a"
+    assert model.parameters[0].value == 2.0
+    assert model.parameters[0].upper_bound == 1e6
+    assert model.calibration_range.conc_upper == 4.0
+    assert model.statistics.r2 == 0.99
+
+    assert calibrator.calculate_concentrations(model, [4.0]) == pytest.approx([2.0])
+
+
+def test_from_animl_compact(tmp_path):
+    path = tmp_path / "standard.animl"
+    step = COMPACT_STEP.format(
+        length=len(CONCS),
+        concs=encode_values(np.array(CONCS)),
+        signals=encode_values(np.array(SIGNALS)),
+    )
+    path.write_text(HEADER + step + FOOTER)
+
+    calibrator = Calibrator.from_animl(str(path), pubchem_cid=887, molecule_name="X")
+
+    assert calibrator.concentrations == CONCS
+    assert calibrator.signals == SIGNALS
+    assert calibrator.standard.wavelength == 420.0
+    assert calibrator.standard.result is None
+
+
+def test_from_animl_unknown_unit(tmp_path):
+    path = tmp_path / "standard.animl"
+    step = SAMPLE_STEP.format(idx=0, conc=1.0, signal=1.0).replace(
+        "mmol / l", "furlong"
+    )
+    path.write_text(HEADER + step + FOOTER)
+
+    with pytest.raises(ValueError):
+        Calibrator.from_animl(str(path), pubchem_cid=887, molecule_name="X")
+
+
+def test_from_animl_units_are_copies(tmp_path):
+    path = tmp_path / "standard.animl"
+    step = SAMPLE_STEP.format(idx=0, conc=1.0, signal=1.0)
+    path.write_text(HEADER + step + FOOTER)
+
+    first = Calibrator.from_animl(str(path), pubchem_cid=887, molecule_name="X")
+    second = Calibrator.from_animl(str(path), pubchem_cid=887, molecule_name="X")
+    first.conc_unit.name = "changed"
+    first.standard.temp_unit.name = "changed"
+
+    assert second.conc_unit.name == "mmol / l"
+    assert second.standard.temp_unit.name == "Celsius"
+    assert mM.name == "mmol / l"
+    assert C.name == "Celsius"
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_export_to_animl_round_trip(animl_spec, tmp_path, compact):
+    calibrator = fitted_calibrator()
+
+    document = calibrator.export_to_animl(silent=True, compact=compact)
+    path = tmp_path / "standard.animl"
+    path.write_bytes(document.xml(encoding="bytes"))
+
+    restored = Calibrator.from_animl(str(path), pubchem_cid=887, molecule_name="X")
+
+    assert restored.concentrations == CONCS
+    assert restored.signals == SIGNALS
+    assert restored.conc_unit.name == "mmol / l"
+    assert restored.standard.wavelength == 420.0
+    assert restored.standard.result.signal_law == calibrator.standard.result.signal_law
+    assert restored.calculate_concentrations("linear", [4.0]) == pytest.approx(
+        calibrator.calculate_concentrations("linear", [4.0])
+    )
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_export_calibrators_round_trip(animl_spec, tmp_path, compact):
+    from calipytion.ioutils.animlio import export_calibrators_to_animl
+    from calipytion.ioutils.animlreader import read_animl_standards
+
+    calibrators = [fitted_calibrator("s1"), fitted_calibrator("s2", scale=2.0)]
+    path = tmp_path / "standards.animl"
+    export_calibrators_to_animl(calibrators, str(path), compact=compact, silent=True)
+
+    standards = read_animl_standards(
+        path, pubchem_cids={"s1": 887, "s2": 888}, molecule_names={"s1": "X", "s2": "Y"}
+    )
+
+    assert [standard.molecule_id for standard in standards] == ["s1", "s2"]
+    assert [standard.pubchem_cid for standard in standards] == [887, 888]
+    for standard, calibrator in zip(standards, calibrators):
+        assert [sample.concentration for sample in standard.samples] == CONCS
+        assert [sample.signal for sample in standard.samples] == calibrator.signals
+        assert standard.result.molecule_id == calibrator.molecule_id
+        assert standard.result.parameters[0].value == pytest.approx(
+            calibrator.standard.result.parameters[0].value
+        )
+
+    restored = Calibrator.from_animl(
+        str(path), pubchem_cid=888, molecule_name="Y", molecule_id="s2"
+    )
+    assert restored.signals == calibrators[1].signals
+
+    with pytest.raises(ValueError):
+        Calibrator.from_animl(str(path), pubchem_cid=887, molecule_name="X")
+
+
+def test_from_animl_ambiguous_samples(tmp_path):
+    path = tmp_path / "standards.animl"
+    second_sample = HEADER[HEADER.index("    <Sample ") : HEADER.index("  </SampleSet>")]
+    header = HEADER.replace(
+        "  </SampleSet>",
+        second_sample.replace("sample0000", "sample0001").replace("s1", "s2")
+        + "  </SampleSet>",
+    )
+    step = SAMPLE_STEP.format(idx=0, conc=1.0, signal=1.0)
+    path.write_text(header + step + FOOTER)
+
+    with pytest.raises(ValueError):
+        Calibrator.from_animl(str(path), pubchem_cid=887, molecule_name="X")
+
+
+def test_export_calibrators_wavelength(animl_spec, tmp_path):
+    from calipytion.ioutils.animlio import export_calibrators_to_animl
+    from calipytion.ioutils.animlreader import read_animl_standard
+
+    calibrator = fitted_calibrator()
+    calibrator.standard.wavelength = None
+
+    with pytest.raises(ValueError, match="'s1'"):
+        export_calibrators_to_animl([calibrator], silent=True)
+
+    path = tmp_path / "standards.animl"
+    export_calibrators_to_animl(
+        [calibrator], str(path), wavelength_nm=340.0, silent=True
+    )
+
+    assert calibrator.standard.wavelength is None
+    assert read_animl_standard(path, 887, "X").wavelength == 340.0
@@ -0,0 +1,253 @@
+import copy
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pyenzyme as pe
+import pytest
+from pytest import approx
+
+from calipytion import Calibrator
+from calipytion.tools.enzymeml import apply_calibrators, stream_apply_calibrators
+from calipytion.units import celsius, mM, second, uM
+
+cal_data = {
+    "molecule_id": "s0",
+    "molecule_name": "NADH",
+    "pubchem_cid": 5893,
+    "signals": [0, 1, 2, 3, 4],
+    "concentrations": [0, 10, 20, 30, 40],
+    "conc_unit": mM,
+}
+
+standard_params = {
+    "ph": 3,
+    "temperature": 25,
+    "temp_unit": celsius,
+}
+
+
+def species_data(species_id: str, data: list[float], data_type: str) -> dict:
+    return {
+        "species_id": species_id,
+        "initial": data[0] if data else 0.0,
+        "data": data,
+        "time": [float(idx) for idx in range(len(data))],
+        "data_unit": mM.model_dump(mode="json"),
+        "time_unit": second.model_dump(mode="json"),
+        "data_type": data_type,
+    }
+
+
+def enzymeml_data() -> dict:
+    # two measurements of ABTS (s0) with an unmeasured product (p1)
+    return {
+        "name": "test",
+        "small_molecules": [
+            {
+                "id": "s0",
+                "name": "ABTS",
+                "constant": False,
+                "ld_id": "enzml:SmallMolecule/8be36737",
+            }
+        ],
+        "measurements": [
+            {
+                "id": f"m{idx + 1}",
+                "name": "ABTS oxidation",
+                "species_data": [
+                    species_data("s0", signals, "absorbance"),
+                    species_data("p1", [], "concentration"),
+                ],
+            }
+            for idx, signals in enumerate([[3.0, 2.0, 1.0, 0.0], [4.0, 3.0, 2.0, 1.0]])
+        ],
+    }
+
+
+def enzymeml_document() -> pe.EnzymeMLDocument:
+    return pe.EnzymeMLDocument(**enzymeml_data())
+
+
+def write_enzymeml(path, data: dict) -> str:
+    with open(path, "w") as f:
+        json.dump(data, f)
+    return str(path)
+
+
+def document_with_second_species() -> pe.EnzymeMLDocument:
+    data = enzymeml_data()
+
+    molecule = copy.deepcopy(data["small_molecules"][0])
+    molecule.update(id="s2", name="NAD", ld_id="enzml:SmallMolecule/s2")
+    data["small_molecules"].append(molecule)
+
+    for measurement in data["measurements"]:
+        signals = measurement["species_data"][0]["data"]
+        measurement["species_data"].append(
+            species_data("s2", [2 * signal for signal in signals], "absorbance")
+        )
+
+    return pe.EnzymeMLDocument(**data)
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    def __init__(self):
+        super().__init__(max_workers=2)
+        self.chunks = 0
+
+    def submit(self, fn, /, *args, **kwargs):
+        self.chunks += 1
+        return super().submit(fn, *args, **kwargs)
+
+
+def fitted_calibrator(**kwargs) -> Calibrator:
+    calibrator = Calibrator(**{**cal_data, **kwargs})
+    calibrator.fit_models(silent=True)
+    calibrator.create_standard(model=calibrator.models[1], **standard_params)
+    return calibrator
+
+
+def test_apply_calibrators_single_pass():
+    doc = enzymeml_document()
+
+    converted = apply_calibrators([fitted_calibrator()], doc, silent=True)
+
+    assert converted == 2
+    assert doc.measurements[0].species_data[0].data_type == pe.DataTypes.CONCENTRATION
+    assert approx(doc.measurements[0].species_data[0].data, abs=0.1) == [30, 20, 10, 0]
+    assert approx(doc.measurements[1].species_data[0].data[1:], abs=0.1) == [
+        30,
+        20,
+        10,
+    ]
+    assert doc.measurements[0].species_data[1].data == []
+
+
+def test_apply_calibrators_resolves_ld_id_and_id():
+    doc = document_with_second_species()
+
+    # resolved through the ld_id of the standard
+    by_ld_id = fitted_calibrator(molecule_id="abts")
+    by_ld_id.standard.ld_id = doc.small_molecules[0].ld_id
+
+    # resolved through the id of the small molecule
+    by_id = fitted_calibrator(molecule_id="s2", signals=[0, 2, 4, 6, 8])
+
+    converted = apply_calibrators([by_ld_id, by_id], doc, silent=True)
+
+    assert converted == 4
+    for species_id in ["s0", "s2"]:
+        species = next(
+            species
+            for species in doc.measurements[0].species_data
+            if species.species_id == species_id
+        )
+        assert species.data_type == pe.DataTypes.CONCENTRATION
+        assert approx(species.data, abs=0.1) == [30, 20, 10, 0]
+
+
+def test_apply_calibrators_duplicate_species():
+    doc = enzymeml_document()
+
+    by_ld_id = fitted_calibrator(molecule_id="abts")
+    by_ld_id.standard.ld_id = doc.small_molecules[0].ld_id
+    by_id = fitted_calibrator()
+
+    with pytest.raises(ValueError, match="Multiple calibrators were found"):
+        apply_calibrators([by_ld_id, by_id], doc, silent=True)
+
+    assert doc.measurements[0].species_data[0].data == [3.0, 2.0, 1.0, 0.0]
+
+
+def test_apply_calibrators_converts_units():
+    # the calibrator measures in uM, the document records mM
+    doc = enzymeml_document()
+
+    converted = apply_calibrators([fitted_calibrator(conc_unit=uM)], doc, silent=True)
+
+    assert converted == 2
+    assert approx(doc.measurements[0].species_data[0].data, abs=1e-4) == [
+        0.03,
+        0.02,
+        0.01,
+        0,
+    ]
+
+
+def test_apply_calibrators_incompatible_unit():
+    data = enzymeml_data()
+    for measurement in data["measurements"]:
+        measurement["species_data"][0]["data_unit"] = second.model_dump(mode="json")
+    doc = pe.EnzymeMLDocument(**data)
+
+    with pytest.raises(ValueError, match="cannot be converted"):
+        apply_calibrators([fitted_calibrator()], doc, silent=True)
+
+
+def test_apply_to_enzymeml_executor():
+    expected = enzymeml_document()
+    fitted_calibrator().apply_to_enzymeml(expected, silent=True)
+
+    # chunks of three signals span the boundary between the two measurements
+    doc = enzymeml_document()
+    with CountingExecutor() as executor:
+        fitted_calibrator().apply_to_enzymeml(
+            doc, silent=True, executor=executor, chunk_size=3
+        )
+
+    assert executor.chunks == 3
+    for measurement, expected_measurement in zip(
+        doc.measurements, expected.measurements
+    ):
+        species = measurement.species_data[0]
+        assert species.data_type == pe.DataTypes.CONCENTRATION
+        assert species.data == approx(expected_measurement.species_data[0].data)
+
+
+def test_stream_apply_calibrators(tmp_path):
+    source = write_enzymeml(tmp_path / "doc.json", enzymeml_data())
+    target = tmp_path / "converted.json"
+
+    converted = stream_apply_calibrators(
+        fitted_calibrator(), source, str(target), silent=True, chunk_size=64
+    )
+
+    with open(target) as f:
+        doc = pe.EnzymeMLDocument(**json.load(f))
+
+    assert converted == 2
+    assert doc.measurements[0].species_data[0].data_type == pe.DataTypes.CONCENTRATION
+    assert approx(doc.measurements[0].species_data[0].data, abs=0.1) == [30, 20, 10, 0]
+    assert doc.measurements[0].species_data[1].data == []
+
+
+def test_stream_apply_calibrators_writes_null(tmp_path):
+    data = enzymeml_data()
+    data["measurements"][0]["species_data"][0]["data"] = [3.0, 10.0, 1.0, 0.0]
+    source = write_enzymeml(tmp_path / "doc.json", data)
+    target = tmp_path / "converted.json"
+
+    stream_apply_calibrators(fitted_calibrator(), source, str(target), silent=True)
+
+    content = target.read_text()
+    assert "NaN" not in content
+
+    converted = json.loads(content)["measurements"][0]["species_data"][0]["data"]
+    assert converted[1] is None
+    assert approx(converted[::2], abs=0.1) == [30, 10]
+
+
+def test_stream_apply_calibrators_duplicate_species(tmp_path):
+    source = write_enzymeml(tmp_path / "doc.json", enzymeml_data())
+    target = tmp_path / "converted.json"
+
+    by_ld_id = fitted_calibrator(molecule_id="abts")
+    by_ld_id.standard.ld_id = enzymeml_data()["small_molecules"][0]["ld_id"]
+
+    with pytest.raises(ValueError, match="Multiple calibrators were found"):
+        stream_apply_calibrators(
+            [by_ld_id, fitted_calibrator()], source, str(target), silent=True
+        )
+
+    assert not target.exists()
+    assert [file.name for file in tmp_path.iterdir()] == ["doc.json"]
@@ -0,0 +1,55 @@
+import json
+
+import numpy as np
+import pytest
+
+from calipytion.ioutils.archive import CalibrationArchive, write_archive
+from calipytion.model import Standard
+from calipytion.tools.calibrator import Calibrator
+
+STANDARD_PATH = "tests/test_data/abts_standard.json"
+
+
+@pytest.fixture
+def standard() -> Standard:
+    with open(STANDARD_PATH) as f:
+        standard = Standard(**json.load(f))
+
+    calibrator = Calibrator.from_standard(standard)
+    calibrator.fit_models(silent=True)
+    standard.result = calibrator.models[0]
+
+    return standard
+
+
+def test_archive_round_trip(tmp_path, standard):
+    path = tmp_path / "standards.calipy"
+    empty = standard.model_copy(update={"molecule_id": "s0", "samples": []})
+    write_archive([standard, empty, standard], path)
+
+    archive = CalibrationArchive(path)
+
+    assert len(archive) == 3
+    assert archive.molecule_ids == ["s22", "s0", "s22"]
+
+    archived = archive[2]
+    assert isinstance(archived.concentrations, np.memmap)
+    assert archived.concentrations.tolist() == [
+        sample.concentration for sample in standard.samples
+    ]
+    assert archived.signals.tolist() == [sample.signal for sample in standard.samples]
+    assert archived.result.signal_law == standard.result.signal_law
+
+    restored = archive.to_standard(0)
+    assert restored.molecule_id == standard.molecule_id
+    assert len(restored.samples) == len(standard.samples)
+    assert restored.result.parameters[0].value == standard.result.parameters[0].value
+    assert len(archive[1].concentrations) == 0
+
+
+def test_archive_rejects_other_files(tmp_path):
+    path = tmp_path / "standard.json"
+    path.write_bytes(b"{" + b" " * 64 + b"}")
+
+    with pytest.raises(ValueError):
+        CalibrationArchive(path)
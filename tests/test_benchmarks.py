@@ -0,0 +1,39 @@
+import json
+
+from benchmarks.runner import main, run_suite
+
+
+def test_benchmark_suite_reports_results():
+    report = run_suite(
+        names=["calculate_concentrations_array", "from_json_columnar"],
+        max_points=100,
+        repeat=2,
+        progress=False,
+    )
+
+    results = report["results"]
+    assert [(result["name"], result["size"]) for result in results] == [
+        ("calculate_concentrations_array", 10),
+        ("calculate_concentrations_array", 100),
+        ("from_json_columnar", 10),
+        ("from_json_columnar", 100),
+    ]
+    for result in results:
+        assert result["error"] is None
+        assert len(result["times"]) == 2
+        assert result["throughput"] > 0
+
+    # the report is plain JSON
+    json.dumps(report)
+
+
+def test_benchmark_cli_writes_json(tmp_path, monkeypatch):
+    monkeypatch.setenv("CALIPYTION_BENCH_MAX_POINTS", "10")
+    path = tmp_path / "results.json"
+
+    exit_code = main(["fit_models", "--repeat", "1", "--output", str(path)])
+
+    report = json.loads(path.read_text())
+    assert exit_code == 0
+    assert report["caps"]["points"] == 10
+    assert [result["size"] for result in report["results"]] == [10]
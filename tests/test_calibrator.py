@@ -232,3 +232,95 @@ def test_fit_models(calibrator):
 
     assert calibrator.models[0].was_fitted is True
     assert calibrator.models[0].calibration_range is not None
+
+
+def test_calculate_concentrations_array(calibrator):
+    import numpy as np
+
+    calibrator.fit_models(silent=True)
+    expected = calibrator.calculate_concentrations("linear", [0.5, 1.0, 1.5])
+
+    # float32, non-contiguous view
+    signals = np.array([0.5, 9.9, 1.0, 9.9, 1.5], dtype=np.float32)[::2]
+    concs = calibrator.calculate_concentrations_array("linear", signals)
+
+    assert isinstance(concs, np.ndarray)
+    assert concs == pytest.approx(expected, rel=1e-6, nan_ok=True)
+
+    out = np.empty(3)
+    result = calibrator.calculate_concentrations_array("linear", signals, out=out)
+
+    assert result is out
+    assert out == pytest.approx(expected, rel=1e-6, nan_ok=True)
+
+    with pytest.raises(ValueError):
+        calibrator.calculate_concentrations_array("linear", signals, out=np.empty(2))
+
+
+def test_calculate_concentrations_out_of_range(calibrator):
+    import numpy as np
+
+    calibrator.fit_models(silent=True)
+    signals = [-10.0, 1.0, 100.0]
+
+    concs, mask = calibrator.calculate_concentrations_array(
+        "linear", signals, out_of_range="clip", return_mask=True
+    )
+
+    assert mask.tolist() == [True, False, True]
+    calibration_range = calibrator.get_model("linear").calibration_range
+    assert concs[mask].tolist() == [
+        calibration_range.conc_lower,
+        calibration_range.conc_upper,
+    ]
+    assert not np.isnan(concs).any()
+
+
+def test_snapshot_restores_compiled_models(calibrator, tmp_path):
+    from calipytion.tools import fitted_model
+
+    calibrator.fit_models(silent=True)
+    expected = calibrator.calculate_concentrations("quadratic", [0.5, 1.0, 1.5])
+
+    path = tmp_path / "snapshot.json"
+    calibrator.save_snapshot(path)
+
+    fitted_model._build_fitted_model.cache_clear()
+
+    restored = Calibrator.load_snapshot(path)
+    concs = restored.calculate_concentrations("quadratic", [0.5, 1.0, 1.5])
+
+    assert concs == pytest.approx(expected, nan_ok=True)
+    assert restored.concentrations == calibrator.concentrations
+    assert fitted_model._build_fitted_model.cache_info().misses == 0
+
+    with pytest.raises(ValueError):
+        Calibrator.load_snapshot("tests/test_data/abts_standard.json")
+
+
+def test_snapshot_models_are_scoped_to_calibrator(calibrator, tmp_path):
+    calibrator.fit_models(silent=True)
+    expected = calibrator.calculate_concentrations("linear", [1.0, 1.5])
+
+    # a snapshot with altered code must not affect other calibrators
+    path = tmp_path / "snapshot.json"
+    calibrator.save_snapshot(path)
+    data = json.loads(path.read_text())
+    for fitted_model in data["fitted_models"]:
+        fitted_model["signal_code"] = f"2*({fitted_model['signal_code']})"
+    path.write_text(json.dumps(data))
+
+    restored = Calibrator.load_snapshot(path)
+
+    assert restored.calculate_concentrations("linear", [1.0, 1.5]) != pytest.approx(
+        expected
+    )
+    assert calibrator.calculate_concentrations("linear", [1.0, 1.5]) == pytest.approx(
+        expected
+    )
+
+    # fitting the restored calibrator again replaces the restored models
+    restored.fit_models(silent=True)
+    assert restored.calculate_concentrations("linear", [1.0, 1.5]) == pytest.approx(
+        expected
+    )
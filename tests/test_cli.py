@@ -0,0 +1,124 @@
+import json
+import shutil
+
+import pytest
+from pytest import approx
+
+from calipytion import Calibrator
+from calipytion.cli import collect_files, main, output_paths
+from calipytion.units import celsius, mM
+
+cal_data = {
+    "molecule_id": "s0",
+    "molecule_name": "NADH",
+    "pubchem_cid": 5893,
+    "signals": [0, 1, 2, 3, 4],
+    "concentrations": [0, 10, 20, 30, 40],
+    "conc_unit": mM,
+}
+
+
+def test_collect_files(tmp_path):
+    (tmp_path / "b.json").write_text("{}")
+    (tmp_path / "a.json").write_text("{}")
+    (tmp_path / "c.txt").write_text("")
+
+    assert collect_files(str(tmp_path)) == [
+        str(tmp_path / "a.json"),
+        str(tmp_path / "b.json"),
+    ]
+    assert collect_files(str(tmp_path / "*.txt")) == [str(tmp_path / "c.txt")]
+
+
+def fitted_calibrator() -> Calibrator:
+    calibrator = Calibrator(**cal_data)
+    calibrator.fit_models(silent=True)
+    calibrator.create_standard(
+        model=calibrator.models[0], ph=7, temperature=25, temp_unit=celsius
+    )
+    return calibrator
+
+
+def test_output_paths(tmp_path):
+    paths = [
+        str(tmp_path / "a" / "doc.json"),
+        str(tmp_path / "b" / "doc.json"),
+        str(tmp_path / "b" / "c" / "other.json"),
+    ]
+
+    assert output_paths(paths, tmp_path / "out") == [
+        str(tmp_path / "out" / "a" / "doc.json"),
+        str(tmp_path / "out" / "b" / "doc.json"),
+        str(tmp_path / "out" / "b" / "c" / "other.json"),
+    ]
+
+
+def test_convert_command(tmp_path):
+    standards = tmp_path / "standards"
+    documents = tmp_path / "documents"
+    output = tmp_path / "output"
+    standards.mkdir()
+    documents.mkdir()
+
+    standard = fitted_calibrator().standard
+    (standards / "s0.json").write_text(standard.model_dump_json())
+
+    for name in ["doc1.json", "doc2.json"]:
+        shutil.copy("tests/test_data/enzymeml.json", documents / name)
+
+    exit_code = main(
+        ["convert", str(standards), str(documents), "-o", str(output), "-w", "1"]
+    )
+
+    assert exit_code == 0
+    for name in ["doc1.json", "doc2.json"]:
+        with open(output / name) as f:
+            data = json.load(f)
+        assert data["measurements"][0]["species_data"][0]["data"][0] == approx(
+            30, abs=0.1
+        )
+
+
+def test_convert_command_keeps_sources(tmp_path):
+    standards = tmp_path / "standards"
+    documents = tmp_path / "documents"
+    standards.mkdir()
+    (documents / "a").mkdir(parents=True)
+    (documents / "b").mkdir()
+
+    standard = fitted_calibrator().standard
+    (standards / "s0.json").write_text(standard.model_dump_json())
+    for name in ["a", "b"]:
+        shutil.copy("tests/test_data/enzymeml.json", documents / name / "doc.json")
+    original = (documents / "a" / "doc.json").read_text()
+
+    # writing into the input directory would overwrite the documents
+    pattern = str(documents / "**" / "*.json")
+    exit_code = main(["convert", str(standards), pattern, "-o", str(documents)])
+    assert exit_code == 1
+    assert (documents / "a" / "doc.json").read_text() == original
+
+    # documents with the same name in different directories are kept apart
+    output = tmp_path / "output"
+    exit_code = main(["convert", str(standards), pattern, "-o", str(output), "-w", "1"])
+    assert exit_code == 0
+    assert sorted(path.name for path in output.rglob("*")) == [
+        "a",
+        "b",
+        "doc.json",
+        "doc.json",
+    ]
+
+
+def test_stream_apply_calibrators_refuses_source_as_target(tmp_path):
+    from calipytion.tools.enzymeml import stream_apply_calibrators
+
+    path = tmp_path / "doc.json"
+    shutil.copy("tests/test_data/enzymeml.json", path)
+    original = path.read_text()
+
+    with pytest.raises(ValueError):
+        stream_apply_calibrators(fitted_calibrator(), str(path), str(path), silent=True)
+
+    assert path.read_text() == original
+    assert [file.name for file in tmp_path.iterdir()] == ["doc.json"]
@@ -0,0 +1,66 @@
+import json
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from calipytion import Calibrator
+from calipytion.units import mM
+
+
+@pytest.fixture
+def calibrator() -> Calibrator:
+    calibrator = Calibrator(
+        pubchem_cid=887,
+        molecule_id="s1",
+        molecule_name="Methanol",
+        concentrations=[0.2, 0.4, 0.6, 0.8, 1.0],
+        conc_unit=mM,
+        signals=[0.1, 1.1, 2.3, 3.2, 4.6],
+    )
+    calibrator.fit_models(silent=True)
+
+    return calibrator
+
+
+@pytest.mark.parametrize("model_name", ["linear", "quadratic", "cubic"])
+def test_evaluator_matches_fitted_model(calibrator, tmp_path, model_name):
+    path = tmp_path / "evaluator.py"
+    calibrator.export_evaluator(model_name, path)
+
+    signals = np.linspace(-1.0, 5.0, 13)
+    fitted_model = calibrator.fitted_model(model_name)
+
+    for out_of_range in ("nan", "clip"):
+        expected = fitted_model.convert(signals, out_of_range=out_of_range)
+
+        # the evaluator is imported in a fresh interpreter without CaliPytion
+        script = (
+            "import sys, json, numpy\n"
+            f"sys.path.insert(0, {str(tmp_path)!r})\n"
+            "import evaluator\n"
+            f"concs = evaluator.concentration({signals.tolist()!r}, {out_of_range!r})\n"
+            "assert not {'calipytion', 'sympy', 'scipy'} & set(sys.modules)\n"
+            "print(json.dumps(concs.tolist()))\n"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True, check=True
+        ).stdout
+
+        concs = np.array(json.loads(output), dtype=float)
+        np.testing.assert_allclose(concs, expected, rtol=1e-9, atol=1e-12)
+
+
+def test_evaluator_requires_fitted_model(tmp_path):
+    calibrator = Calibrator(
+        pubchem_cid=887,
+        molecule_id="s1",
+        molecule_name="Methanol",
+        concentrations=[0.2, 0.4],
+        conc_unit=mM,
+        signals=[0.1, 1.1],
+    )
+
+    with pytest.raises(ValueError):
+        calibrator.export_evaluator("linear", tmp_path / "evaluator.py")
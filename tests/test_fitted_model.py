@@ -0,0 +1,302 @@
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import FrozenInstanceError
+
+import numpy as np
+import pytest
+
+from calipytion import Calibrator
+from calipytion.tools.fitted_model import FittedModel
+from calipytion.units import mM
+
+cal_data = {
+    "molecule_id": "s1",
+    "molecule_name": "Methanol",
+    "pubchem_cid": 887,
+    "concentrations": [0.0, 1.0, 2.0, 3.0, 4.0],
+    "signals": [0.0, 2.1, 3.9, 6.0, 8.1],
+    "conc_unit": mM,
+}
+
+
+@pytest.fixture
+def calibrator() -> Calibrator:
+    calibrator = Calibrator(**cal_data)
+    calibrator.fit_models(silent=True)
+    return calibrator
+
+
+def test_fitted_model_from_calibration_model(calibrator):
+    fitted_model = calibrator.fitted_model("linear")
+
+    assert isinstance(fitted_model, FittedModel)
+    assert fitted_model.molecule_id == "s1"
+    assert fitted_model.conc_lower == 0.0
+    assert fitted_model.conc_upper == 4.0
+    slope = calibrator.get_model("linear").parameters[0].value
+    assert fitted_model.predict(np.array([1.0, 2.0])) == pytest.approx(
+        [slope, 2 * slope]
+    )
+
+
+def test_convert_matches_calculate_concentrations(calibrator):
+    signals = [1.0, 4.0, 7.5, 100.0]
+
+    fitted_model = calibrator.fitted_model("quadratic")
+    concs = fitted_model.convert(signals)
+
+    assert concs[:3] == pytest.approx(
+        calibrator.calculate_concentrations("quadratic", signals)[:3]
+    )
+    assert np.isnan(concs[3])
+
+
+@pytest.mark.parametrize(
+    "equation", ["a*Abs(x)+b", "a*erf(b*x)", "a*sign(x)*x+b", "a*Max(x, b)"]
+)
+def test_convert_non_differentiable_laws(equation):
+    # laws without a printable derivative or solvable critical points
+    fitted_model = FittedModel.from_equation(
+        equation, "x", {"a": 2.0, "b": 0.5}, conc_lower=0.6, conc_upper=4.0
+    )
+    concs = np.array([0.8, 1.5, 3.0])
+    signals = fitted_model.predict(concs)
+
+    np.testing.assert_allclose(fitted_model.convert(signals), concs, rtol=1e-9)
+    np.testing.assert_allclose(
+        fitted_model.convert(signals, warm_start=True), concs, rtol=1e-9
+    )
+    np.testing.assert_allclose(
+        fitted_model.convert(signals, extrapolate=True), concs, rtol=1e-9
+    )
+
+
+def test_fitted_model_analyzed_on_demand():
+    fitted_model = FittedModel.from_equation(
+        "a*x**2 + x", "x", {"a": 0.5}, conc_lower=0.0, conc_upper=4.0
+    )
+    assert fitted_model.derivative_code is None
+
+    fitted_model.convert([1.0, 2.0])
+    assert fitted_model.derivative_code is None
+
+    fitted_model.convert([1.0, 2.0], warm_start=True)
+    assert fitted_model.analyze() == ("1.0*conc + 1", ((-1.0, -0.5),))
+
+
+def test_fitted_model_is_immutable(calibrator):
+    fitted_model = calibrator.fitted_model("linear")
+    before = fitted_model.convert([4.0])
+
+    with pytest.raises(FrozenInstanceError):
+        fitted_model.conc_upper = 10  # type: ignore
+
+    # refitting the calibrator does not affect the snapshot
+    calibrator.signals = [signal * 2 for signal in calibrator.signals]
+    calibrator.fit_models(silent=True)
+
+    assert fitted_model.convert([4.0]) == pytest.approx(before)
+    assert calibrator.fitted_model("linear").convert([4.0]) != pytest.approx(before)
+
+
+def test_fitted_model_pickle_and_threads(calibrator):
+    fitted_model = calibrator.fitted_model("quadratic")
+    restored = pickle.loads(pickle.dumps(fitted_model))
+    signals = np.linspace(0.5, 7.5, 40)
+
+    assert restored == fitted_model
+    assert restored.convert(signals) == pytest.approx(fitted_model.convert(signals))
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(fitted_model.convert, [signals] * 8))
+
+    for result in results:
+        assert result == pytest.approx(fitted_model.convert(signals))
+
+
+def test_iter_concentrations(calibrator):
+    chunks = (np.array([1.0, 4.0, 100.0]) for _ in range(3))
+
+    results = list(calibrator.iter_concentrations("linear", chunks))
+
+    assert len(results) == 3
+    assert results[0].out_of_range == 1
+    assert results[-1].total_signals == 9
+    assert results[-1].total_out_of_range == 3
+    assert results[1].concentrations[:2] == pytest.approx(
+        calibrator.fitted_model("linear").convert([1.0, 4.0])
+    )
+
+
+def test_aiter_concentrations(calibrator):
+    import asyncio
+
+    async def signal_stream():
+        for _ in range(2):
+            yield [1.0, 4.0, -50.0]
+
+    async def collect():
+        return [
+            chunk
+            async for chunk in calibrator.aiter_concentrations("linear", signal_stream())
+        ]
+
+    results = asyncio.run(collect())
+
+    assert len(results) == 2
+    assert results[-1].total_signals == 6
+    assert results[-1].total_out_of_range == 2
+
+
+def test_convert_deduplicate(calibrator):
+    fitted_model = calibrator.fitted_model("linear")
+    signals = np.tile([[1.0, 4.0], [100.0, 4.0]], (50, 1))
+
+    concs = fitted_model.convert(signals)
+    out = np.empty(signals.shape)
+    deduplicated = fitted_model.convert(signals, deduplicate=True, out=out)
+
+    assert deduplicated is out
+    assert deduplicated.shape == signals.shape
+    np.testing.assert_array_equal(deduplicated, concs)
+
+
+@pytest.mark.parametrize("dtype", [np.int64, np.bool_, np.complex128, object])
+def test_convert_rejects_non_float_out(calibrator, dtype):
+    fitted_model = calibrator.fitted_model("linear")
+    signals = np.array([1.0, 4.0, 100.0])
+
+    for deduplicate in [False, True]:
+        with pytest.raises(ValueError):
+            fitted_model.convert(
+                signals, out=np.zeros(3, dtype=dtype), deduplicate=deduplicate
+            )
+
+
+def test_convert_deduplicate_stats(calibrator):
+    fitted_model = calibrator.fitted_model("linear")
+    signals = np.tile([[1.0, 4.0], [100.0, 4.0]], (50, 1))
+
+    _, stats = fitted_model.convert(signals, return_stats=True)
+
+    assert stats.total_signals == 200
+    assert stats.solved_signals == 200
+    assert stats.deduplication_ratio == 1.0
+
+    _, mask, stats = fitted_model.convert(
+        signals, deduplicate=True, return_mask=True, return_stats=True
+    )
+
+    assert stats.total_signals == 200
+    assert stats.solved_signals == 3
+    assert stats.deduplication_ratio == pytest.approx(200 / 3)
+    assert stats.out_of_range == int(mask.sum()) == 50
+
+
+def test_convert_out_of_range_policy(calibrator):
+    fitted_model = calibrator.fitted_model("linear")
+    signals = np.array([-50.0, 4.0, 100.0, np.nan])
+
+    concs, mask = fitted_model.convert(signals, return_mask=True)
+
+    assert mask.tolist() == [True, False, True, True]
+    assert np.isnan(concs[mask]).all()
+    assert not np.isnan(concs[1])
+
+    clipped = fitted_model.convert(signals, out_of_range="clip")
+
+    assert clipped[0] == 0.0
+    assert clipped[1] == pytest.approx(concs[1])
+    assert clipped[2] == 4.0
+    assert np.isnan(clipped[3])
+
+    with pytest.raises(ValueError):
+        fitted_model.convert(signals, out_of_range="drop")
+
+
+def test_adaptive_bracket(calibrator):
+    fitted_model = calibrator.fitted_model("linear")
+    signals = np.array([1.0, 4.0, 30.0])
+
+    bracket = fitted_model.bracket(signals, extrapolate=True)
+    concs = fitted_model.convert(signals, extrapolate=True)
+
+    assert fitted_model.conc_upper < max(bracket) < 1e3
+    assert not np.isnan(concs).any()
+    assert fitted_model.predict(concs) == pytest.approx(signals)
+    assert fitted_model.bracket(signals[:2], extrapolate=True) == [
+        fitted_model.conc_lower,
+        fitted_model.conc_upper,
+    ]
+
+
+def test_bracket_stays_on_calibrated_branch():
+    # the critical point of the law lies at x = 15, beyond the calibration range
+    fitted_model = FittedModel.from_equation(
+        "a*x + b*x**2", "x", {"a": 3.0, "b": -0.1}, conc_lower=0.0, conc_upper=4.0
+    )
+    signals = np.array([1.0, 5.0, 10.0])
+
+    assert fitted_model.bracket(signals, extrapolate=True) == [0.0, 4.0]
+    np.testing.assert_allclose(
+        fitted_model.convert(signals, extrapolate=True),
+        [0.337, 1.771, 3.820],
+        atol=1e-3,
+    )
+
+    bracket = fitted_model.bracket(np.array([20.0]), extrapolate=True)
+    assert bracket[0] == 0.0
+    assert 4.0 < bracket[1] <= 15.0
+
+
+def test_convert_warm_start(calibrator):
+    fitted_model = calibrator.fitted_model("quadratic")
+    trace = np.concatenate(
+        [np.linspace(1.0, 7.5, 200), [100.0], np.linspace(7.5, 1.0, 50)]
+    )
+
+    concs = fitted_model.convert(trace)
+    warm = fitted_model.convert(trace, warm_start=True)
+
+    np.testing.assert_allclose(warm, concs, rtol=1e-9)
+    assert np.isnan(warm[200])
+
+
+def test_convert_warm_start_non_monotonic():
+    # two critical points inside the bracket, so a signal of 0 has three roots
+    fitted_model = FittedModel.from_equation(
+        "a * x**3 - 3 * x", "x", {"a": 1.0}, conc_lower=-2.0, conc_upper=2.1
+    )
+    trace = np.array([1.9, 1.0, 0.0, -0.5])
+
+    concs = fitted_model.convert(trace)
+    warm = fitted_model.convert(trace, warm_start=True)
+
+    np.testing.assert_allclose(warm, concs, rtol=1e-9)
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "__import__('os').system('echo unsafe')",
+        "numpy.savetxt('unsafe.txt', conc)",
+        "conc.__class__.__mro__",
+        "[c for c in conc]",
+    ],
+)
+def test_from_dict_rejects_unsafe_code(calibrator, code):
+    data = calibrator.fitted_model("linear").to_dict()
+    data["signal_code"] = code
+
+    with pytest.raises(ValueError):
+        FittedModel.from_dict(data)
+
+
+def test_from_dict_round_trip(calibrator):
+    fitted_model = calibrator.fitted_model("quadratic")
+    restored = FittedModel.from_dict(fitted_model.to_dict())
+
+    assert restored == fitted_model
+    assert restored.predict(np.array([1.0, 2.0])) == pytest.approx(
+        fitted_model.predict(np.array([1.0, 2.0]))
+    )
@@ -1,3 +1,5 @@
+import math
+
 import numpy as np
 import pytest
 from lmfit import Parameters
@@ -109,3 +111,50 @@ def test_extract_fit_statistics(fitter):
     assert stats.bic == 2.0
     assert stats.r2 == 0.9995
     assert stats.rmsd == pytest.approx(rmsd, abs=0.0001)
+
+
+@pytest.mark.parametrize(
+    "equation, signal_fn",
+    [
+        ("a*Abs(x)+b", lambda x: 2 * np.abs(x) + 2),
+        ("a*erf(b*x)", lambda x: 2 * np.vectorize(math.erf)(2 * x)),
+        ("a*sign(x)*x+b", lambda x: 2 * np.sign(x) * x + 2),
+    ],
+)
+def test_calculate_roots_non_differentiable_laws(equation, signal_fn):
+    fitter = Fitter(equation, indep_var, params)
+    for param in fitter.params:
+        param.value = 2.0
+
+    x = np.array([0.2, 0.4, 0.6])
+    roots, _ = fitter.calculate_roots(signal_fn(x), 0.1, 1, extrapolate=False)
+
+    assert roots == pytest.approx(x)
+
+
+def test_calculate_roots_with_executor(fitter):
+    from concurrent.futures import ThreadPoolExecutor
+
+    fitter.fit(np.array([2, 4, 6, 8, 10]), np.array([0, 1, 2, 3, 4]), "x")
+    y = np.linspace(2.5, 9.5, 25)
+
+    serial, _ = fitter.calculate_roots(y, 0, 4, extrapolate=False)
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        parallel, interval = fitter.calculate_roots(
+            y, 0, 4, extrapolate=False, executor=executor, chunk_size=4
+        )
+
+    assert interval == [0, 4]
+    assert parallel == pytest.approx(serial)
+
+
+def test_calculate_roots_deduplicate(fitter):
+    fitter.fit(np.array([2, 4, 6, 8, 10]), np.array([0, 1, 2, 3, 4]), "x")
+    y = np.round(np.linspace(2.5, 9.5, 200), 1)
+
+    roots, _ = fitter.calculate_roots(y, 0, 4, extrapolate=False)
+    deduplicated, _ = fitter.calculate_roots(
+        y, 0, 4, extrapolate=False, deduplicate=True
+    )
+
+    assert deduplicated == pytest.approx(roots)
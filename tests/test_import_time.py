@@ -0,0 +1,71 @@
+import subprocess
+import sys
+
+# Dependencies which are only needed for fitting, plotting, tables, Excel, EnzymeML
+# and AnIML and therefore must not be imported by `import calipytion`
+DEFERRED_MODULES = [
+    "lmfit",
+    "mdmodels",
+    "pandas",
+    "plotly",
+    "pyenzyme",
+    "rich",
+    "scipy",
+    "sympy",
+]
+
+
+def import_times(statement: str) -> dict[str, float]:
+    """Runs the statement in a fresh interpreter with `-X importtime` and returns the
+    cumulative import time in seconds of every imported module."""
+
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        times[module.strip()] = int(cumulative) / 1e6
+
+    return times
+
+
+def test_import_defers_heavy_dependencies():
+    times = import_times("import calipytion")
+
+    imported = {module.split(".")[0] for module in times}
+    assert not imported & set(DEFERRED_MODULES)
+    assert "calipytion" in times
+
+
+def test_restored_calibrator_defers_heavy_dependencies(tmp_path):
+    from calipytion import Calibrator
+    from calipytion.units import mM
+
+    calibrator = Calibrator(
+        molecule_id="s1",
+        pubchem_cid=887,
+        molecule_name="Methanol",
+        concentrations=[0.2, 0.4, 0.6, 0.8, 1.0],
+        signals=[0.1, 1.1, 2.3, 3.2, 4.6],
+        conc_unit=mM,
+    )
+    calibrator.fit_models(silent=True)
+    path = tmp_path / "snapshot.json"
+    calibrator.save_snapshot(path)
+
+    statement = (
+        "from calipytion import Calibrator\n"
+        f"calibrator = Calibrator.load_snapshot({str(path)!r})\n"
+        "calibrator.calculate_concentrations('linear', [1.0, 2.0])\n"
+    )
+    times = import_times(statement)
+
+    imported = {module.split(".")[0] for module in times}
+    assert not imported & set(DEFERRED_MODULES) - {"scipy"}
@@ -0,0 +1,60 @@
+import io
+import json
+
+import pytest
+
+from calipytion.ioutils.jsonstream import JSONStreamReader
+
+document = {
+    "name": "test",
+    "numbers": [1, 22, 333.5, -4e-3],
+    "nested": {"a": [{"b": "c, d: [e]"}], "empty": {}},
+    "measurements": [{"id": "m1", "data": [0.1] * 50}, {"id": "m2", "data": []}],
+    "flag": True,
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64, 1 << 20])
+def test_iter_object_keys_and_values(chunk_size):
+    reader = JSONStreamReader(
+        io.StringIO(json.dumps(document, indent=2)), chunk_size=chunk_size
+    )
+
+    result = {}
+    for key in reader.iter_object_keys():
+        if key == "measurements":
+            result[key] = list(reader.iter_array())
+        else:
+            result[key] = reader.read_value()
+
+    assert result == document
+    assert reader.peek() == ""
+
+
+def test_iter_empty_containers():
+    reader = JSONStreamReader(io.StringIO('{"a": [ ], "b": {}}'), chunk_size=2)
+
+    keys = []
+    for key in reader.iter_object_keys():
+        keys.append(key)
+        if key == "a":
+            assert list(reader.iter_array()) == []
+        else:
+            assert reader.read_value() == {}
+
+    assert keys == ["a", "b"]
+
+
+def test_expect_raises_on_unexpected_character():
+    reader = JSONStreamReader(io.StringIO("[1, 2]"))
+
+    with pytest.raises(ValueError):
+        reader.expect("{")
+
+
+def test_read_value_raises_on_truncated_document():
+    reader = JSONStreamReader(io.StringIO('{"a": [1, 2'), chunk_size=4)
+
+    with pytest.raises(json.JSONDecodeError):
+        for _ in reader.iter_object_keys():
+            reader.read_value()
@@ -2,6 +2,7 @@ import json
 
 import pyenzyme as pe
 from pyenzyme.units import mM, second
+import pytest
 from pytest import approx
 
 from calipytion import Calibrator
@@ -73,3 +74,4 @@ def test_conversion_of_enzymeml_doc_extrapolate():
     ccal.apply_to_enzymeml(doc, extrapolate=True)
 
     assert doc.measurements[1].species_data[0].data[0] == approx(40, abs=0.1)
+
@@ -0,0 +1,225 @@
+import pytest
+
+from calipytion.tools import utility
+from calipytion.tools.pubchem import PubChemCache
+
+
+@pytest.fixture
+def requested(monkeypatch) -> list[int]:
+    requested = []
+
+    def fetch(pubchem_cid):
+        requested.append(pubchem_cid)
+        return "Methanol"
+
+    monkeypatch.setattr(utility, "_fetch_molecule_name", fetch)
+    return requested
+
+
+def test_cache_consulted_before_network(tmp_path, requested):
+    cache = PubChemCache(tmp_path, offline=False)
+
+    assert utility.pubchem_request_molecule_name(887, cache) == "Methanol"
+    assert utility.pubchem_request_molecule_name(887, cache) == "Methanol"
+
+    assert requested == [887]
+    assert cache.stats.misses == 1
+    assert cache.stats.memory_hits == 1
+
+    # persisted across instances
+    reloaded = PubChemCache(tmp_path, offline=False)
+    assert utility.pubchem_request_molecule_name(887, reloaded) == "Methanol"
+    assert requested == [887]
+    assert reloaded.stats.disk_hits == 1
+
+
+def test_cache_ttl(tmp_path, requested):
+    cache = PubChemCache(tmp_path, ttl=0, offline=False)
+    cache.set(887, "Methanol")
+
+    assert cache.get(887) is None
+    assert cache.stats.expired == 1
+
+    utility.pubchem_request_molecule_name(887, cache)
+    assert requested == [887]
+
+    # expired entries are served in offline mode
+    offline = PubChemCache(tmp_path, ttl=0, offline=True)
+    assert offline.get(887) == "Methanol"
+
+
+def test_cache_offline(tmp_path, requested):
+    cache = PubChemCache(tmp_path, offline=True)
+
+    with pytest.raises(ValueError):
+        utility.pubchem_request_molecule_name(887, cache)
+
+    assert requested == []
+
+
+def test_cache_lru(tmp_path):
+    cache = PubChemCache(tmp_path, maxsize=2, offline=False)
+    for cid, name in [(1, "a"), (2, "b"), (3, "c")]:
+        cache.set(cid, name)
+
+    assert list(cache._memory) == [2, 3]
+    assert cache.get(1) == "a"
+    assert cache.stats.disk_hits == 1
+
+    cache.clear()
+    assert cache.get(1) is None
+
+
+def test_cache_set_many(tmp_path):
+    writes = []
+
+    class RecordingCache(PubChemCache):
+        def _write(self, rows):
+            writes.append(rows)
+            super()._write(rows)
+
+    cache = RecordingCache(tmp_path, offline=False)
+    cache.set_many({1: "a", 2: "b", 3: "c"})
+    cache.set_many({})
+
+    assert [[row[:2] for row in rows] for rows in writes] == [
+        [(1, "a"), (2, "b"), (3, "c")]
+    ]
+
+    reloaded = PubChemCache(tmp_path, offline=False)
+    assert [reloaded.get(cid) for cid in [1, 2, 3]] == ["a", "b", "c"]
+    assert reloaded.stats.disk_hits == 3
+
+
+@pytest.fixture
+def pubchem_server():
+    import json
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    titles = {887: "Methanol", 5893: "NADH", 702: "Ethanol"}
+    paths = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            paths.append(self.path)
+            cids = [int(cid) for cid in self.path.split("/")[3].split(",")]
+            properties = [
+                {"CID": cid, "Title": titles[cid]} for cid in cids if cid in titles
+            ]
+            body = json.dumps({"PropertyTable": {"Properties": properties}}).encode()
+            self.send_response(200 if properties else 404)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield f"http://127.0.0.1:{server.server_address[1]}", paths
+
+    server.shutdown()
+    server.server_close()
+
+
+def test_resolve_molecule_names(tmp_path, pubchem_server):
+    from calipytion.tools.pubchem import resolve_molecule_names
+
+    base_url, paths = pubchem_server
+    cache = PubChemCache(tmp_path, offline=False)
+
+    names = resolve_molecule_names(
+        [887, 5893, 887, 702, 1], cache=cache, batch_size=2, base_url=base_url
+    )
+
+    assert names == {887: "Methanol", 5893: "NADH", 702: "Ethanol"}
+    assert paths == [
+        "/compound/cid/887,5893/property/Title/JSON",
+        "/compound/cid/702,1/property/Title/JSON",
+    ]
+
+    # served from the cache
+    resolve_molecule_names([887, 702], cache=cache, base_url=base_url)
+    assert len(paths) == 2
+
+
+def test_aresolve_molecule_names(tmp_path, pubchem_server):
+    import asyncio
+
+    from calipytion.tools.pubchem import aresolve_molecule_names
+
+    base_url, paths = pubchem_server
+    cache = PubChemCache(tmp_path, offline=False)
+
+    names = asyncio.run(
+        aresolve_molecule_names(
+            [887, 5893, 702, 1],
+            cache=cache,
+            batch_size=1,
+            max_concurrency=2,
+            base_url=base_url,
+        )
+    )
+
+    assert names == {887: "Methanol", 5893: "NADH", 702: "Ethanol"}
+    assert len(paths) == 4
+
+
+def test_aresolve_molecule_names_cache_off_loop(tmp_path, pubchem_server):
+    import asyncio
+    import threading
+
+    from calipytion.tools.pubchem import aresolve_molecule_names
+
+    base_url, _ = pubchem_server
+    threads = []
+
+    class RecordingCache(PubChemCache):
+        def _read(self, pubchem_cid):
+            threads.append(threading.get_ident())
+            return super()._read(pubchem_cid)
+
+        def _write(self, rows):
+            threads.append(threading.get_ident())
+            super()._write(rows)
+
+    cache = RecordingCache(tmp_path, offline=False)
+
+    async def resolve():
+        names = await aresolve_molecule_names(
+            [887, 5893], cache=cache, batch_size=1, base_url=base_url
+        )
+        return names, threading.get_ident()
+
+    names, loop_thread = asyncio.run(resolve())
+
+    assert names == {887: "Methanol", 5893: "NADH"}
+    # two reads and a single batched write
+    assert len(threads) == 3
+    assert loop_thread not in threads
+
+
+def test_populate_molecule_names(tmp_path, pubchem_server):
+    from calipytion.tools.pubchem import populate_molecule_names
+
+    base_url, paths = pubchem_server
+    cache = PubChemCache(tmp_path, offline=False)
+    calibrators = [
+        {"molecule_id": "s1", "pubchem_cid": 887},
+        {"molecule_id": "s2", "pubchem_cid": 5893},
+        {"molecule_id": "s3", "pubchem_cid": 702, "molecule_name": "EtOH"},
+    ]
+
+    populate_molecule_names(calibrators, cache=cache, base_url=base_url)
+
+    assert [data["molecule_name"] for data in calibrators] == [
+        "Methanol",
+        "NADH",
+        "EtOH",
+    ]
+    assert paths == ["/compound/cid/887,5893/property/Title/JSON"]
@@ -0,0 +1,73 @@
+import json
+
+import numpy as np
+import pytest
+
+from calipytion.model import Standard
+from calipytion.tools.calibrator import Calibrator
+from calipytion.tools.registry import CalibrationRegistry
+
+STANDARD_PATH = "tests/test_data/abts_standard.json"
+
+
+@pytest.fixture
+def standard() -> Standard:
+    with open(STANDARD_PATH) as f:
+        standard = Standard(**json.load(f))
+
+    calibrator = Calibrator.from_standard(standard)
+    calibrator.fit_models(silent=True)
+    standard.result = calibrator.models[0]
+
+    return standard
+
+
+@pytest.fixture
+def registry(tmp_path):
+    with CalibrationRegistry(tmp_path / "registry.sqlite", maxsize=1) as registry:
+        yield registry
+
+
+def test_registry_lookup(registry, standard):
+    standard.wavelength = 420.0
+    old_id = registry.add(standard)
+    other = standard.model_copy(update={"wavelength": 340.0})
+    other_id = registry.add(other)
+    new_id = registry.add(standard)
+
+    assert len(registry) == 3
+    assert registry.find(molecule_id=standard.molecule_id) == [new_id, other_id, old_id]
+    assert registry.find(
+        pubchem_cid=standard.pubchem_cid, wavelength=standard.wavelength
+    ) == [new_id, old_id]
+    assert registry.find(molecule_id="unknown") == []
+
+    registry.remove(new_id)
+    restored = registry.get_standard(old_id)
+    assert restored.model_dump() == standard.model_dump()
+
+    with pytest.raises(ValueError):
+        registry.get_standard(new_id)
+
+
+def test_registry_convert(registry, standard):
+    registry.add(standard)
+    signals = np.array([sample.signal for sample in standard.samples])
+
+    model = registry.get_model(molecule_id=standard.molecule_id)
+    concs = registry.convert(
+        signals, molecule_id=standard.molecule_id, ph=standard.ph
+    )
+
+    assert registry.get_model(molecule_id=standard.molecule_id) is model
+    np.testing.assert_allclose(concs, model.convert(signals))
+
+    with pytest.raises(ValueError):
+        registry.convert(signals, molecule_id=standard.molecule_id, ph=1.0)
+
+
+def test_registry_rejects_unfitted(registry, standard):
+    standard.result = None
+
+    with pytest.raises(ValueError):
+        registry.add(standard)
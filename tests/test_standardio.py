@@ -0,0 +1,92 @@
+import json
+
+import numpy as np
+import pytest
+
+from calipytion.ioutils import standardio
+from calipytion.ioutils.standardio import (
+    ColumnarStandard,
+    read_columnar_standard,
+    read_standard,
+    write_columnar_standard,
+)
+from calipytion.model import Standard
+from calipytion.tools.calibrator import Calibrator
+
+STANDARD_PATH = "tests/test_data/abts_standard.json"
+
+
+@pytest.fixture
+def standard() -> Standard:
+    with open(STANDARD_PATH) as f:
+        return Standard(**json.load(f))
+
+
+def test_columnar_round_trip(tmp_path, standard):
+    path = tmp_path / "standard.json"
+    write_columnar_standard(standard, path)
+
+    columnar = read_columnar_standard(path)
+    assert isinstance(columnar.concentrations, np.ndarray)
+    assert columnar.concentrations.tolist() == [
+        sample.concentration for sample in standard.samples
+    ]
+    assert columnar.signals.tolist() == [sample.signal for sample in standard.samples]
+
+    restored = read_standard(path)
+    assert restored.molecule_id == standard.molecule_id
+    assert restored.temp_unit == standard.temp_unit
+    assert len(restored.samples) == len(standard.samples)
+    assert restored.samples[0].conc_unit.name == standard.samples[0].conc_unit.name
+
+    # columnar file is considerably smaller than the per-sample JSON-LD form
+    assert path.stat().st_size < len(standard.model_dump_json()) / 2
+
+
+def test_from_json_detects_format(tmp_path, standard):
+    path = tmp_path / "standard.json"
+    write_columnar_standard(standard, path)
+
+    columnar = Calibrator.from_json(str(path))
+    per_sample = Calibrator.from_json(STANDARD_PATH)
+
+    assert columnar.concentrations == per_sample.concentrations
+    assert columnar.signals == per_sample.signals
+    assert columnar.conc_unit.name == per_sample.conc_unit.name
+
+
+def test_columnar_without_orjson(tmp_path, standard, monkeypatch):
+    monkeypatch.setattr(standardio, "orjson", None)
+    path = tmp_path / "standard.json"
+
+    write_columnar_standard(standard, path)
+
+    assert json.loads(path.read_text())["format"] == standardio.COLUMNAR_FORMAT
+    assert len(read_standard(path).samples) == len(standard.samples)
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_columnar_nan_signals(tmp_path, standard, monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(standardio, "orjson", None)
+    path = tmp_path / "standard.json"
+    standard.samples[0].signal = float("nan")
+    standard.samples[1].signal = float("inf")
+
+    write_columnar_standard(standard, path)
+
+    # strict JSON without NaN or Infinity constants
+    data = json.loads(path.read_text(), parse_constant=pytest.fail)
+    assert data["samples"]["signal"][:2] == [None, None]
+
+    columnar = read_columnar_standard(path)
+    assert np.isnan(columnar.signals[:2]).all()
+    assert columnar.signals[2:].tolist() == [
+        sample.signal for sample in standard.samples[2:]
+    ]
+    assert np.isnan(read_standard(path).samples[0].signal)
+
+
+def test_from_dict_rejects_per_sample_form(standard):
+    with pytest.raises(ValueError):
+        ColumnarStandard.from_dict(standard.model_dump(mode="json"))
@@ -0,0 +1,24 @@
+import pytest
+
+from calipytion.units import M, conversion_factor, mM, mmol, nM, uM
+from calipytion.units.predefined import Unit
+from calipytion.units.units import UnitDefinition
+
+
+def test_conversion_factor_molarity():
+    assert conversion_factor(mM, mM) == 1.0
+    assert conversion_factor(mM, uM) == pytest.approx(1e3)
+    assert conversion_factor(uM, mM) == pytest.approx(1e-3)
+    assert conversion_factor(M, nM) == pytest.approx(1e9)
+
+
+def test_conversion_factor_multiplier():
+    hour = UnitDefinition(base_units=[Unit.hour()])
+    second = UnitDefinition(base_units=[Unit.second()])
+
+    assert conversion_factor(hour, second) == pytest.approx(3600)
+
+
+def test_conversion_factor_different_dimensions():
+    with pytest.raises(ValueError):
+        conversion_factor(mM, mmol)